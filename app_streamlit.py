@@ -1,3 +1,4 @@
+import hashlib
 import io
 import math
 import tempfile
@@ -6,7 +7,9 @@ from pathlib import Path
 import pandas as pd
 import streamlit as st
 
-from import_csv import cores_from_high_flux_csv, _parse_csv_rows
+from catalog_snapshot import content_hash, load_awg_table, load_rows
+from import_csv import cores_from_rows, _parse_csv_rows
+from engine import SearchStats
 from models import Coil
 from search import find_combinations
 
@@ -34,8 +37,24 @@ AWG_CSV = """AWG,직경(mm),단면적(mm²),저항(Ω/m),허용전류(A)
     30,0.255,0.0509,0.339,0.147
 """
 
+REPO_AWG_XLSX = "TalkFile_AWG(Americal Wire Gauge).xlsx.xlsx"
+REPO_CORE_SOURCES = (
+    "TalkFile_창성코어(High Flux GT Cores).xlsx.xlsx",
+    "TalkFile_창성코어(High Flux GT Cores).xlsx - Hight Flux GT Cores.csv",
+)
+
 @st.cache_data
 def load_awg_table_static() -> pd.DataFrame:
+    # Vendor workbook first (cached as a snapshot next to it); embedded table as fallback
+    try:
+        arr = load_awg_table(REPO_AWG_XLSX)
+        if len(arr):
+            return pd.DataFrame({
+                "AWG": arr["awg"], "직경(mm)": arr["diameter_mm"], "단면적(mm²)": arr["area_mm2"],
+                "저항(Ω/m)": arr["ohm_per_m"], "허용전류(A)": arr["current_a"],
+            })
+    except Exception:
+        pass
     df = pd.read_csv(io.StringIO(AWG_CSV))
     df.columns = [str(c).strip() for c in df.columns]
     return df
@@ -324,9 +343,16 @@ from math import pi, ceil
 import pandas as pd
 import streamlit as st
 
-from import_csv import cores_from_high_flux_csv, _parse_csv_rows
+from catalog_snapshot import content_hash, load_awg_table, load_rows
+from import_csv import cores_from_rows, _parse_csv_rows
+from engine import SearchStats
 from models import Coil
 from search import find_combinations
+from tolerance import analyze_tolerances
+from wire_catalog import BUILDS, enamel_thickness_m
+from custom_core import (
+    bounds_from, initial_layers, iwm_finished, solve_custom_core, validate_feasible, window_fill_from_capacity,
+)
 
 st.set_page_config(page_title="토로이드 코일 설계", layout="wide")
 st.title("토로이드 코일 설계 프로그램")
@@ -419,18 +445,34 @@ DEFAULT_CORE_CSV = """,,,,,,,,,,,,
 ,CH740GT,89,206,429,18.39,4.788,74.1,45.3,35,75.2,44.07,36.27
 """
 
-@st.cache_data
-def load_repo_cores() -> tuple[list, pd.DataFrame]:
-    # Try repo CSV path; fallback to embedded CSV
-    repo_csv = "TalkFile_창성코어(High Flux GT Cores).xlsx - Hight Flux GT Cores.csv"
-    try:
-        cores = cores_from_high_flux_csv(repo_csv)
-        rows = _parse_csv_rows(repo_csv)
-    except Exception:
-        sio = io.StringIO(DEFAULT_CORE_CSV)
-        cores = cores_from_high_flux_csv(sio)
-        sio.seek(0)
-        rows = _parse_csv_rows(sio)
+SEARCH_TOLERANCE = 0.10
+SEARCH_CACHE_ENTRIES = 128  # LRU bound of the result cache, shared by every session of the process
+TOLERANCE_SAMPLES = 20_000
+
+# st.fragment arrived in 1.37; the pinned 1.36 has it as experimental_fragment
+_fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+def repo_catalog_key() -> tuple[str, str]:
+    # (source, content hash) of the catalog load_repo_cores reads; the hash keys the caches
+    # below, so an updated workbook invalidates them without a restart
+    for source in REPO_CORE_SOURCES:
+        if Path(source).exists():
+            return source, content_hash(source)
+    return "", hashlib.sha256(DEFAULT_CORE_CSV.encode()).hexdigest()[:16]
+
+@st.cache_data(max_entries=4)
+def load_repo_cores(source: str, catalog_hash: str) -> tuple[list, pd.DataFrame]:
+    # Vendor workbook, then the CSV export, then the embedded CSV. Parsed once (through the
+    # on-disk snapshot); cores and the preview share the rows
+    rows = None
+    if source:
+        try:
+            rows = load_rows(source)
+        except Exception:
+            rows = None
+    if rows is None:
+        rows = _parse_csv_rows(io.StringIO(DEFAULT_CORE_CSV))
+    cores = cores_from_rows(rows)
     rows_df = pd.DataFrame([{
         "파트 번호 (part_no)": r.part_no,
         "A_L 26µ (nH/N^2)": r.al_26_nH,
@@ -444,6 +486,56 @@ def load_repo_cores() -> tuple[list, pd.DataFrame]:
     } for r in rows]) if rows else pd.DataFrame()
     return cores, rows_df
 
+@st.cache_data(max_entries=SEARCH_CACHE_ENTRIES, show_spinner=False)
+def search_options(
+    L_uH: float,
+    mu_r: float,
+    wire: tuple[str, float, float],
+    tolerance: float,
+    catalog_hash: str,
+    _cores: list,
+) -> tuple[list, str]:
+    # Memoized on (L, μr, wire, tolerance, catalog hash); _cores is left out of the key
+    # (leading underscore) since catalog_hash already identifies it
+    name, bare_d_m, enamel_m = wire
+    cores = [replace(c, mu_r=mu_r) for c in _cores]
+    coils = [
+        Coil(
+            name=name,
+            awg=0,
+            wire_diameter_m=bare_d_m,
+            resistance_per_m_ohm=0.0,
+            price_per_m_usd=0.0,
+            packing_factor=0.68,
+            base_price_usd=0.0,
+            enamel_thickness_m=enamel_m,
+        )
+    ]
+    stats = SearchStats()
+    opts = find_combinations(
+        L_target_h=L_uH * 1e-6,
+        cores=cores,
+        coils=coils,
+        tolerance=tolerance,
+        working_current_a=None,
+        stats=stats,
+    )
+    return opts, stats.summary()
+
+@st.cache_data(max_entries=SEARCH_CACHE_ENTRIES, show_spinner="공차 분석 중…")
+def tolerance_reports(
+    option_keys: tuple[tuple[str, str, int], ...],
+    mu_r: float,
+    L_uH: float,
+    tolerance: float,
+    samples: int,
+    catalog_hash: str,
+    _opts: list,
+) -> list:
+    # Monte Carlo of the shown options, memoized on their (core, coil, turns) plus the
+    # μr override and catalog hash that pin the core data; _opts is left out of the key
+    return analyze_tolerances(_opts, L_uH * 1e-6, tolerance, samples)
+
 # IWM calculator (from page JS calcs())
 def iwm_calcs(OD_mm: float, ID_mm: float, HT_mm: float, NT: int, WG_mm: float) -> dict:
     len_per_turn_mm = OD_mm - ID_mm + (2.0 * HT_mm)
@@ -487,48 +579,32 @@ with st.sidebar:
         index=19,  # e.g., AWG 28
     )
     bare_d_mm = float(awg_df["직경(mm)"].iloc[row_index])
-    wire_size_mm = bare_d_mm                   # treat as overall pitch
-    enamel_thk_m = 0.0                         # no enamel column → 0
-    st.caption(f"Wire Size (overall pitch): {wire_size_mm:.3f} mm (bare only)")
+    # "none" (bare-wire pitch) by default, as the search ran before builds were selectable
+    build = st.selectbox("에나멜 빌드 (Enamel build)", options=["none", *BUILDS], index=0)
+    enamel_thk_m = enamel_thickness_m(bare_d_mm / 1000.0, build) if build != "none" else 0.0
+    wire_size_mm = bare_d_mm + 2 * enamel_thk_m * 1e3   # overall pitch
+    st.caption(f"Wire Size (overall pitch): {wire_size_mm:.3f} mm (enamel {enamel_thk_m * 1e6:.1f} µm/side)")
 
 tab1 = st.container()
 
-cores, rows_df = load_repo_cores()
+catalog_source, catalog_hash = repo_catalog_key()
+cores, rows_df = load_repo_cores(catalog_source, catalog_hash)
 if not cores:
     with tab1:
         st.info("리포지토리 CSV가 필요합니다. 파일을 프로젝트 루트에 두고 다시 실행하세요.")
         st.info("CSV 업로드를 기다리는 중…")
     st.stop()
 
-# Override μr on cores from user input
-cores = [replace(c, mu_r=mu_r_input) for c in cores]
-
-# Build coils from defaults; apply absolute enamel thickness
-coils = [
-    Coil(
-        name=f'AWG {awg_df["AWG"].iloc[row_index]} (static)',
-        awg=0,
-        wire_diameter_m=bare_d_mm / 1000.0,
-        resistance_per_m_ohm=0.0,
-        price_per_m_usd=0.0,
-        packing_factor=0.68,
-        base_price_usd=0.0,
-        enamel_thickness_m=enamel_thk_m,
-    )
-]
-
-# Compute options
-opts = find_combinations(
-    L_target_h=L_uH * 1e-6,
-    cores=cores,
-    coils=coils,
-    tolerance=0.10,
-    working_current_a=None,
-)
+# Compute options (μr override and the selected wire are applied inside the cached search)
+wire_label = f'AWG {awg_df["AWG"].iloc[row_index]} ' + ("(static)" if build == "none" else build)
+wire_key = (wire_label, bare_d_mm / 1000.0, enamel_thk_m)
+opts, search_stats_text = search_options(L_uH, mu_r_input, wire_key, SEARCH_TOLERANCE, catalog_hash, cores)
 
 # Show minimal result columns only
 with tab1:
     st.subheader("설계 옵션 (Design Options)")
+    with st.expander("탐색 통계 (Search stats)"):
+        st.text(search_stats_text)
     if not opts:
         st.info("조건에 맞는 조합이 없습니다.")
     else:
@@ -541,6 +617,24 @@ with tab1:
             "필 비율(%)": d.fill_ratio * 100,
         } for d in opts[:3]])
         st.dataframe(df, use_container_width=True)
+        with st.expander("공차 분석 (Tolerance Monte Carlo)"):
+            st.caption(f"AL ±8%, 코팅 전/후 치수 사이의 OD/ID/HT, 선경 ±1% 를 {TOLERANCE_SAMPLES:,}회 샘플링")
+            shown = opts[:3]
+            reports = tolerance_reports(
+                tuple((d.core.name, d.coil.name, d.turns) for d in shown), mu_r_input, L_uH, SEARCH_TOLERANCE,
+                TOLERANCE_SAMPLES, catalog_hash, shown,
+            )
+            st.dataframe(pd.DataFrame([{
+                "코어 (Core)": r.option.core.name,
+                "코일 (Coil)": r.option.coil.name,
+                "턴수 (Turns)": r.option.turns,
+                "L 평균(µH)": r.L_mean_h * 1e6,
+                "L 표준편차(µH)": r.L_std_h * 1e6,
+                "수율(%)": r.yield_fraction * 100,
+                "권선 초과 확률(%)": r.overflow_probability * 100,
+                "저항 평균(Ω)": r.resistance_mean_ohm,
+                "저항 범위(Ω)": f"{r.resistance_min_ohm:.4f} ~ {r.resistance_max_ohm:.4f}",
+            } for r in reports]), use_container_width=True)
 
         st.markdown("### IWM 상세 계산 (행 선택)")
         labels = [f"{i}: {d.core.name} | {d.coil.name} | N={d.turns}" for i, d in enumerate(opts)]
@@ -579,102 +673,109 @@ with tab1:
 
         # --- Custom core tweak (OD/ID/HT) -------------------------------
         from models import Core
-        from math import ceil
-
-        def _initial_layers(N: int, HT_mm: float, d_mm: float) -> int:
-            tpl = max(1, int(HT_mm // d_mm))
-            return max(1, ceil(N / tpl))
-
-        def _bounds_from(N:int, d_mm:float, OD_mm:float, ID_mm:float, HT_mm:float, L_init:int|None=None):
-            d_local = d_mm
-            L_local = L_init or _initial_layers(N, HT_mm, d_local)
-            HT_min_local = d_local * ceil(N / L_local)
-            OD_min_local = ID_mm + 2 * L_local * d_local
-            ID_min_local = 2 * (L_local + 1) * d_local
-            return L_local, HT_min_local, OD_min_local, ID_min_local
-
-        def _validate_feasible(N:int, d_mm:float, OD_mm:float, ID_mm:float, HT_mm:float, L:int) -> tuple[bool, str]:
-            d_local = d_mm
-            tpl_local = int(HT_mm // d_local)
-            if tpl_local <= 0:
-                return False, "HT too small (no turns per layer)."
-            if (OD_mm - ID_mm)/2.0 < L * d_local:
-                return False, "Radial thickness insufficient: increase OD or reduce ID or increase L."
-            if tpl_local * L < N:
-                return False, "Turns capacity too low: increase HT or L."
-            return True, "OK"
-
-        def _iwm_finished(OD_mm:float, ID_mm:float, HT_mm:float, L:int, d_mm:float) -> tuple[float,float,float]:
-            return (
-                round(OD_mm + 2*L*d_mm, 3),
-                round(ID_mm - 2*L*d_mm, 3),
-                round(HT_mm + 2*L*d_mm, 3),
-            )
 
-        def _window_fill_from_capacity(N:int, HT_mm:float, d_mm:float, L:int) -> float:
-            tpl_local = max(1, int(HT_mm // d_mm))
-            cap_local = tpl_local * L
-            if cap_local <= 0:
-                return 0.0
-            return min(1.0, N / cap_local)
-
-        with st.expander("Custom core (OD/ID/HT tweak)"):
-            N_sel = int(d.turns)
-            wire_size_mm_sel = wire_size_mm
-            base_OD_mm, base_ID_mm, base_HT_mm = OD_mm, ID_mm, HT_mm
-
-            L_default = _initial_layers(N_sel, base_HT_mm, wire_size_mm_sel)
-            L_ui = st.number_input("Layers (L)", min_value=1, max_value=999, value=L_default, step=1)
-
-            L_eff, HT_min, OD_min, ID_min = _bounds_from(N_sel, wire_size_mm_sel, base_OD_mm, base_ID_mm, base_HT_mm, L_ui)
-            HT_ui = st.slider("HT (mm)", min_value=float(HT_min), max_value=float(HT_min + 20*wire_size_mm_sel), value=float(max(base_HT_mm, HT_min)), step=0.01)
-            ID_ui = st.slider("ID (mm)", min_value=float(ID_min), max_value=float(max(ID_min + 20*wire_size_mm_sel, base_ID_mm)), value=float(max(base_ID_mm, ID_min)), step=0.01)
-            OD_ui = st.slider("OD (mm)", min_value=float(OD_min), max_value=float(max(OD_min + 40*wire_size_mm_sel, base_OD_mm)), value=float(max(base_OD_mm, OD_min)), step=0.01)
-
-            ok, msg = _validate_feasible(N_sel, wire_size_mm_sel, OD_ui, ID_ui, HT_ui, L_eff)
-            st.write(f"Feasibility: {msg}")
-
-            ODf_mm, IDf_mm, HTf_mm = _iwm_finished(OD_ui, ID_ui, HT_ui, L_eff, wire_size_mm_sel)
-            st.write({
-                "Wire Size (mm)": f"{wire_size_mm_sel:.3f}",
-                "Turns per layer (floor(HT/d))": int(HT_ui // wire_size_mm_sel),
-                "Capacity (TPL*L)": int(HT_ui // wire_size_mm_sel) * L_eff,
-                "Finished OD (mm)": ODf_mm,
-                "Finished ID (mm)": IDf_mm,
-                "Finished HT (mm)": HTf_mm,
-            })
-
-            fill = _window_fill_from_capacity(N_sel, HT_ui, wire_size_mm_sel, L_eff)
-            st.write({
-                "윈도우 면적(mm²)": round((math.pi * (ID_ui/2)**2), 3),
-                "남은 면적(mm²) (capacity model)": "—",
-                "필 비율(%) (capacity)": round(fill * 100.0, 2),
-            })
+        def _custom_core(core, OD_mm: float, ID_mm: float, HT_mm: float) -> Core:
+            return Core(
+                name=f"Custom {OD_mm:.2f}/{ID_mm:.2f}/{HT_mm:.2f} mm",
+                mu_r=core.mu_r,
+                area_m2=((OD_mm - ID_mm)/2/1e3) * (HT_mm/1e3),
+                r_mean_m=(OD_mm + ID_mm) / 4e3,
+                window_area_m2=math.pi * (ID_mm/2/1e3)**2,
+                b_sat_t=core.b_sat_t,
+                price_usd=0.0,
+                od_m=OD_mm/1e3, id_m=ID_mm/1e3, ht_m=HT_mm/1e3,
+            )
 
-            if st.button("Preview with custom core"):
-                area_m2 = ((OD_ui - ID_ui)/2/1e3) * (HT_ui/1e3)
-                r_mean_m = (OD_ui + ID_ui) / 4e3
-                window_area_m2 = math.pi * (ID_ui/2/1e3)**2
-                custom_core = Core(
-                    name=f"Custom {OD_ui:.2f}/{ID_ui:.2f}/{HT_ui:.2f} mm",
-                    mu_r=core.mu_r,
-                    area_m2=area_m2,
-                    r_mean_m=r_mean_m,
-                    window_area_m2=window_area_m2,
-                    b_sat_t=core.b_sat_t,
-                    price_usd=0.0,
-                    od_m=OD_ui/1e3, id_m=ID_ui/1e3, ht_m=HT_ui/1e3,
+        @_fragment
+        def custom_core_panel(d, core, OD_mm: float, ID_mm: float, HT_mm: float, wire_size_mm: float, L_target_h: float):
+            # Widgets in here rerun only this function: moving the sliders recomputes the
+            # custom-core preview, not the catalog search above
+            with st.expander("Custom core (OD/ID/HT tweak)"):
+                N_sel = int(d.turns)
+                wire_size_mm_sel = wire_size_mm
+                base_OD_mm, base_ID_mm, base_HT_mm = OD_mm, ID_mm, HT_mm
+
+                L_default = initial_layers(N_sel, base_HT_mm, wire_size_mm_sel)
+                L_ui = st.number_input("Layers (L)", min_value=1, max_value=999, value=L_default, step=1)
+
+                L_eff, HT_min, OD_min, ID_min = bounds_from(N_sel, wire_size_mm_sel, base_OD_mm, base_ID_mm, base_HT_mm, L_ui)
+                HT_ui = st.slider("HT (mm)", min_value=float(HT_min), max_value=float(HT_min + 20*wire_size_mm_sel), value=float(max(base_HT_mm, HT_min)), step=0.01)
+                ID_ui = st.slider("ID (mm)", min_value=float(ID_min), max_value=float(max(ID_min + 20*wire_size_mm_sel, base_ID_mm)), value=float(max(base_ID_mm, ID_min)), step=0.01)
+                OD_ui = st.slider("OD (mm)", min_value=float(OD_min), max_value=float(max(OD_min + 40*wire_size_mm_sel, base_OD_mm)), value=float(max(base_OD_mm, OD_min)), step=0.01)
+
+                ok, msg = validate_feasible(N_sel, wire_size_mm_sel, OD_ui, ID_ui, HT_ui, L_eff)
+                st.write(f"Feasibility: {msg}")
+
+                ODf_mm, IDf_mm, HTf_mm = iwm_finished(OD_ui, ID_ui, HT_ui, L_eff, wire_size_mm_sel)
+                st.write({
+                    "Wire Size (mm)": f"{wire_size_mm_sel:.3f}",
+                    "Turns per layer (floor(HT/d))": int(HT_ui // wire_size_mm_sel),
+                    "Capacity (TPL*L)": int(HT_ui // wire_size_mm_sel) * L_eff,
+                    "Finished OD (mm)": ODf_mm,
+                    "Finished ID (mm)": IDf_mm,
+                    "Finished HT (mm)": HTf_mm,
+                })
+
+                fill = window_fill_from_capacity(N_sel, HT_ui, wire_size_mm_sel, L_eff)
+                st.write({
+                    "윈도우 면적(mm²)": round((math.pi * (ID_ui/2)**2), 3),
+                    "남은 면적(mm²) (capacity model)": "—",
+                    "필 비율(%) (capacity)": round(fill * 100.0, 2),
+                })
+
+                if st.button("Preview with custom core"):
+                    custom_core = _custom_core(core, OD_ui, ID_ui, HT_ui)
+                    preview = find_combinations(
+                        L_target_h=L_target_h,
+                        cores=[custom_core],
+                        coils=[d.coil],
+                        tolerance=SEARCH_TOLERANCE,
+                        working_current_a=None,
+                    )
+                    if preview:
+                        p = preview[0]
+                        st.success(f"Preview → Core={p.core.name} | Coil={p.coil.name} | N={p.turns} | 필 비율={p.fill_ratio*100:.2f}%")
+                    else:
+                        st.warning("No viable combination for the custom core with current inputs.")
+
+            with st.expander("Minimum-volume custom core (solver)"):
+                # Inverse design: smallest OD/ID/HT and N for the target L at this wire pitch
+                c1, c2, c3 = st.columns(3)
+                max_od_ui = c1.number_input("Max OD (mm)", min_value=0.0, value=float(round(OD_mm * 1.5, 2)), step=0.5, help="0 = unlimited")
+                min_fid_ui = c2.number_input("Min finished ID (mm)", min_value=0.0, value=0.0, step=0.5)
+                max_ht_ui = c3.number_input("Max HT (mm)", min_value=0.0, value=float(round(HT_mm * 1.5, 2)), step=0.5, help="0 = unlimited")
+                sol = solve_custom_core(
+                    L_target_h, core.mu_r, wire_size_mm,
+                    max_od_mm=max_od_ui or None, min_finished_id_mm=min_fid_ui, max_ht_mm=max_ht_ui or None,
+                    tolerance=SEARCH_TOLERANCE,
                 )
-                preview = find_combinations(
-                    L_target_h=L_uH*1e-6,
-                    cores=[custom_core],
-                    coils=[d.coil],
-                    tolerance=0.10,
-                    working_current_a=None,
-                )
-                if preview:
-                    p = preview[0]
-                    st.success(f"Preview → Core={p.core.name} | Coil={p.coil.name} | N={p.turns} | 필 비율={p.fill_ratio*100:.2f}%")
+                if sol is None:
+                    st.warning("No OD/ID/HT within these limits reaches the target inductance at this wire size.")
                 else:
-                    st.warning("No viable combination for the custom core with current inputs.")
-
+                    ODf_mm, IDf_mm, HTf_mm = iwm_finished(sol.od_mm, sol.id_mm, sol.ht_mm, sol.layers, wire_size_mm)
+                    st.write({
+                        "Turns": sol.turns,
+                        "Layers (L)": sol.layers,
+                        "OD / ID / HT (mm)": f"{sol.od_mm:.3f} / {sol.id_mm:.3f} / {sol.ht_mm:.3f}",
+                        "L (µH)": round(sol.L_h * 1e6, 3),
+                        "오차(%)": round(sol.rel_error * 100.0, 3),
+                        "Core volume (mm³)": round(sol.volume_mm3, 1),
+                        "Finished OD (mm)": ODf_mm,
+                        "Finished ID (mm)": IDf_mm,
+                        "Finished HT (mm)": HTf_mm,
+                    })
+                    if st.button("Preview solved core"):
+                        preview = find_combinations(
+                            L_target_h=L_target_h,
+                            cores=[_custom_core(core, sol.od_mm, sol.id_mm, sol.ht_mm)],
+                            coils=[d.coil],
+                            tolerance=SEARCH_TOLERANCE,
+                            working_current_a=None,
+                        )
+                        if preview:
+                            p = preview[0]
+                            st.success(f"Preview → Core={p.core.name} | Coil={p.coil.name} | N={p.turns} | 필 비율={p.fill_ratio*100:.2f}%")
+                        else:
+                            st.warning("No viable combination for the solved core.")
+
+        custom_core_panel(d, core, OD_mm, ID_mm, HT_mm, wire_size_mm, L_uH * 1e-6)
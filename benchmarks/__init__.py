@@ -0,0 +1,2 @@
+# benchmarks
+# Standalone performance scripts; run from the repo root with `python -m benchmarks.<name>`
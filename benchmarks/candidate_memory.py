@@ -0,0 +1,65 @@
+# benchmarks/candidate_memory.py
+# Memory/allocation comparison: eager DesignOption lists vs compact candidate records
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from dataclasses import replace
+
+from data import COILS
+from engine import CoilTable, CoreTable
+from search import find_combinations_reference, materialize, search_candidates
+
+from benchmarks.synthetic import synthetic_cores
+
+
+def measure(fn) -> dict:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    after = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(s.count_diff for s in after.compare_to(before, "filename") if s.count_diff > 0)
+    del result
+    return {"seconds": round(elapsed, 4), "peak_bytes": peak, "retained_bytes": current, "retained_blocks": blocks}
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Compare memory of eager DesignOption lists vs compact candidate records")
+    p.add_argument("--candidates", type=int, default=100_000, help="approximate candidate count")
+    p.add_argument("--L", type=float, default=1e-3)
+    p.add_argument("--tol", type=float, default=0.1)
+    p.add_argument("--k", type=int, default=20)
+    p.add_argument("--skip-reference", action="store_true", help="skip the (slow) scalar loop")
+    args = p.parse_args()
+
+    coils = [replace(c, name=f"{c.name} +{e:.0f}um", enamel_thickness_m=e * 1e-6) for c in COILS for e in (0, 10, 20, 30)]
+    probe = synthetic_cores(200)
+    per_core = max(1e-9, len(search_candidates(args.L, probe, coils, args.tol).candidates) / len(probe))
+    cores = synthetic_cores(max(1, int(args.candidates / per_core)))
+    core_table, coil_table = CoreTable(cores), CoilTable(coils)
+    n = len(search_candidates(args.L, core_table, coil_table, args.tol))
+
+    report = {"cores": len(cores), "coils": len(coils), "candidates": n}
+    report["compact_top_k"] = measure(lambda: search_candidates(args.L, core_table, coil_table, args.tol).top(args.k))
+
+    def eager_all():
+        cs = search_candidates(args.L, core_table, coil_table, args.tol)
+        return materialize(cs.candidates, range(len(cs)), core_table, coil_table)
+    report["engine_materialize_all"] = measure(eager_all)
+
+    if not args.skip_reference:
+        report["reference_loop"] = measure(
+            lambda: find_combinations_reference(args.L, cores, coils, args.tol, max_results=args.k)
+        )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
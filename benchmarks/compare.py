@@ -0,0 +1,50 @@
+# benchmarks/compare.py
+# Diff two benchmarks.run JSON files; exits 1 when any case slowed past the threshold
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+
+def _key(result: dict) -> tuple:
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(old: dict, new: dict, threshold: float) -> list[str]:
+    """Print per-case new/old time ratios; return the cases slower than 1 + threshold."""
+    before = {_key(r): r["seconds"] for r in old["results"]}
+    regressions = []
+    for r in new["results"]:
+        key = _key(r)
+        if key not in before:
+            print(f"{r['name']:32s} {key[1]:48s} {'new':>8s}")
+            continue
+        ratio = r["seconds"] / max(before[key], 1e-12)
+        flag = ""
+        if ratio > 1.0 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(f"{r['name']} {key[1]}")
+        print(f"{r['name']:32s} {key[1]:48s} {ratio:8.2f}x{flag}")
+    return regressions
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Compare two benchmark JSON files (ratio = new / old)")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown fraction before failing")
+    args = p.parse_args()
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    if old.get("meta", {}).get("seed") != new.get("meta", {}).get("seed"):
+        print("warning: runs used different seeds", file=sys.stderr)
+    regressions = compare(old, new, args.threshold)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
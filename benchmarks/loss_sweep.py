@@ -0,0 +1,49 @@
+# benchmarks/loss_sweep.py
+# Timing of the frequency x ripple loss sweep over every candidate of one query
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from engine import CoilTable, CoreTable
+from search import search_candidates
+
+from benchmarks.synthetic import synthetic_coils, synthetic_cores
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Time CandidateSet.losses over a frequency x ripple grid")
+    p.add_argument("--cores", type=int, default=300)
+    p.add_argument("--coils", type=int, default=20)
+    p.add_argument("--L", type=float, default=2e-4)
+    p.add_argument("--tol", type=float, default=0.1)
+    p.add_argument("--imax", type=float, default=2.0, help="DC working current (A)")
+    p.add_argument("--freqs", type=int, default=100, help="points from 50 to 500 kHz")
+    p.add_argument("--ripples", type=int, default=1, help="points from 10% to 40% of imax, peak-to-peak")
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+
+    cs = search_candidates(
+        args.L, CoreTable(synthetic_cores(args.cores)), CoilTable(synthetic_coils(args.coils)), args.tol,
+        working_current_a=args.imax,
+    )
+    freqs = np.linspace(50e3, 500e3, args.freqs)
+    ripples = np.linspace(0.1, 0.4, args.ripples) * args.imax
+    best = float("inf")
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        sweep = cs.losses(freqs, ripples)
+        best = min(best, time.perf_counter() - t0)
+    total = sweep.total_w
+    print(json.dumps({
+        "candidates": len(cs), "grid": [args.freqs, args.ripples], "points": total.size,
+        "seconds": round(best, 4), "min_total_w": float(total.min()), "max_total_w": float(total.max()),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# benchmarks/run.py
+# Seeded benchmark grid over catalog size; writes JSON that benchmarks.compare can diff
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from engine import CoilTable, CoreTable, capacity_grid, layered_wire_length_batch
+from import_csv import _parse_csv_rows, core_table_from_csv
+from scorer import ScoreWeights, score_combo, score_combo_array
+from search import find_combinations, find_combinations_reference, layered_wire_length, search_candidates
+
+from benchmarks.synthetic import synthetic_coils, synthetic_cores, synthetic_gt_csv
+
+CORE_COUNTS = (10, 100, 1_000, 10_000, 100_000)
+COIL_COUNTS = (5, 20, 200)
+CSV_ROWS = (100, 1_000, 10_000, 33_334)
+QUICK_CORE_COUNTS = (10, 100, 1_000)
+QUICK_COIL_COUNTS = (5, 20)
+QUICK_CSV_ROWS = (100, 1_000)
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _scalar_triples(cores, coils, n: int, seed: int) -> list:
+    # Random (core, coil, N) triples with N inside each pair's capacity
+    rng = random.Random(seed)
+    out = []
+    while len(out) < n:
+        c, w = rng.choice(cores), rng.choice(coils)
+        cap = w.max_turns_on(c)
+        if cap > 0:
+            out.append((c, w, rng.randint(1, cap)))
+    return out
+
+
+def run(args) -> dict:
+    quick = args.quick
+    core_counts = QUICK_CORE_COUNTS if quick else CORE_COUNTS
+    coil_counts = QUICK_COIL_COUNTS if quick else COIL_COUNTS
+    csv_rows = QUICK_CSV_ROWS if quick else CSV_ROWS
+    results = []
+
+    def record(name: str, params: dict, seconds: float, repeat: int) -> None:
+        results.append({"name": name, "params": params, "seconds": seconds, "repeat": repeat})
+        print(f"{name:32s} {json.dumps(params):48s} {seconds * 1e3:10.3f} ms", file=sys.stderr)
+
+    all_cores = synthetic_cores(max(core_counts), args.seed)
+    all_coils = synthetic_coils(max(coil_counts), args.seed)
+
+    for n_cores in core_counts:
+        cores = all_cores[:n_cores]
+        core_table = CoreTable(cores)
+        for n_coils in coil_counts:
+            if n_cores * n_coils > args.max_pairs:
+                continue
+            coils = all_coils[:n_coils]
+            coil_table = CoilTable(coils)
+            params = {"cores": n_cores, "coils": n_coils, "L_h": args.L, "tol": args.tol}
+            for top_k in (False, True):
+                record(
+                    "find_combinations" + ("_top_k" if top_k else ""), params,
+                    best_of(lambda: find_combinations(
+                        args.L, core_table, coil_table, args.tol, max_results=args.k, top_k=top_k,
+                    ), args.repeat),
+                    args.repeat,
+                )
+            if n_cores * n_coils <= args.reference_pairs:
+                record(
+                    "find_combinations_reference", params,
+                    best_of(lambda: find_combinations_reference(args.L, cores, coils, args.tol, max_results=args.k), 1),
+                    1,
+                )
+
+            pairs = {"cores": n_cores, "coils": n_coils}
+            if n_cores * n_coils <= args.reference_pairs:
+                record(
+                    "coil_max_turns_on", pairs,
+                    best_of(lambda: [w.max_turns_on(c) for c in cores for w in coils], args.repeat),
+                    args.repeat,
+                )
+            record("capacity_grid", pairs, best_of(lambda: capacity_grid(core_table, coil_table), args.repeat), args.repeat)
+
+    coils = all_coils[:max(coil_counts)]
+    triples = _scalar_triples(all_cores[:1_000], coils, args.wire_calls, args.seed)
+    rows = np.array([all_cores.index(c) for c, _, _ in triples])
+    cols = np.array([coils.index(w) for _, w, _ in triples])
+    turns = np.array([N for _, _, N in triples])
+    core_table, coil_table = CoreTable(all_cores[:1_000]), CoilTable(coils)
+    params = {"calls": len(triples)}
+    record(
+        "layered_wire_length", params,
+        best_of(lambda: [layered_wire_length(c, w, N) for c, w, N in triples], args.repeat),
+        args.repeat,
+    )
+    record(
+        "layered_wire_length_batch", params,
+        best_of(lambda: layered_wire_length_batch(core_table, coil_table, turns, rows, cols), args.repeat),
+        args.repeat,
+    )
+
+    # Scoring on one query's candidates: the scalar per-candidate call vs the array form
+    cand = search_candidates(args.L, core_table, coil_table, args.tol).candidates
+    cand = cand.take(np.arange(min(len(cand), args.score_rows)))
+    weights = ScoreWeights()
+    columns = (cand.rel_error.tolist(), cand.cost_usd.tolist(), cand.resistance_ohm.tolist(), cand.fill_ratio.tolist())
+    params = {"candidates": len(cand), "L_h": args.L, "tol": args.tol}
+    record(
+        "score_combo", params,
+        best_of(lambda: [
+            score_combo(e, c, r, weights, fill_ratio=f) for e, c, r, f in zip(*columns)
+        ], args.repeat),
+        args.repeat,
+    )
+    record(
+        "score_combo_array", params,
+        best_of(lambda: score_combo_array(
+            cand.rel_error, cand.cost_usd, cand.resistance_ohm, weights, fill_ratio=cand.fill_ratio,
+        ), args.repeat),
+        args.repeat,
+    )
+
+    for n_rows in csv_rows:
+        text = synthetic_gt_csv(n_rows, args.seed)
+        record(
+            "parse_csv_rows", {"rows": n_rows},
+            best_of(lambda: _parse_csv_rows(io.StringIO(text)), args.repeat),
+            args.repeat,
+        )
+        record(
+            "core_table_from_csv", {"rows": n_rows},
+            best_of(lambda: core_table_from_csv(io.StringIO(text)), args.repeat),
+            args.repeat,
+        )
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "quick": quick,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark the search, capacity, wire-length, scoring and CSV import paths")
+    p.add_argument("--out", default="-", help="JSON output path ('-' for stdout)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3, help="timed runs per case; the best is kept")
+    p.add_argument("--quick", action="store_true", help="small grid for a fast smoke run")
+    p.add_argument("--L", type=float, default=100e-6, help="target inductance (H)")
+    p.add_argument("--tol", type=float, default=0.1)
+    p.add_argument("--k", type=int, default=20)
+    p.add_argument("--max-pairs", type=int, default=2_000_000, help="skip grid cells with more core x coil pairs")
+    p.add_argument("--reference-pairs", type=int, default=20_000, help="largest grid cell for the scalar loops")
+    p.add_argument("--wire-calls", type=int, default=2_000)
+    p.add_argument("--score-rows", type=int, default=200_000, help="candidates scored by the scoring cases, at most")
+    args = p.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
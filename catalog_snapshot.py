@@ -0,0 +1,159 @@
+# catalog_snapshot.py
+# Content-hashed binary snapshot of a parsed vendor catalog, stored next to the source file
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, Union
+
+import numpy as np
+
+from engine import CoreTable
+from import_csv import ParsedRow, _iter_awg_values, _iter_catalog_values, core_table_from_columns, cores_from_rows
+from models import Core
+
+# Bump when ParsedRow or the on-disk layout changes; old snapshots then miss and rebuild
+SNAPSHOT_VERSION = 2
+
+_FLOAT_FIELDS = (
+    "al_26_nH", "al_60_nH", "al_125_nH", "path_len_m", "area_m2", "od_after_m", "id_after_m", "ht_after_m",
+    "od_before_m", "id_before_m", "ht_before_m",
+)
+_CORE_FIELDS = ("part_no",) + _FLOAT_FIELDS
+_AWG_FIELDS = ("awg", "diameter_mm", "area_mm2", "ohm_per_m", "current_a")
+
+
+def content_hash(path: Union[str, Path]) -> str:
+    """Short SHA-256 of the snapshot version plus the file bytes."""
+    h = hashlib.sha256(f"v{SNAPSHOT_VERSION}:".encode())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+
+def snapshot_path(path: Union[str, Path], digest: str, kind: str = "cores") -> Path:
+    path = Path(path)
+    return path.with_name(f".{path.name}.{kind}.{digest}.snapshot.npy")
+
+
+def values_to_array(values: Iterable[tuple]) -> np.ndarray:
+    """ParsedRow field tuples as one structured array; missing AL values are stored as NaN."""
+    values = list(values)
+    width = max([1] + [len(v[0]) for v in values])
+    dtype = np.dtype([("part_no", f"U{width}")] + [(name, "f8") for name in _FLOAT_FIELDS])
+    arr = np.empty(len(values), dtype=dtype)
+    if values:
+        part_no, *columns = zip(*values)
+        arr["part_no"] = part_no
+        for name, col in zip(_FLOAT_FIELDS, columns):
+            arr[name] = np.array(col, dtype=float)  # None -> NaN
+    return arr
+
+
+def awg_values_to_array(values: Iterable[tuple]) -> np.ndarray:
+    """AWG table rows as one structured array; the allowable-current column stays text."""
+    values = list(values)
+    text = max([1] + [max(len(v[0]), len(v[4])) for v in values])
+    dtype = np.dtype(list(zip(_AWG_FIELDS, (f"U{text}", "f8", "f8", "f8", f"U{text}"))))
+    arr = np.empty(len(values), dtype=dtype)
+    if values:
+        for name, col in zip(dtype.names, zip(*values)):
+            arr[name] = col if dtype[name].kind == "U" else np.array(col, dtype=float)
+    return arr
+
+
+def rows_from_array(arr: np.ndarray) -> list[ParsedRow]:
+    columns = [arr[name].tolist() for name in _FLOAT_FIELDS]
+    out = []
+    for part_no, *values in zip(arr["part_no"].tolist(), *columns):
+        for i in range(3):  # AL columns: NaN back to None
+            if values[i] != values[i]:
+                values[i] = None
+        out.append(ParsedRow(part_no, *values))
+    return out
+
+
+def _read(snap: Path, names: tuple[str, ...]) -> np.ndarray | None:
+    # A truncated, corrupt or foreign file is a miss like a missing one; the caller rebuilds it
+    try:
+        try:
+            arr = np.load(snap, mmap_mode="r")
+        except ValueError:
+            # An empty catalog has no data section to map
+            arr = np.load(snap)
+    except (OSError, ValueError, EOFError):
+        return None
+    if arr.ndim != 1 or arr.dtype.names != names:
+        return None
+    return arr
+
+
+def _write(snap: Path, arr: np.ndarray, source: Path, kind: str) -> None:
+    # Atomic replace so a concurrent reader never sees a half-written file; a read-only
+    # directory just means the next start parses again
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=snap.name, suffix=".tmp", dir=snap.parent)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, snap)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except (OSError, UnboundLocalError):
+            pass
+        return
+    for stale in snap.parent.glob(f".{glob.escape(source.name)}.{kind}.*.snapshot.npy"):
+        if stale != snap:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def _cached(
+    path: Union[str, Path], kind: str, build: Callable[[Path], np.ndarray], names: tuple[str, ...],
+) -> np.ndarray:
+    path = Path(path)
+    snap = snapshot_path(path, content_hash(path), kind)
+    arr = _read(snap, names) if snap.exists() else None
+    if arr is None:
+        arr = build(path)
+        _write(snap, arr, path, kind)
+    return arr
+
+
+def load_snapshot(path: Union[str, Path]) -> np.ndarray:
+    """Parsed catalog rows for the CSV or .xlsx at path as a (memory-mapped) structured array.
+
+    The snapshot file name carries the content hash of the source, so an edited catalog
+    misses and is parsed and written again; snapshots of older contents are removed then.
+    Repeat loads of a workbook skip the XML parsing entirely.
+    """
+    return _cached(path, "cores", lambda p: values_to_array(_iter_catalog_values(p)), _CORE_FIELDS)
+
+
+def load_awg_table(path: Union[str, Path]) -> np.ndarray:
+    """AWG table (awg.csv or the AWG workbook) through the same snapshot cache."""
+    return _cached(path, "awg", lambda p: awg_values_to_array(_iter_awg_values(p)), _AWG_FIELDS)
+
+
+def load_rows(path: Union[str, Path]) -> list[ParsedRow]:
+    return rows_from_array(load_snapshot(path))
+
+
+def load_cores(path: Union[str, Path]) -> list[Core]:
+    return cores_from_rows(load_rows(path))
+
+
+def load_core_table(path: Union[str, Path]) -> CoreTable:
+    """CoreTable straight from the snapshot columns, without ParsedRow or Core objects."""
+    arr = load_snapshot(path)
+    al = np.stack([arr["al_26_nH"], arr["al_60_nH"], arr["al_125_nH"]], axis=1)
+    return core_table_from_columns(
+        arr["part_no"], al, *(np.asarray(arr[name]) for name in _FLOAT_FIELDS[3:]),
+    )
@@ -1,33 +1,136 @@
 # cli_demo.py
 import argparse
-from data import CORES, COILS
-from search import find_combinations
+import csv
+from pathlib import Path
+from data import COILS
+from engine import CoilTable, SearchStats
+from catalog_snapshot import load_core_table
+from scorer import ScoreWeights
+from search import BomTarget, find_combinations, find_combinations_batch, find_smallest_id, option_losses
+from tolerance import analyze_tolerances
+
+REPO_CSV = Path(__file__).resolve().parent / "TalkFile_창성코어(High Flux GT Cores).xlsx - Hight Flux GT Cores.csv"
+REPO_XLSX = Path(__file__).resolve().parent / "TalkFile_창성코어(High Flux GT Cores).xlsx.xlsx"
+
+def read_bom(path: str, default_tol: float, default_imax: float | None) -> list[BomTarget]:
+    # CSV with header: L (H), optional tol (fraction), imax (A) and name columns
+    targets: list[BomTarget] = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for i, row in enumerate(csv.DictReader(f), 1):
+            row = {(k or "").strip(): (v or "").strip() for k, v in row.items()}
+            if not row.get("L"):
+                continue
+            targets.append(BomTarget(
+                L_target_h=float(row["L"]),
+                tolerance=float(row["tol"]) if row.get("tol") else default_tol,
+                working_current_a=float(row["imax"]) if row.get("imax") else default_imax,
+                name=row.get("name") or f"#{i}",
+            ))
+    return targets
+
+def print_options(options) -> None:
+    if not options:
+        print("No viable combinations found with given parameters.")
+        return
+
+    for i, d in enumerate(options, 1):
+        print(f"{i:2d}. Core={d.core.name} | Coil={d.coil.name} | N={d.turns} turns")
+        print(f"    L={d.L_h:.6g} H (err={d.rel_error*100:.2f}%) | R={d.resistance_ohm:.4f} Ω")
+        print(f"    Wire length={d.wire_length_m:.3f} m | Cost=${d.cost_usd:.2f} | Score={d.score:.4f}")
+
+def print_id_frontier(options) -> None:
+    # One line per (grade, coil): the smallest-ID core that reaches L and holds the winding
+    if not options:
+        print("No core reaches the target with any coil.")
+        return
+    for d in options:
+        id_mm = d.core.winding_dims[1] * 1e3
+        print(f"ID={id_mm:7.2f} mm | Core={d.core.name} | Coil={d.coil.name} | N={d.turns} | fill={d.fill_ratio*100:.1f}%")
+
+def print_tolerances(reports) -> None:
+    for i, r in enumerate(reports, 1):
+        print(
+            f"{i:2d}. L={r.L_mean_h:.6g}±{r.L_std_h:.3g} H [{r.L_min_h:.6g}, {r.L_max_h:.6g}] | "
+            f"yield={r.yield_fraction*100:.1f}% | overflow={r.overflow_probability*100:.1f}% | "
+            f"R={r.resistance_mean_ohm:.4f}±{r.resistance_std_ohm:.4f} Ω"
+        )
+
+def print_losses(options, sweep) -> None:
+    f_khz = sweep.frequencies_hz[0] / 1e3
+    for i, d in enumerate(options, 1):
+        print(
+            f"{i:2d}. {f_khz:.0f} kHz | B_ac={sweep.b_peak_t[i - 1, 0, 0] * 1e3:.1f} mT | Rac/Rdc={sweep.ac_factor[i - 1, 0, 0]:.2f} | "
+            f"core={sweep.core_w[i - 1, 0, 0]:.4f} W | copper={sweep.copper_w[i - 1, 0, 0]:.4f} W | total={sweep.total_w[i - 1, 0, 0]:.4f} W"
+        )
 
 def main():
     parser = argparse.ArgumentParser(description="Toroid inductance selector")
-    parser.add_argument("--L", type=float, required=True, help="Target inductance in Henry (e.g., 0.002 for 2 mH)")
+    parser.add_argument("--L", type=float, default=None, help="Target inductance in Henry (e.g., 0.002 for 2 mH)")
+    parser.add_argument("--bom", default=None, help="CSV of targets with columns L[,tol,imax,name]; one search pass for all rows")
+    parser.add_argument(
+        "--csv", default=str(REPO_XLSX if REPO_XLSX.exists() else REPO_CSV),
+        help="High Flux GT cores catalog (.xlsx workbook or CSV export)",
+    )
     parser.add_argument("--tol", type=float, default=0.1, help="Relative tolerance (e.g., 0.05 = 5%)")
     parser.add_argument("--imax", type=float, default=None, help="Optional working current in A for Bsat check")
+    parser.add_argument("--bias", action="store_true", help="With --imax, apply the High Flux DC-bias permeability roll-off")
+    parser.add_argument("--ripple", type=float, default=None, help="Peak-to-peak ripple current in A; prints core/copper loss per option")
+    parser.add_argument("--freq", type=float, default=100e3, help="Switching frequency in Hz for --ripple and --w-loss")
+    parser.add_argument("--w-loss", type=float, default=0.0, help="Score weight of total loss (W) at --imax, --ripple and --freq")
     parser.add_argument("--k", type=int, default=10, help="Max results to show")
+    parser.add_argument("--smallest-id", action="store_true", help="Per grade and coil, list the core with the smallest ID that fits")
+    parser.add_argument("--mc", type=int, default=0, help="Monte Carlo samples per shown option for tolerance analysis (0 = off)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for the Monte Carlo batches")
+    parser.add_argument("--stats", action="store_true", help="Print rejection counts and per-stage timings")
     args = parser.parse_args()
+    if (args.L is None) == (args.bom is None):
+        parser.error("give exactly one of --L or --bom")
+    if args.imax is not None and not args.imax >= 0:
+        parser.error("--imax must be >= 0")
+
+    cores = load_core_table(args.csv)
+    coils = CoilTable(COILS)
+    stats = SearchStats() if args.stats else None
+    weights = ScoreWeights(w_loss=args.w_loss, loss_frequency_hz=args.freq, loss_ripple_a=args.ripple or 0.0)
+
+    if args.bom:
+        targets = read_bom(args.bom, args.tol, args.imax)
+        for t, options in zip(targets, find_combinations_batch(targets, cores, coils, args.k, weights, stats=stats, dc_bias=args.bias)):
+            print(f"== {t.name}: L={t.L_target_h:.6g} H ±{t.tolerance*100:.1f}%")
+            print_options(options)
+        if stats is not None:
+            print(stats.summary())
+        return
+
+    if args.smallest_id:
+        print_id_frontier(find_smallest_id(args.L, cores, coils, args.tol, working_current_a=args.imax, stats=stats, dc_bias=args.bias))
+        if stats is not None:
+            print(stats.summary())
+        return
 
     options = find_combinations(
         L_target_h=args.L,
-        cores=CORES,
-        coils=COILS,
+        cores=cores,
+        coils=coils,
         tolerance=args.tol,
         max_results=args.k,
+        weights=weights,
         working_current_a=args.imax,
+        stats=stats,
+        dc_bias=args.bias,
     )
-
-    if not options:
-        print("No viable combinations found with given parameters.")
-        return
-
-    for i, d in enumerate(options, 1):
-        print(f"{i:2d}. Core={d.core.name} | Coil={d.coil.name} | N={d.turns} turns")
-        print(f"    L={d.L_h:.6g} H (err={d.rel_error*100:.2f}%) | R={d.resistance_ohm:.4f} Ω")
-        print(f"    Wire length={d.wire_length_m:.3f} m | Cost=${d.cost_usd:.2f} | Score={d.score:.4f}")
+    print_options(options)
+    if args.ripple is not None and options:
+        print(f"== losses ({args.ripple:g} A p-p ripple on {args.imax or 0:g} A DC)")
+        print_losses(options, option_losses(options, args.freq, args.ripple, args.imax))
+    if args.mc > 0 and options:
+        print(f"== tolerance analysis ({args.mc} samples per option)")
+        print_tolerances(analyze_tolerances(
+            options, args.L, args.tol, samples=args.mc, workers=args.workers,
+            working_current_a=args.imax, dc_bias=args.bias,
+        ))
+    if stats is not None:
+        print(stats.summary())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,74 @@
+# core_index.py
+# Core catalog index sorted on a pitch-free reach key for range queries by L target
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+from models import Core
+from engine import CoreTable, as_core_table, layered_capacity
+
+
+class CoreIndex:
+    """Core catalog kept sorted by the pitch-free reach key AL * window^2.
+
+    A core can reach L_target within tolerance only if some integer N >= 1 has
+    AL * N^2 in [L (1 - tol), L (1 + tol)] and N fits the window. With window =
+    HT * radial depth, a pitch-p winding holds at most window / p^2 turns, so
+    AL * window^2 >= L (1 - tol) p^4: the cores that pass are a suffix of the key
+    order, found with one binary search. N >= 1 (AL <= L (1 + tol)) and the exact
+    layered capacity (AL * cap^2 >= L (1 - tol)) are then checked on that suffix only.
+    Pass the index as `cores` to search.find_combinations.
+    """
+
+    def __init__(self, cores: Iterable[Core] | CoreTable = ()):
+        self.table = CoreTable([])
+        self._key_sorted = np.empty(0)               # AL * window^2, ascending
+        self._order = np.empty(0, dtype=np.int64)   # table row for each sorted position
+        self.add(cores)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def add(self, cores: Iterable[Core] | CoreTable) -> None:
+        """Append cores and merge their keys into the sorted order (no full re-sort)."""
+        new = as_core_table(cores)
+        if len(new) == 0:
+            return
+        base = len(self.table)
+        self.table = CoreTable.concat([self.table, new])
+
+        window = np.where(new.has_dims, new.ht_m * np.maximum(0.0, (new.od_m - new.id_m) / 2.0), 0.0)
+        key = new.al_h * window * window
+        new_order = np.argsort(key, kind="stable")
+        new_key = key[new_order]
+        pos = np.searchsorted(self._key_sorted, new_key, side="right")
+        self._key_sorted = np.insert(self._key_sorted, pos, new_key)
+        self._order = np.insert(self._order, pos, base + new_order)
+
+    def query(self, L_target_h: float, tolerance: float, pitch_m: float) -> np.ndarray:
+        """Table rows (ascending) of cores that can reach L_target_h with wire no thinner than pitch_m."""
+        if len(self.table) == 0 or pitch_m <= 0:
+            return np.empty(0, dtype=np.int64)
+        L_lo = max(0.0, L_target_h * (1 - tolerance)) * (1 - 1e-9)
+        L_hi = L_target_h * (1 + tolerance) * (1 + 1e-9)
+
+        # N <= window / pitch^2  =>  AL * window^2 >= L_lo * pitch^4; cores without
+        # dimensions have key 0 and drop out here
+        a = np.searchsorted(self._key_sorted, L_lo * pitch_m ** 4, side="right")
+        rows = self._order[a:]
+        t = self.table
+        rows = rows[t.al_h[rows] <= L_hi]   # N >= 1
+        # The exact bound: the most turns the layered winding holds must reach L_lo
+        cap = layered_capacity(t.od_m[rows], t.id_m[rows], t.ht_m[rows], t.has_dims[rows], pitch_m)
+        rows = rows[t.al_h[rows] * cap * cap >= L_lo]
+
+        keep = np.zeros(len(t), dtype=bool)
+        keep[rows] = True
+        return np.flatnonzero(keep)
+
+    def cores_for(self, L_target_h: float, tolerance: float, pitch_m: float) -> CoreTable:
+        """The query result as a CoreTable, in catalog order."""
+        return self.table.subset(self.query(L_target_h, tolerance, pitch_m))
@@ -0,0 +1,171 @@
+# custom_core.py
+# Winding-feasibility rules for a custom OD/ID/HT core and the inverse minimum-volume solver
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import ceil, exp, inf, log, nextafter, pi
+
+from models import MU0
+
+
+def initial_layers(N: int, HT_mm: float, d_mm: float) -> int:
+    tpl = max(1, int(HT_mm // d_mm))
+    return max(1, ceil(N / tpl))
+
+
+def bounds_from(N: int, d_mm: float, OD_mm: float, ID_mm: float, HT_mm: float, L_init: int | None = None):
+    # (layers, HT_min, OD_min, ID_min) for N turns of pitch d_mm
+    L_local = L_init or initial_layers(N, HT_mm, d_mm)
+    HT_min_local = d_mm * ceil(N / L_local)
+    OD_min_local = ID_mm + 2 * L_local * d_mm
+    ID_min_local = 2 * (L_local + 1) * d_mm
+    return L_local, HT_min_local, OD_min_local, ID_min_local
+
+
+def validate_feasible(N: int, d_mm: float, OD_mm: float, ID_mm: float, HT_mm: float, L: int) -> tuple[bool, str]:
+    tpl_local = int(HT_mm // d_mm)
+    if tpl_local <= 0:
+        return False, "HT too small (no turns per layer)."
+    if (OD_mm - ID_mm) / 2.0 < L * d_mm:
+        return False, "Radial thickness insufficient: increase OD or reduce ID or increase L."
+    if tpl_local * L < N:
+        return False, "Turns capacity too low: increase HT or L."
+    return True, "OK"
+
+
+def iwm_finished(OD_mm: float, ID_mm: float, HT_mm: float, L: int, d_mm: float) -> tuple[float, float, float]:
+    return (
+        round(OD_mm + 2 * L * d_mm, 3),
+        round(ID_mm - 2 * L * d_mm, 3),
+        round(HT_mm + 2 * L * d_mm, 3),
+    )
+
+
+def window_fill_from_capacity(N: int, HT_mm: float, d_mm: float, L: int) -> float:
+    tpl_local = max(1, int(HT_mm // d_mm))
+    cap_local = tpl_local * L
+    if cap_local <= 0:
+        return 0.0
+    return min(1.0, N / cap_local)
+
+
+def custom_core_inductance_h(mu_r: float, N: int, OD_mm: float, ID_mm: float, HT_mm: float) -> float:
+    # Rectangular-section toroid as the app builds it: Ae = (OD - ID)/2 * HT, le = π (OD - ID) / ln(OD/ID)
+    # => L = µ0 µr N² HT ln(OD/ID) / (2π)
+    return MU0 * mu_r * N * N * (HT_mm / 1e3) * log(OD_mm / ID_mm) / (2 * pi)
+
+
+@dataclass(frozen=True)
+class CustomCoreDesign:
+    turns: int
+    layers: int
+    od_mm: float
+    id_mm: float
+    ht_mm: float
+    L_h: float
+    rel_error: float
+    volume_mm3: float                # π/4 (OD² - ID²) HT
+
+
+def _at_least(x: float, ok) -> float:
+    # Smallest float >= x passing ok(); absorbs the rounding in floor(HT/d) and (OD - ID)/2
+    while not ok(x):
+        x = nextafter(x, inf)
+    return x
+
+
+def solve_custom_core(
+    L_target_h: float,
+    mu_r: float,
+    d_mm: float,
+    max_od_mm: float | None = None,
+    min_finished_id_mm: float = 0.0,
+    max_ht_mm: float | None = None,
+    tolerance: float = 0.1,
+    max_layers: int = 16,
+) -> CustomCoreDesign | None:
+    """Smallest-volume OD/ID/HT and N reaching L_target_h that pass validate_feasible.
+
+    For N turns in Ly layers of pitch d the winding fixes ID at its minimum,
+    max(min_finished_id + 2 Ly d, 2 (Ly + 1) d), and needs HT >= HT_min = d ceil(N/Ly) and a
+    radial wall w = (OD - ID)/2 >= Ly d. Hitting L exactly takes
+    ln(1 + 2w/ID) = K/HT with K = 2π L / (µ0 µr N²), and the volume π w (ID + w) HT falls
+    as HT grows, so for fixed N the best shape is the tallest one that still has w >= Ly d:
+    HT* = K / ln(1 + 2 Ly d / ID), clipped to max_ht. Either way the volume falls as N grows
+    (at HT = max_ht the wall needed for L shrinks with N), and min(HT*, max_ht) falls with N
+    while HT_min rises, so per layer count a bisection finds N*, the largest N with
+    min(HT*, max_ht) >= HT_min. N* gives the exact-L design and N* + 1 the minimal winding
+    box (HT_min, w = Ly d) whose L overshoots; it is kept if the overshoot stays within
+    tolerance. Returns None when no layer count fits.
+    """
+    d = d_mm
+    K_N2 = 2 * pi * L_target_h / (MU0 * mu_r) * 1e3  # K·N² in mm
+    best: CustomCoreDesign | None = None
+
+    for Ly in range(1, max_layers + 1):
+        ID = max(min_finished_id_mm + 2 * Ly * d, 2 * (Ly + 1) * d)
+        w_min = Ly * d
+        if max_od_mm is not None and ID + 2 * w_min > max_od_mm:
+            break  # ID and w_min only grow with Ly
+        ln_min = log(1 + 2 * w_min / ID)
+
+        def ht_star(N: int) -> float:
+            return K_N2 / (N * N) / ln_min
+
+        def ht_min(N: int) -> float:
+            return d * ceil(N / Ly)
+
+        def ht_fit(N: int) -> float:
+            # Height the shape gets: HT* clipped to max_ht, where a thicker wall makes up the L
+            return ht_star(N) if max_ht_mm is None else min(ht_star(N), max_ht_mm)
+
+        # N³ <= K·N² Ly / (d ln_min) bounds the largest N with ht_fit(N) >= ht_min(N)
+        lo, hi = 0, int((K_N2 * Ly / (d * ln_min)) ** (1 / 3)) + 2
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if ht_fit(mid) >= ht_min(mid):
+                lo = mid
+            else:
+                hi = mid
+        for N in (lo, lo + 1):
+            if N < 1 or N < Ly:
+                continue
+            design = _shape(L_target_h, mu_r, N, Ly, d, ID, ht_star(N), ht_min(N), max_od_mm, max_ht_mm, tolerance)
+            if design is not None and (best is None or design.volume_mm3 < best.volume_mm3):
+                best = design
+    return best
+
+
+def _shape(
+    L_target_h: float,
+    mu_r: float,
+    N: int,
+    Ly: int,
+    d: float,
+    ID: float,
+    HT_star: float,
+    HT_min: float,
+    max_od_mm: float | None,
+    max_ht_mm: float | None,
+    tolerance: float,
+) -> CustomCoreDesign | None:
+    if max_ht_mm is not None and HT_min > max_ht_mm:
+        return None
+    HT = max(HT_min, HT_star if max_ht_mm is None else min(HT_star, max_ht_mm))
+    K = 2 * pi * L_target_h / (MU0 * mu_r * N * N) * 1e3
+    if K / HT > 700:
+        return None  # would need an astronomically thick wall; exp() overflows
+    w = max(Ly * d, ID / 2 * (exp(K / HT) - 1))
+
+    HT = _at_least(HT, lambda h: int(h // d) * Ly >= N)
+    OD = _at_least(ID + 2 * w, lambda od: (od - ID) / 2.0 >= Ly * d)
+    if max_od_mm is not None and OD > max_od_mm:
+        return None
+    if not validate_feasible(N, d, OD, ID, HT, Ly)[0]:
+        return None
+    L = custom_core_inductance_h(mu_r, N, OD, ID, HT)
+    rel_error = abs(L - L_target_h) / L_target_h
+    if rel_error > tolerance:
+        return None
+    return CustomCoreDesign(N, Ly, OD, ID, HT, L, rel_error, pi / 4 * (OD * OD - ID * ID) * HT)
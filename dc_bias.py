@@ -0,0 +1,131 @@
+# dc_bias.py
+# DC-bias permeability roll-off of the High Flux grades and the biased turn-count solver
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import pi
+from typing import Sequence
+
+import numpy as np
+
+HIGH_FLUX_GRADES = (26.0, 60.0, 125.0)
+
+# 1 Oe = 1000 / (4π) A/m
+OE_PER_A_PER_M = 4 * pi / 1000
+
+
+def grade_index(mu_r: np.ndarray, grades: Sequence[float]) -> np.ndarray:
+    # Nearest on a log scale: cut at the geometric means of neighbouring grades
+    g = np.asarray(grades, dtype=float)
+    order = np.argsort(g)
+    cuts = np.sqrt(g[order][:-1] * g[order][1:])
+    return order[np.searchsorted(cuts, np.asarray(mu_r, dtype=float))]
+
+
+def nearest_grade(mu_r: np.ndarray, grades: Sequence[float] = HIGH_FLUX_GRADES) -> np.ndarray:
+    """Nominal permeability grade of each core; mu_r derived from a catalog AL sits near, not on, it."""
+    return np.asarray(grades, dtype=float)[grade_index(mu_r, grades)]
+
+
+@dataclass(frozen=True)
+class RollOff:
+    """Vendor-style curve fit %µ = 1 / (a + b H^c), H in oersted; a = 0.01 gives 100% at zero bias."""
+    a: float
+    b: float
+    c: float
+
+    def __post_init__(self):
+        if not 0 < self.c < 2:
+            raise ValueError("roll-off exponent c must be in (0, 2) for a monotone biased L(N)")
+
+
+def _fit(h50_oe: float, c: float = 1.8) -> RollOff:
+    # Curve through 100% at H = 0 and 50% at h50_oe. c < 2 keeps µ N² increasing in N,
+    # so the biased inductance is monotone and its tolerance band is one turn interval.
+    return RollOff(0.01, 0.01 / h50_oe ** c, c)
+
+
+# Approximations of the published High Flux roll-off (half permeability near 55 / 110 /
+# 240 Oe for 125u / 60u / 26u); replace with the vendor's coefficients where available
+ROLL_OFF = {125.0: _fit(55.0), 60.0: _fit(110.0), 26.0: _fit(240.0)}
+
+
+def field_oe(turns: np.ndarray, current_a: float, path_length_m: np.ndarray) -> np.ndarray:
+    # H = N I / le
+    return turns * current_a / path_length_m * OE_PER_A_PER_M
+
+
+def roll_off_coefficients(
+    mu_r: np.ndarray, curves: dict[float, RollOff] = ROLL_OFF,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """a, b, c of each core's nearest-grade curve."""
+    idx = grade_index(mu_r, tuple(curves))
+    fits = curves.values()
+    return tuple(np.array([getattr(fit, name) for fit in fits])[idx] for name in "abc")
+
+
+def permeability_fraction(
+    mu_r: np.ndarray,
+    H_oe: np.ndarray,
+    curves: dict[float, RollOff] = ROLL_OFF,
+) -> np.ndarray:
+    """µ(H) / µ(0) for each core, with the curve of its nearest grade."""
+    return _fraction(roll_off_coefficients(mu_r, curves), H_oe)
+
+
+def _fraction(abc: tuple[np.ndarray, np.ndarray, np.ndarray], H_oe: np.ndarray) -> np.ndarray:
+    a, b, c = abc
+    return 0.01 / (a + b * np.asarray(H_oe, dtype=float) ** c)
+
+
+def biased_turns(
+    L_target_h: np.ndarray | float,
+    al_h: np.ndarray,
+    mu_r: np.ndarray,
+    path_length_m: np.ndarray,
+    current_a: float,
+    n_max: np.ndarray | None = None,
+    curves: dict[float, RollOff] = ROLL_OFF,
+    max_iter: int = 100,
+    atol: float = 1e-6,
+) -> np.ndarray:
+    """Real turn count N with AL0 N² µ(N I / le)/µ(0) = L, for every core at once.
+
+    N is the fixed point of N = sqrt(L / (AL0 f(N I / le))). With f = 0.01 / (a + b H^c) it
+    is the root of φ(N) = N² - P - Q N^c, P = L a / (0.01 AL0), Q = L b (I/le)^c / (0.01 AL0).
+    For c < 2, φ falls then rises and is convex past its minimum, so the root is unique and
+    Newton steps from the upper bound max(sqrt(2P), (2Q)^(1/(2-c))) fall monotonically onto
+    it, in a few steps where plain fixed-point iteration crawls near the knee. Rows whose
+    root lies above n_max (e.g. the winding capacity), φ(n_max) < 0, come back NaN.
+    Callers snap N onto integers with the exact test, so atol need only be well under a turn.
+    """
+    al_h = np.asarray(al_h, dtype=float)
+    L = np.broadcast_to(np.asarray(L_target_h, dtype=float), al_h.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = L / al_h
+    out = np.full(al_h.shape, np.nan)
+    out[q == 0] = 0.0
+    active = np.flatnonzero(np.isfinite(q) & (q > 0) & (al_h > 0))
+    if current_a == 0:
+        out[active] = np.sqrt(q[active])
+        return out
+    a, b, c = roll_off_coefficients(mu_r[active], curves)
+    k = current_a / path_length_m[active] * OE_PER_A_PER_M  # H = k N
+    P = q[active] * a / 0.01
+    Q = q[active] * b * k ** c / 0.01
+    x = np.maximum(np.sqrt(2 * P), (2 * Q) ** (1 / (2 - c)))
+    if n_max is not None:
+        top = np.asarray(n_max, dtype=float)[active]
+        ok = top * top - P - Q * top ** c >= 0
+        active, P, Q, c, x = active[ok], P[ok], Q[ok], c[ok], np.minimum(x[ok], top[ok])
+    for _ in range(max_iter):
+        if x.size == 0:
+            break
+        step = (x * x - P - Q * x ** c) / (2 * x - c * Q * x ** (c - 1))
+        x = x - step
+        done = step <= atol
+        out[active[done]] = x[done]
+        keep = ~done
+        active, P, Q, c, x = active[keep], P[keep], Q[keep], c[keep], x[keep]
+    return out
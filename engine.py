@@ -0,0 +1,791 @@
+# engine.py
+# Array-backed evaluation of the core x turns x coil grid used by search.find_combinations
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from dc_bias import biased_turns, field_oe, nearest_grade, permeability_fraction
+from losses import LossInputs, total_loss_w
+from models import Core, Coil
+from physics import MU0
+from scorer import ScoreWeights, score_combo_array
+
+
+class CoreRecords(Sequence[Core]):
+    """Core objects built on demand from columns, for catalogs imported without per-row objects.
+
+    Holds the Core constructor fields; NaN b_sat_t and zero dimensions stand for None.
+    """
+
+    FIELDS = (
+        "name", "mu_r", "area_m2", "r_mean_m", "window_area_m2", "b_sat_t", "price_usd", "od_m", "id_m", "ht_m",
+        "od_before_m", "id_before_m", "ht_before_m",
+    )
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return int(self.columns["mu_r"].shape[0])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        c = self.columns
+        b_sat = float(c["b_sat_t"][i])
+        return Core(
+            name=str(c["name"][i]),
+            mu_r=float(c["mu_r"][i]),
+            area_m2=float(c["area_m2"][i]),
+            r_mean_m=float(c["r_mean_m"][i]),
+            window_area_m2=float(c["window_area_m2"][i]),
+            b_sat_t=None if b_sat != b_sat else b_sat,
+            price_usd=float(c["price_usd"][i]),
+            od_m=float(c["od_m"][i]) or None,
+            id_m=float(c["id_m"][i]) or None,
+            ht_m=float(c["ht_m"][i]) or None,
+            od_before_m=float(c["od_before_m"][i]) or None,
+            id_before_m=float(c["id_before_m"][i]) or None,
+            ht_before_m=float(c["ht_before_m"][i]) or None,
+        )
+
+    def take(self, rows: np.ndarray) -> CoreRecords:
+        return CoreRecords({name: col[rows] for name, col in self.columns.items()})
+
+    @classmethod
+    def concat(cls, parts: Sequence[CoreRecords]) -> CoreRecords:
+        return cls({name: np.concatenate([p.columns[name] for p in parts]) for name in cls.FIELDS})
+
+
+class CoreTable:
+    """Columnar view of a core catalog (one row per Core)."""
+
+    COLUMNS = (
+        "mu_r", "area_m2", "path_length_m", "al_h", "od_m", "id_m", "ht_m",
+        "has_dims", "window_area_m2", "b_sat_t", "price_usd",
+    )
+
+    def __init__(self, cores: Sequence[Core]):
+        self.cores: list[Core] | CoreRecords = list(cores)
+        n = len(self.cores)
+        self.mu_r = np.empty(n)
+        self.area_m2 = np.empty(n)
+        self.path_length_m = np.empty(n)
+        self.al_h = np.empty(n)
+        self.od_m = np.zeros(n)
+        self.id_m = np.zeros(n)
+        self.ht_m = np.zeros(n)
+        self.has_dims = np.zeros(n, dtype=bool)
+        self.window_area_m2 = np.empty(n)
+        self.b_sat_t = np.full(n, np.nan)
+        self.price_usd = np.empty(n)
+
+        for i, core in enumerate(self.cores):
+            self.mu_r[i] = core.mu_r
+            self.area_m2[i] = core.area_m2
+            self.path_length_m[i] = core.path_length_m
+            self.al_h[i] = core.al_h
+            self.price_usd[i] = core.price_usd
+            if core.b_sat_t is not None:
+                self.b_sat_t[i] = core.b_sat_t
+            self.od_m[i], self.id_m[i], self.ht_m[i] = core.winding_dims
+            self.has_dims[i] = core.has_dims
+            # Window area as reported on DesignOption
+            self.window_area_m2[i] = np.pi * (core.id_m / 2) ** 2 if core.id_m else core.window_area_m2
+
+    def __len__(self) -> int:
+        return len(self.cores)
+
+    @classmethod
+    def _from_columns(cls, cores: list[Core] | CoreRecords, columns: dict[str, np.ndarray]) -> CoreTable:
+        table = cls.__new__(cls)
+        table.cores = cores
+        for name in cls.COLUMNS:
+            setattr(table, name, columns[name])
+        return table
+
+    def subset(self, rows: np.ndarray) -> CoreTable:
+        """Rows of this table (in the given order) as a new CoreTable."""
+        if isinstance(self.cores, CoreRecords):
+            cores = self.cores.take(rows)
+        else:
+            cores = [self.cores[i] for i in rows]
+        return CoreTable._from_columns(cores, {name: getattr(self, name)[rows] for name in self.COLUMNS})
+
+    @classmethod
+    def concat(cls, tables: Sequence[CoreTable]) -> CoreTable:
+        parts = [t for t in tables if len(t)]
+        if parts and all(isinstance(t.cores, CoreRecords) for t in parts):
+            cores = CoreRecords.concat([t.cores for t in parts])
+        else:
+            cores = [c for t in tables for c in t.cores]
+        return cls._from_columns(
+            cores, {name: np.concatenate([getattr(t, name) for t in tables]) for name in cls.COLUMNS},
+        )
+
+
+class CoilTable:
+    """Columnar view of a coil list (one row per Coil)."""
+
+    def __init__(self, coils: Sequence[Coil]):
+        self.coils = list(coils)
+        self.d_eff_m = np.array([c.pitch_m for c in self.coils], dtype=float)
+        self.wire_diameter_m = np.array([c.wire_diameter_m for c in self.coils], dtype=float)
+        self.resistance_per_m_ohm = np.array([c.resistance_per_m_ohm for c in self.coils], dtype=float)
+        self.price_per_m_usd = np.array([c.price_per_m_usd for c in self.coils], dtype=float)
+        self.base_price_usd = np.array([c.base_price_usd for c in self.coils], dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.coils)
+
+
+@dataclass
+class Candidates:
+    """Compact candidate records: int32 indices into the core/coil tables plus float columns.
+
+    Window and leftover areas are not stored; they follow from the core row and fill_ratio
+    when a DesignOption is materialized.
+    """
+    core_idx: np.ndarray             # int32 row in the CoreTable
+    coil_idx: np.ndarray             # int32 row in the CoilTable
+    turns: np.ndarray                # int32
+    L_h: np.ndarray
+    rel_error: np.ndarray
+    wire_length_m: np.ndarray
+    resistance_ohm: np.ndarray
+    cost_usd: np.ndarray
+    score: np.ndarray
+    fill_ratio: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.turns.shape[0])
+
+    def take(self, rows: np.ndarray) -> "Candidates":
+        return Candidates(**{name: getattr(self, name)[rows] for name in _CANDIDATE_FIELDS})
+
+    def ranking(self) -> np.ndarray:
+        # Same order as the reference sort key (score, cost, rel_error); ties fall back to catalog order
+        return np.lexsort((self.coil_idx, self.turns, self.core_idx, self.rel_error, self.cost_usd, self.score))
+
+    def top_rows(self, k: int) -> np.ndarray:
+        """ranking()[:k] without sorting every row: partition on score, then sort the survivors."""
+        n = len(self)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if k >= n:
+            return self.ranking()
+        kth = np.partition(self.score, k - 1)[k - 1]
+        rows = np.flatnonzero(self.score <= kth)  # keeps every score tie at the cut
+        return rows[self.take(rows).ranking()[:k]]
+
+
+_CANDIDATE_FIELDS = tuple(Candidates.__dataclass_fields__)
+
+
+def _empty_candidates() -> Candidates:
+    ints = ("core_idx", "coil_idx", "turns")
+    return Candidates(**{name: np.empty(0, dtype=np.int32 if name in ints else float) for name in _CANDIDATE_FIELDS})
+
+
+def concat_candidates(parts: Sequence[Candidates]) -> Candidates:
+    return Candidates(**{name: np.concatenate([getattr(p, name) for p in parts]) for name in _CANDIDATE_FIELDS})
+
+
+def capacity_grid(cores: CoreTable, coils: CoilTable) -> np.ndarray:
+    """Layered turn capacity for every (core, coil) pair, shape (n_cores, n_coils)."""
+    return layered_capacity(
+        cores.od_m[:, None], cores.id_m[:, None], cores.ht_m[:, None], cores.has_dims[:, None], coils.d_eff_m[None, :]
+    )
+
+
+def layered_capacity(OD: np.ndarray, ID: np.ndarray, HT: np.ndarray, has_dims: np.ndarray, d: np.ndarray) -> np.ndarray:
+    # Broadcasting form of Coil.max_turns_on: floor(HT / d) * floor(((OD - ID) / 2) / d)
+    valid = has_dims & (d > 0) & (ID > 0) & (OD > ID) & (HT > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tpl = np.floor(HT / d)
+        layers = np.floor(((OD - ID) / 2.0) / d)
+    valid &= (tpl > 0) & (layers > 0)
+    return np.where(valid, tpl * layers, 0).astype(np.int64)
+
+
+def candidate_turns(
+    cores: CoreTable,
+    L_target_h: float,
+    tolerance: float,
+    max_turns_per_core: int | None = None,
+    working_current_a: float | None = None,
+    dc_bias: bool = False,
+    min_pitch_m: float | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Every integer N inside the tolerance band for every core, as flat (core_idx, turns) arrays.
+
+    Batched twin of physics.turns_in_tolerance: the valid N form the closed interval
+    [sqrt(L (1 - tol) / AL), sqrt(L (1 + tol) / AL)], snapped onto the exact tolerance test.
+    With dc_bias and a working current the band edges are the biased fixed points
+    (dc_bias.biased_turns) instead; biased L is still increasing in N, so the band stays
+    one interval. Deep in the roll-off L grows slowly with N and that interval can run to
+    turn counts no winding holds, so the biased band is also capped at the layered
+    capacity for min_pitch_m (the thinnest wire searched). The unbiased band gets the same
+    cap after the max_turns_per_core window is placed, so a wide tolerance on a large L
+    cannot enumerate turn counts every coil rejects, and the window still lands where
+    turns_in_tolerance puts it. Cores without a positive AL (zero or missing area) have no
+    band; they are solved on stand-in values so nothing divides by zero, then dropped.
+    """
+    mu_r, area, le = cores.mu_r, cores.area_m2, cores.path_length_m
+    live = cores.al_h > 0
+    if not live.all():
+        mu_r, area, le = (np.where(live, x, 1.0) for x in (mu_r, area, le))
+    al = MU0 * mu_r * area / le
+    biased = dc_bias and working_current_a is not None
+
+    def within(n: np.ndarray) -> np.ndarray:
+        L = MU0 * mu_r * (n ** 2) * area / le
+        if biased:
+            L = L * permeability_fraction(mu_r, field_oe(n, working_current_a, le))
+        return np.abs(L - L_target_h) / L_target_h <= tolerance
+
+    if min_pitch_m is not None:
+        ceiling = layered_capacity(cores.od_m, cores.id_m, cores.ht_m, cores.has_dims, np.float64(min_pitch_m))
+    else:
+        ceiling = np.full(len(cores), np.iinfo(np.int32).max)
+    if biased:
+        lo_n = biased_turns(max(0.0, L_target_h * (1 - tolerance)), al, mu_r, le, working_current_a, ceiling + 1)
+        hi_n = biased_turns(L_target_h * (1 + tolerance), al, mu_r, le, working_current_a, ceiling + 1)
+        reach = np.isfinite(lo_n)
+        # No upper fixed point below the ceiling: the band runs up to the ceiling
+        hi_n = np.where(np.isfinite(hi_n), np.minimum(hi_n, ceiling), ceiling)
+        lo = np.maximum(1, np.ceil(np.where(reach, lo_n, 1))).astype(np.int64)
+        hi = np.where(reach, np.floor(np.where(reach, hi_n, 0)), 0).astype(np.int64)
+    else:
+        lo = np.maximum(1, np.ceil(np.sqrt(max(0.0, L_target_h * (1 - tolerance)) / al))).astype(np.int64)
+        hi = np.floor(np.sqrt(L_target_h * (1 + tolerance) / al)).astype(np.int64)
+    down = (lo > 1) & within(lo - 1)
+    lo = np.where(down, lo - 1, np.where(within(lo), lo, lo + 1))
+    up = within(hi + 1)
+    hi = np.where(up, hi + 1, np.where((hi >= lo) & ~within(hi), hi - 1, hi))
+    if biased:
+        hi = np.where(reach, np.minimum(hi, ceiling), 0)
+
+    if max_turns_per_core is not None:
+        wide = hi - lo + 1 > max_turns_per_core
+        if biased:
+            n_req = biased_turns(L_target_h, al, mu_r, le, working_current_a, ceiling + 1)
+            n_req = np.where(np.isfinite(n_req), n_req, lo)
+        else:
+            n_req = np.sqrt(L_target_h * le / (MU0 * mu_r * area))
+        start = np.rint(n_req - (max_turns_per_core - 1) / 2).astype(np.int64)
+        capped_lo = np.minimum(np.maximum(start, lo), hi - max_turns_per_core + 1)
+        lo = np.where(wide, capped_lo, lo)
+        hi = np.where(wide, capped_lo + max_turns_per_core - 1, hi)
+    hi = np.where(live, np.minimum(hi, ceiling), 0)
+
+    counts = np.maximum(0, hi - lo + 1)
+    core_idx = np.repeat(np.arange(len(cores)), counts)
+    first = np.cumsum(counts) - counts
+    turns = lo[core_idx] + (np.arange(core_idx.shape[0]) - first[core_idx])
+    return core_idx, turns
+
+
+def layered_wire_length_batch(
+    cores: CoreTable,
+    coils: CoilTable,
+    turns: np.ndarray,
+    core_idx: np.ndarray | None = None,
+    coil_idx: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Closed-form search.layered_wire_length for a whole candidate batch.
+
+    With core_idx/coil_idx each row i is (core_idx[i], coil_idx[i], turns[i]); without them
+    the result spans the (n_cores, n_coils) grid and turns must broadcast against it.
+    Returns (wire_length_m, layers_used, finished_id_m, finished_od_m, capacity_turns).
+    """
+    if core_idx is None or coil_idx is None:
+        core_idx, coil_idx = np.arange(len(cores))[:, None], np.arange(len(coils))[None, :]
+    return layered_winding(
+        cores.od_m[core_idx], cores.id_m[core_idx], cores.ht_m[core_idx], cores.has_dims[core_idx],
+        coils.d_eff_m[coil_idx], turns,
+    )
+
+
+def layered_winding(
+    OD: np.ndarray,
+    ID: np.ndarray,
+    HT: np.ndarray,
+    has_dims: np.ndarray,
+    d: np.ndarray,
+    turns: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # layered_wire_length_batch on raw dimension arrays (all broadcast together)
+    cap = layered_capacity(OD, ID, HT, has_dims, d)
+    fits = cap > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tpl = np.where(fits, np.floor(HT / d), 1).astype(np.int64)
+
+    # Full layers form an arithmetic series: sum_{k=1..F} (ID + d (2k - 1)) = F*ID + d*F^2
+    n = np.clip(np.asarray(turns, dtype=np.int64), 0, cap)
+    full, rem = np.divmod(n, tpl)
+    length = np.pi * (tpl * (full * ID + d * full * full) + rem * (ID + d * (2 * full + 1)))
+    layers_used = full + (rem > 0)
+
+    finished_id = np.where(fits, np.maximum(0.0, ID - 2.0 * d * layers_used), ID)
+    finished_od = np.where(fits, OD + 2.0 * d * layers_used, OD)
+    return np.where(fits, length, 0.0), np.where(fits, layers_used, 0), finished_id, finished_od, cap
+
+
+def loss_inputs(
+    cores: CoreTable,
+    coils: CoilTable,
+    core_idx: np.ndarray,
+    coil_idx: np.ndarray,
+    turns: np.ndarray,
+    L_h: np.ndarray,
+    resistance_ohm: np.ndarray,
+    layers: np.ndarray | None = None,
+) -> LossInputs:
+    """losses.LossInputs for (core_idx[i], coil_idx[i], turns[i]) rows; layers from the layered winding unless given."""
+    if layers is None:
+        layers = layered_wire_length_batch(cores, coils, turns, core_idx, coil_idx)[1]
+    return LossInputs(
+        turns=turns, L_h=L_h, mu_r=cores.mu_r[core_idx], area_m2=cores.area_m2[core_idx],
+        path_length_m=cores.path_length_m[core_idx], bare_d_m=coils.wire_diameter_m[coil_idx],
+        pitch_m=coils.d_eff_m[coil_idx], layers=layers, dc_resistance_ohm=resistance_ohm,
+    )
+
+
+STAGES = ("turn_solve", "capacity", "wire_length", "scoring", "sort")
+
+
+@dataclass
+class SearchStats:
+    """Counters and stage timings filled in by the search when a stats object is passed in.
+
+    Rejections are counted where they happen: tolerance per core (no integer turn count
+    inside the band), saturation per (core, N) row, capacity per (core, N, coil) row.
+    Counters and wall times accumulate across queries. Without a stats object the search
+    makes no timing calls and computes none of the counts.
+    """
+    cores_total: int = 0
+    cores_evaluated: int = 0
+    cores_pruned: int = 0          # skipped by the branch-and-bound score bound
+    coils_pruned: int = 0          # (core, coil) pairs skipped by the per-coil bound
+    rejected_tolerance: int = 0    # cores with no turn count inside the tolerance band
+    rejected_saturation: int = 0   # (core, N) rows with B above b_sat_t
+    rejected_capacity: int = 0     # (core, N, coil) rows with N above max_turns_on
+    survivors: int = 0             # (core, N, coil) rows that were scored
+    seconds: dict[str, float] = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+
+    def lap(self, stage: str, t0: float) -> float:
+        # Charge the time since t0 to stage; returns the new start time
+        now = perf_counter()
+        self.seconds[stage] += now - t0
+        return now
+
+    def summary(self) -> str:
+        lines = [
+            f"cores: {self.cores_total} total, {self.cores_evaluated} evaluated, {self.cores_pruned} pruned by bound",
+            f"rejected: {self.rejected_tolerance} cores by tolerance, {self.rejected_saturation} turn counts by saturation, "
+            f"{self.rejected_capacity} (turns, coil) rows by capacity, {self.coils_pruned} coil pairs by bound",
+            f"survivors: {self.survivors}",
+            "time: " + ", ".join(f"{k} {v * 1e3:.2f} ms" for k, v in self.seconds.items()),
+        ]
+        return "\n".join(lines)
+
+
+def _turn_stage(
+    L_target_h: float,
+    cores: CoreTable,
+    tolerance: float,
+    working_current_a: float | None,
+    max_turns_per_core: int | None,
+    stats: SearchStats | None = None,
+    dc_bias: bool = False,
+    min_pitch_m: float | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # (core_idx, turns, L, rel_error) for every turn count passing tolerance and saturation;
+    # with dc_bias, L and B use the permeability left at the working current
+    if working_current_a is not None and not working_current_a >= 0:
+        raise ValueError("working_current_a must be >= 0 (A)")
+    t0 = perf_counter() if stats is not None else 0.0
+    core_idx, turns = candidate_turns(
+        cores, L_target_h, tolerance, max_turns_per_core, working_current_a, dc_bias, min_pitch_m,
+    )
+
+    mu_r = cores.mu_r[core_idx]
+    le = cores.path_length_m[core_idx]
+    L_actual = MU0 * mu_r * (turns ** 2) * cores.area_m2[core_idx] / le
+    if dc_bias and working_current_a is not None:
+        f = permeability_fraction(mu_r, field_oe(turns, working_current_a, le))
+        L_actual, mu_r = L_actual * f, mu_r * f
+    rel_error = np.abs(L_actual - L_target_h) / L_target_h
+    ok = rel_error <= tolerance
+    if stats is not None:
+        stats.cores_total += len(cores)
+        stats.rejected_tolerance += len(cores) - np.unique(core_idx[ok]).size
+
+    # Optional saturation check (coil independent)
+    if working_current_a is not None:
+        b_sat = cores.b_sat_t[core_idx]
+        B = (MU0 * mu_r * turns * working_current_a) / le
+        saturated = B > b_sat  # NaN b_sat never rejects
+        if stats is not None:
+            stats.rejected_saturation += int((ok & saturated).sum())
+        ok &= ~saturated
+
+    if stats is not None:
+        stats.lap("turn_solve", t0)
+    return core_idx[ok], turns[ok], L_actual[ok], rel_error[ok]
+
+
+def _min_pitch(coils: CoilTable) -> float | None:
+    return float(coils.d_eff_m.min()) if len(coils) else None
+
+
+def _score_pairs(
+    cores: CoreTable,
+    coils: CoilTable,
+    cap: np.ndarray,
+    ci: np.ndarray,
+    coil_idx: np.ndarray,
+    N: np.ndarray,
+    L_actual: np.ndarray,
+    rel_error: np.ndarray,
+    weights: ScoreWeights,
+    stats: SearchStats | None = None,
+    working_current_a: float | None = None,
+) -> Candidates:
+    # Wire length, cost and score for (core, coil, N) rows that already fit the capacity
+    t0 = perf_counter() if stats is not None else 0.0
+    wire_length, layers = layered_wire_length_batch(cores, coils, N, ci, coil_idx)[:2]
+    if stats is not None:
+        t0 = stats.lap("wire_length", t0)
+
+    resistance = coils.resistance_per_m_ohm[coil_idx] * wire_length
+    cost = cores.price_usd[ci] + coils.base_price_usd[coil_idx] + (coils.price_per_m_usd[coil_idx] * wire_length)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        used_fraction = np.where(cap <= 0, 0.0, np.minimum(1.0, N / cap))
+    loss = None
+    if weights.w_loss != 0:
+        loss = total_loss_w(
+            loss_inputs(cores, coils, ci, coil_idx, N, L_actual, resistance, layers),
+            weights.loss_frequency_hz, weights.loss_ripple_a, working_current_a,
+        )
+    score = score_combo_array(rel_error, cost, resistance, weights, fill_ratio=used_fraction, loss_w=loss)
+    if stats is not None:
+        stats.survivors += int(N.size)
+        stats.lap("scoring", t0)
+
+    return Candidates(
+        core_idx=ci.astype(np.int32), coil_idx=coil_idx.astype(np.int32), turns=N.astype(np.int32),
+        L_h=L_actual, rel_error=rel_error, wire_length_m=wire_length, resistance_ohm=resistance,
+        cost_usd=cost, score=score, fill_ratio=used_fraction,
+    )
+
+
+def evaluate(
+    L_target_h: float,
+    cores: CoreTable,
+    coils: CoilTable,
+    tolerance: float = 0.1,
+    weights: ScoreWeights = ScoreWeights(),
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+    cap_grid: np.ndarray | None = None,
+    stats: SearchStats | None = None,
+    dc_bias: bool = False,
+) -> Candidates:
+    """Evaluate the full candidate grid with broadcasting and return the feasible rows.
+
+    cap_grid (capacity_grid(cores, coils)) can be passed in when several targets share a catalog.
+    """
+    core_idx, turns, L_actual, rel_error = _turn_stage(
+        L_target_h, cores, tolerance, working_current_a, max_turns_per_core, stats, dc_bias, _min_pitch(coils),
+    )
+
+    t0 = perf_counter() if stats is not None else 0.0
+    if cap_grid is None:
+        cap_grid = capacity_grid(cores, coils)
+    pair, coil_idx = np.nonzero(turns[:, None] <= cap_grid[core_idx])
+    ci = core_idx[pair]
+    if stats is not None:
+        stats.cores_evaluated += len(cores)
+        stats.rejected_capacity += turns.size * len(coils) - pair.size
+        stats.lap("capacity", t0)
+    return _score_pairs(
+        cores, coils, cap_grid[ci, coil_idx], ci, coil_idx, turns[pair], L_actual[pair], rel_error[pair], weights, stats,
+        working_current_a,
+    )
+
+
+def thickest_fitting(cores: CoreTable, core_idx: np.ndarray, turns: np.ndarray, d_sorted: np.ndarray) -> np.ndarray:
+    """Last row of an ascending pitch array whose layered capacity still holds N turns, per (core, N).
+
+    Capacity never grows with the pitch, so the fitting rows are a prefix and all queries
+    bisect together: ceil(log2(n + 1)) rounds of layered_capacity instead of n. -1 where
+    not even the thinnest wire fits.
+    """
+    n = d_sorted.shape[0]
+    lo = np.zeros(turns.shape[0], dtype=np.int64)
+    hi = np.full(turns.shape[0], n, dtype=np.int64)
+    if n == 0:
+        return lo - 1
+    OD, ID, HT, has_dims = cores.od_m[core_idx], cores.id_m[core_idx], cores.ht_m[core_idx], cores.has_dims[core_idx]
+    for _ in range(n.bit_length()):
+        active = lo < hi
+        mid = (lo + hi) // 2
+        fits = active & (layered_capacity(OD, ID, HT, has_dims, d_sorted[np.minimum(mid, n - 1)]) >= turns)
+        lo = np.where(fits, mid + 1, lo)
+        hi = np.where(active & ~fits, mid, hi)
+    return lo - 1
+
+
+def evaluate_thickest(
+    L_target_h: float,
+    cores: CoreTable,
+    wires: CoilTable,
+    tolerance: float = 0.1,
+    weights: ScoreWeights = ScoreWeights(),
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+    stats: SearchStats | None = None,
+    dc_bias: bool = False,
+) -> Candidates:
+    """One candidate per (core, N): the heaviest wire that still fits (wires sorted by pitch,
+    e.g. wire_catalog.WireCatalog.table). Rows without any fitting wire are dropped.
+    """
+    core_idx, turns, L_actual, rel_error = _turn_stage(
+        L_target_h, cores, tolerance, working_current_a, max_turns_per_core, stats, dc_bias, _min_pitch(wires),
+    )
+    t0 = perf_counter() if stats is not None else 0.0
+    coil_idx = thickest_fitting(cores, core_idx, turns, wires.d_eff_m)
+    ok = coil_idx >= 0
+    ci, coil_idx = core_idx[ok], coil_idx[ok]
+    cap = layered_capacity(
+        cores.od_m[ci], cores.id_m[ci], cores.ht_m[ci], cores.has_dims[ci], wires.d_eff_m[coil_idx],
+    )
+    if stats is not None:
+        stats.cores_evaluated += len(cores)
+        stats.rejected_capacity += int((~ok).sum())
+        stats.lap("capacity", t0)
+    return _score_pairs(
+        cores, wires, cap, ci, coil_idx, turns[ok], L_actual[ok], rel_error[ok], weights, stats, working_current_a,
+    )
+
+
+def evaluate_smallest_id(
+    L_target_h: float,
+    cores: CoreTable,
+    coils: CoilTable,
+    tolerance: float = 0.1,
+    weights: ScoreWeights = ScoreWeights(),
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+    stats: SearchStats | None = None,
+    dc_bias: bool = False,
+) -> Candidates:
+    """Per grade (nearest_grade of mu_r) and coil, the smallest-ID core that reaches L within tolerance and holds the winding.
+
+    The catalog is ordered by (grade, ID) once and tested against every coil in one
+    broadcast: a core fits a coil when its smallest in-band N is within the layered
+    capacity. Feasibility is not monotone in ID (AL does not follow ID), so the first
+    fitting row per grade and coil is taken with argmax rather than a bisection. Each
+    (grade, coil) row keeps the fitting N closest to target; rows come out by grade, then
+    coil order, and pairs with no fitting core are absent.
+    """
+    core_idx, turns, L_actual, rel_error = _turn_stage(
+        L_target_h, cores, tolerance, working_current_a, max_turns_per_core, stats, dc_bias, _min_pitch(coils),
+    )
+    t0 = perf_counter() if stats is not None else 0.0
+    # candidate_turns emits each core's N as one ascending run
+    run_cores, run_start, run_len = np.unique(core_idx, return_index=True, return_counts=True)
+    grade = nearest_grade(cores.mu_r[run_cores])
+    order = np.lexsort((run_cores, cores.id_m[run_cores], grade))
+    run_cores, run_start, run_len, grade = run_cores[order], run_start[order], run_len[order], grade[order]
+
+    cap = capacity_grid(cores.subset(run_cores), coils)
+    feasible = turns[run_start][:, None] <= cap
+    bounds = np.flatnonzero(np.diff(grade)) + 1
+    first_rows, coil_idx = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for s, e in zip(np.r_[0, bounds], np.r_[bounds, grade.size]):
+        block = feasible[s:e]
+        hit = np.flatnonzero(block.any(axis=0))
+        if hit.size:
+            first_rows.append(s + block[:, hit].argmax(axis=0))
+            coil_idx.append(hit)
+    first_rows, coil_idx = np.concatenate(first_rows), np.concatenate(coil_idx)
+
+    # Every N of the chosen cores, kept where it fits; then the smallest rel_error per pair
+    pair = np.repeat(np.arange(first_rows.size), run_len[first_rows])
+    rows = _ranges(run_start[first_rows], run_start[first_rows] + run_len[first_rows])
+    fits = turns[rows] <= cap[first_rows[pair], coil_idx[pair]]
+    pair, rows = pair[fits], rows[fits]
+    best = np.lexsort((turns[rows], rel_error[rows], pair))
+    best = best[np.r_[True, pair[best][1:] != pair[best][:-1]]] if best.size else best
+    pair, rows = pair[best], rows[best]
+    if stats is not None:
+        stats.cores_evaluated += len(cores)
+        stats.rejected_capacity += int(run_cores.size * len(coils) - feasible.sum())
+        stats.lap("capacity", t0)
+    return _score_pairs(
+        cores, coils, cap[first_rows[pair], coil_idx[pair]], core_idx[rows], coil_idx[pair],
+        turns[rows], L_actual[rows], rel_error[rows], weights, stats, working_current_a,
+    )
+
+
+def iter_candidate_chunks(
+    L_target_h: float,
+    cores: CoreTable,
+    coils: CoilTable,
+    tolerance: float = 0.1,
+    weights: ScoreWeights = ScoreWeights(),
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+    chunk_cores: int = 256,
+    dc_bias: bool = False,
+) -> Iterator[Candidates]:
+    """evaluate(...) one slice of cores at a time, in catalog order (rows are unranked).
+
+    core_idx refers to the full table. Memory is bounded by the chunk, not the catalog.
+    """
+    for start in range(0, len(cores), chunk_cores):
+        rows = np.arange(start, min(len(cores), start + chunk_cores))
+        part = evaluate(
+            L_target_h, cores.subset(rows), coils, tolerance, weights, working_current_a, max_turns_per_core,
+            dc_bias=dc_bias,
+        )
+        if len(part):
+            part.core_idx = part.core_idx + start
+            yield part
+
+
+def _ranges(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    # Concatenation of arange(start, stop) for each pair, without a Python loop
+    counts = stops - starts
+    first = np.cumsum(counts) - counts
+    return np.repeat(starts - first, counts) + np.arange(counts.sum())
+
+
+def evaluate_top_k(
+    L_target_h: float,
+    cores: CoreTable,
+    coils: CoilTable,
+    k: int,
+    tolerance: float = 0.1,
+    weights: ScoreWeights = ScoreWeights(),
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+    stats: SearchStats | None = None,
+    block_size: int = 256,
+    cap_grid: np.ndarray | None = None,
+    dc_bias: bool = False,
+) -> Candidates:
+    """Branch-and-bound top-k: same rows as evaluate(...) ranked and cut to k, with bounded work.
+
+    Cores are visited in order of a lower bound on score_combo and skipped once the bound
+    cannot beat the current k-th best score. Every term of the bound is a per-term minimum:
+    best rel_error in the core's turn interval, core price plus cheapest coil base price,
+    and the cheapest per-metre cost/resistance weight times a minimum wire length
+    (N_min turns at the first-layer diameter of the thinnest wire). The fill penalty and
+    the loss term are >= 0 and left out of the bound.
+    """
+    core_idx, turns, L_actual, rel_error = _turn_stage(
+        L_target_h, cores, tolerance, working_current_a, max_turns_per_core, stats, dc_bias, _min_pitch(coils),
+    )
+    best = _empty_candidates()
+    if k <= 0 or core_idx.size == 0 or len(coils) == 0:
+        return best
+
+    # Rows of the turn stage are grouped by core in ascending N (candidate_turns emits them that way)
+    n_cores = len(cores)
+    row_start = np.searchsorted(core_idx, np.arange(n_cores), side="left")
+    row_stop = np.searchsorted(core_idx, np.arange(n_cores), side="right")
+    has_turns = row_stop > row_start
+    min_err = np.full(n_cores, np.inf)
+    np.minimum.at(min_err, core_idx, rel_error)
+    min_err[~has_turns] = 0.0
+    n_min = np.where(has_turns, turns[np.minimum(row_start, turns.size - 1)], 0)
+
+    w = weights
+    per_m = w.w_cost * coils.price_per_m_usd + w.w_resistance * coils.resistance_per_m_ohm
+    monotone = min(w.w_error, w.w_cost, w.w_resistance, w.w_fill, w.w_loss) >= 0
+    t0 = perf_counter() if stats is not None else 0.0
+    if cap_grid is None:
+        cap_grid = capacity_grid(cores, coils)
+    if stats is not None:
+        stats.lap("capacity", t0)
+
+    def coil_bounds(c: np.ndarray) -> np.ndarray:
+        # Lower bound per (core, coil) pair, shape (len(c), n_coils)
+        wire_lb = n_min[c][:, None] * (np.pi * (cores.id_m[c][:, None] + coils.d_eff_m[None, :]))
+        lb = w.w_error * min_err[c][:, None] + w.w_cost * (cores.price_usd[c][:, None] + coils.base_price_usd[None, :]) + per_m[None, :] * wire_lb
+        return lb - 1e-12 * np.abs(lb)  # slack for rounding against the exact score
+
+    d_min = coils.d_eff_m.min()
+    core_lb = (
+        w.w_error * min_err + w.w_cost * (cores.price_usd + coils.base_price_usd.min())
+        + per_m.min() * (n_min * (np.pi * (cores.id_m + d_min)))
+    )
+    core_lb = np.where(has_turns, core_lb - 1e-12 * np.abs(core_lb), np.inf)
+    if not monotone:
+        core_lb[:] = -np.inf  # negative weights break the bound; fall back to exhaustive
+    order = np.argsort(core_lb, kind="stable")
+    order = order[has_turns[order]]  # cores with no turn count in tolerance never enter the search
+
+    slot = np.zeros(n_cores, dtype=np.int64)
+    b, size = 0, min(block_size, max(8, k))  # small first block so the threshold tightens early
+    while b < order.size:
+        threshold = best.score[k - 1] if len(best) >= k else np.inf
+        block = order[b:b + size]
+        live = core_lb[block] <= threshold
+        if not live.any():
+            if stats is not None:
+                stats.cores_pruned += int(order.size - b)  # bounds are sorted: the rest cannot win either
+            break
+        b, size = b + size, min(block_size, 2 * size)
+        block = block[live]
+        if stats is not None:
+            stats.cores_pruned += int((~live).sum())
+            stats.cores_evaluated += int(block.size)
+            t0 = perf_counter()
+
+        rows = _ranges(row_start[block], row_stop[block])
+        ci, N = core_idx[rows], turns[rows]
+        fits = N[:, None] <= cap_grid[ci]
+        if stats is not None:
+            stats.rejected_capacity += int(fits.size - fits.sum())
+        if monotone:
+            # Per-coil bound, evaluated once per core and broadcast to that core's turn rows
+            coil_ok = coil_bounds(block) <= threshold
+            slot[block] = np.arange(block.size)
+            if stats is not None:
+                stats.coils_pruned += int((~coil_ok & (n_min[block][:, None] <= cap_grid[block])).sum())
+            fits &= coil_ok[slot[ci]]
+        pair, coil_idx = np.nonzero(fits)
+        rows = rows[pair]
+        ci = core_idx[rows]
+        if stats is not None:
+            stats.lap("capacity", t0)
+        scored = _score_pairs(
+            cores, coils, cap_grid[ci, coil_idx], ci, coil_idx, turns[rows], L_actual[rows], rel_error[rows], weights, stats,
+            working_current_a,
+        )
+        t0 = perf_counter() if stats is not None else 0.0
+        merged = concat_candidates([best, scored])
+        best = merged.take(merged.top_rows(k))
+        if stats is not None:
+            stats.lap("sort", t0)
+
+    return best
+
+
+def as_core_table(cores: Iterable[Core] | CoreTable) -> CoreTable:
+    return cores if isinstance(cores, CoreTable) else CoreTable(list(cores))
+
+
+def as_coil_table(coils: Iterable[Coil] | CoilTable) -> CoilTable:
+    return coils if isinstance(coils, CoilTable) else CoilTable(list(coils))
@@ -5,13 +5,19 @@ from __future__ import annotations
 
 import csv
 import io
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from math import pi
+from math import log, pi
 from pathlib import Path
-from typing import Iterable, Union, TextIO, Any
+from typing import Iterable, Iterator, Union, TextIO, Any
 
+import numpy as np
+
+from engine import CoreRecords, CoreTable
 from models import Core
 from physics import MU0
+from xlsx_reader import iter_sheet_rows
 
 
 @dataclass
@@ -25,6 +31,10 @@ class ParsedRow:
     od_after_m: float
     id_after_m: float
     ht_after_m: float
+    # Before-finish (uncoated) MAX/MIN dimensions; 0.0 when the catalog has no such group
+    od_before_m: float = 0.0
+    id_before_m: float = 0.0
+    ht_before_m: float = 0.0
 
 
 def _to_float(value: str | None) -> float | None:
@@ -39,64 +49,179 @@ def _to_float(value: str | None) -> float | None:
         return None
 
 
-def _parse_csv_rows(source: Union[str, Path, TextIO, bytes, bytearray]) -> list[ParsedRow]:
-    rows: list[ParsedRow] = []
-    # Normalize source to a file-like reader
-    close_after = False
+def _open_source(source: Union[str, Path, TextIO, bytes, bytearray]) -> tuple[TextIO, bool]:
+    # Normalize source to a file-like reader; the bool says whether we own (and close) it
     if isinstance(source, (str, Path)):
-        f: TextIO = open(source, newline="", encoding="utf-8")
-        close_after = True
-    elif hasattr(source, "read"):
-        f = source  # type: ignore[assignment]
-    else:
-        if isinstance(source, (bytes, bytearray)):
-            f = io.StringIO(source.decode("utf-8"))
-        else:
-            f = io.StringIO(str(source))
-        close_after = True
+        return open(source, newline="", encoding="utf-8"), True
+    if hasattr(source, "read"):
+        return source, False  # type: ignore[return-value]
+    if isinstance(source, (bytes, bytearray)):
+        return io.StringIO(source.decode("utf-8")), True
+    return io.StringIO(str(source)), True
 
-    try:
-        reader = csv.reader(f)
-        for raw in reader:
-            if not raw:
-                continue
-            if len(raw) < 13:
-                continue
-            part = (raw[1] or "").strip()
-            if not part or part.startswith("Part No") or part.startswith("Nominal"):
-                continue
-            if not part.upper().startswith("CH"):
+
+# Column positions of the CH-series layout as shipped (the CSV export); the header rows of
+# each source override them
+DEFAULT_COLUMNS = {
+    "part": 1, "al_26": 2, "al_60": 3, "al_125": 4, "path": 5, "area": 6,
+    "od_before": 7, "id_before": 8, "ht_before": 9, "od": 10, "id": 11, "ht": 12,
+}
+
+
+class _HeaderColumns:
+    """Column positions read from the header block above the first part row.
+
+    Labels are matched on their text: 'Part No', the 26u/060u/125u grade row, 'Path Length',
+    'Cross Section Area' and the OD/ID/HT(mm) labels under 'After Finish Dimensions' (the
+    last OD/ID/HT group when that heading is missing). The before-finish group is the
+    OD/ID/HT labels left of those, under 'Before Finish Dimensions' when present; a header
+    with a single group has none. Anything not found keeps its DEFAULT_COLUMNS position.
+    """
+
+    def __init__(self):
+        self.found: dict[str, int] = {}
+        self.after_finish: int | None = None
+        self.before_finish: int | None = None
+        self.dims: dict[str, list[int]] = {"od": [], "id": [], "ht": []}
+
+    def feed(self, row: list[str | None]) -> None:
+        for j, cell in enumerate(row):
+            text = (cell or "").strip().lower()
+            if not text:
                 continue
+            if text.startswith("part no"):
+                self.found["part"] = j
+            elif text.startswith("path length"):
+                self.found["path"] = j
+            elif text.startswith("cross section"):
+                self.found["area"] = j
+            elif text.startswith("after finish"):
+                self.after_finish = j
+            elif text.startswith("before finish"):
+                self.before_finish = j
+            elif text in ("26u", "060u", "60u", "125u"):
+                self.found["al_" + text.lstrip("0")[:-1]] = j
+            elif text[:2] in self.dims and text[2:].replace(" ", "").startswith("(mm)"):
+                self.dims[text[:2]].append(j)
+
+    def columns(self) -> dict[str, int]:
+        cols = {**DEFAULT_COLUMNS, **self.found}
+        for key, positions in self.dims.items():
+            if self.after_finish is not None:
+                positions = [j for j in positions if j >= self.after_finish]
+            if positions:
+                cols[key] = positions[0] if self.after_finish is not None else positions[-1]
+            before = [
+                j for j in self.dims[key]
+                if j < cols[key] and (self.before_finish is None or j >= self.before_finish)
+            ]
+            if before:
+                cols[key + "_before"] = before[-1]
+            elif self.dims[key]:
+                cols.pop(key + "_before")
+        return cols
 
-            al26 = _to_float(raw[2])
-            al60 = _to_float(raw[3])
-            al125 = _to_float(raw[4])
-            path_cm = _to_float(raw[5]) or 0.0
-            area_cm2 = _to_float(raw[6]) or 0.0
-            od_a_mm = _to_float(raw[10]) or 0.0
-            id_a_mm = _to_float(raw[11]) or 0.0
-            ht_a_mm = _to_float(raw[12]) or 0.0
-
-            rows.append(
-                ParsedRow(
-                    part_no=part,
-                    al_26_nH=al26,
-                    al_60_nH=al60,
-                    al_125_nH=al125,
-                    path_len_m=path_cm * 1e-2,
-                    area_m2=area_cm2 * 1e-4,
-                    od_after_m=od_a_mm * 1e-3,
-                    id_after_m=id_a_mm * 1e-3,
-                    ht_after_m=ht_a_mm * 1e-3,
-                )
-            )
+
+def _iter_source_rows(source: Union[str, Path, TextIO, bytes, bytearray]) -> Iterator[list[str | None]]:
+    # .xlsx workbooks are read directly; anything else is CSV text
+    if isinstance(source, (str, Path)) and str(source).lower().endswith(".xlsx"):
+        yield from iter_sheet_rows(source)
+        return
+    f, close_after = _open_source(source)
+    try:
+        yield from csv.reader(f)
     finally:
         if close_after:
             try:
                 f.close()
             except Exception:
                 pass
-    return rows
+
+
+def _iter_catalog_values(source: Union[str, Path, TextIO, bytes, bytearray]) -> Iterator[tuple[Any, ...]]:
+    """ParsedRow field tuples (SI units) for every part row of a CSV or .xlsx catalog, one row at a time.
+
+    Column positions are detected once from the header rows above the first part.
+    """
+    header = _HeaderColumns()
+    cols: dict[str, int] | None = None
+    for raw in _iter_source_rows(source):
+        if not raw:
+            continue
+        if cols is None:
+            guess = header.columns()
+            cell = raw[guess["part"]] if len(raw) > guess["part"] else None
+            if not (cell or "").strip().upper().startswith("CH"):
+                header.feed(raw)
+                continue
+            cols = guess
+            c_part, c26, c60, c125 = cols["part"], cols["al_26"], cols["al_60"], cols["al_125"]
+            c_path, c_area, c_od, c_id, c_ht = cols["path"], cols["area"], cols["od"], cols["id"], cols["ht"]
+            c_before = [cols.get(key + "_before") for key in ("od", "id", "ht")]
+            width = max(cols.values()) + 1
+        if len(raw) < width:
+            continue
+        part = (raw[c_part] or "").strip()
+        if not part or part.startswith("Part No") or part.startswith("Nominal"):
+            continue
+        if not part.upper().startswith("CH"):
+            continue
+
+        path_cm = _to_float(raw[c_path]) or 0.0
+        area_cm2 = _to_float(raw[c_area]) or 0.0
+        od_a_mm = _to_float(raw[c_od]) or 0.0
+        id_a_mm = _to_float(raw[c_id]) or 0.0
+        ht_a_mm = _to_float(raw[c_ht]) or 0.0
+        yield (
+            part, _to_float(raw[c26]), _to_float(raw[c60]), _to_float(raw[c125]),
+            path_cm * 1e-2, area_cm2 * 1e-4, od_a_mm * 1e-3, id_a_mm * 1e-3, ht_a_mm * 1e-3,
+            *((_to_float(raw[c]) or 0.0) * 1e-3 if c is not None else 0.0 for c in c_before),
+        )
+
+
+AWG_LABELS = {
+    "awg": ("awg", "gauge"),
+    "diameter_mm": ("직경", "diameter"),
+    "area_mm2": ("단면적", "area"),
+    "ohm_per_m": ("저항", "resistance"),
+    "current_a": ("허용전류", "current", "ampacity"),
+}
+
+
+def _iter_awg_values(source: Union[str, Path, TextIO, bytes, bytearray]) -> Iterator[tuple[Any, ...]]:
+    """(awg, diameter_mm, area_mm2, ohm_per_m, current_a text) per gauge row of awg.csv or the AWG workbook.
+
+    The header row is the first row naming every AWG_LABELS column; current_a stays text
+    because the vendor table gives ranges such as "280~298".
+    """
+    cols: dict[str, int] | None = None
+    for raw in _iter_source_rows(source):
+        cells = [(c or "").strip() for c in raw]
+        if cols is None:
+            found = {}
+            for key, labels in AWG_LABELS.items():
+                for j, text in enumerate(cells):
+                    if text.lower().startswith(labels):
+                        found[key] = j
+                        break
+            if len(found) == len(AWG_LABELS):
+                cols = found
+            continue
+        if len(cells) <= max(cols.values()) or not cells[cols["awg"]]:
+            continue
+        d = _to_float(cells[cols["diameter_mm"]])
+        if d is None:
+            continue
+        current = cells[cols["current_a"]]
+        if _to_float(current) is not None:
+            current = "%.15g" % float(current)  # workbook cells store 0.588 as 0.58799999999999997
+        yield (
+            cells[cols["awg"]], d, _to_float(cells[cols["area_mm2"]]), _to_float(cells[cols["ohm_per_m"]]), current,
+        )
+
+
+def _parse_csv_rows(source: Union[str, Path, TextIO, bytes, bytearray]) -> list[ParsedRow]:
+    return [ParsedRow(*values) for values in _iter_catalog_values(source)]
 
 
 def _mu_r_from_al(al_nH_per_N2: float, area_m2: float, path_m: float) -> float:
@@ -108,39 +233,143 @@ def _mu_r_from_al(al_nH_per_N2: float, area_m2: float, path_m: float) -> float:
 
 
 def cores_from_high_flux_csv(source: Union[str, Path, TextIO, bytes, bytearray]) -> list[Core]:
-    parsed = _parse_csv_rows(source)
-    cores: list[Core] = []
-    for r in parsed:
-        # Compute r_mean from given path length, independent of OD/ID
-        if r.path_len_m > 0:
-            r_mean_m = r.path_len_m / (2 * pi)
-        else:
-            r_mean_m = (r.od_after_m + r.id_after_m) / 4
-
-        window_area_m2 = pi * (r.id_after_m / 2) ** 2 if r.id_after_m > 0 else 0.0
-
-        def make_core(mu_r: float, grade: str) -> Core:
-            return Core(
-                name=f"{r.part_no} HighFlux {grade}",
-                mu_r=mu_r,
-                area_m2=r.area_m2,
-                r_mean_m=r_mean_m,
-                window_area_m2=window_area_m2,
-                b_sat_t=None,
-                price_usd=0.0,
-                od_m=r.od_after_m or None,
-                id_m=r.id_after_m or None,
-                ht_m=r.ht_after_m or None,
-            )
-
-        if r.al_26_nH is not None:
-            cores.append(make_core(_mu_r_from_al(r.al_26_nH, r.area_m2, r.path_len_m), "26u"))
-        if r.al_60_nH is not None:
-            cores.append(make_core(_mu_r_from_al(r.al_60_nH, r.area_m2, r.path_len_m), "60u"))
-        if r.al_125_nH is not None:
-            cores.append(make_core(_mu_r_from_al(r.al_125_nH, r.area_m2, r.path_len_m), "125u"))
-
-    return cores
+    return cores_from_rows(_parse_csv_rows(source))
+
+
+def cores_from_rows(parsed: Iterable[ParsedRow]) -> list[Core]:
+    # One Core per available AL grade of each parsed row
+    values = [
+        (
+            r.part_no, r.al_26_nH, r.al_60_nH, r.al_125_nH, r.path_len_m, r.area_m2,
+            r.od_after_m, r.id_after_m, r.ht_after_m, r.od_before_m, r.id_before_m, r.ht_before_m,
+        )
+        for r in parsed
+    ]
+    return list(_table_from_values(values).cores) if values else []
+
+
+GRADES = ("26u", "60u", "125u")
+
+
+def core_table_from_columns(
+    part_no: np.ndarray,
+    al_nH: np.ndarray,
+    path_m: np.ndarray,
+    area_m2: np.ndarray,
+    od_m: np.ndarray,
+    id_m: np.ndarray,
+    ht_m: np.ndarray,
+    od_before_m: np.ndarray | None = None,
+    id_before_m: np.ndarray | None = None,
+    ht_before_m: np.ndarray | None = None,
+) -> CoreTable:
+    """CoreTable for parsed catalog columns without building a Core per row.
+
+    al_nH has shape (parts, 3) for the 26u/60u/125u grades, NaN where a grade is missing;
+    the before-finish dimensions default to zeros (none).
+    Rows come out in cores_from_rows order with bit-identical values; Core objects are
+    only created when a row is materialized (engine.CoreRecords).
+    """
+    present = ~np.isnan(al_nH)
+    row = np.repeat(np.arange(part_no.shape[0]), present.sum(axis=1))
+    grade = np.nonzero(present)[1]
+    al = al_nH[present]
+    path, area, od, id_, ht = path_m[row], area_m2[row], od_m[row], id_m[row], ht_m[row]
+    n = row.shape[0]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mu_r = np.where((area > 0) & (path > 0), np.maximum(1.0, (al * 1e-9 * path) / (MU0 * area)), 1.0)
+        r_mean = np.where(path > 0, path / (2 * pi), (od + id_) / 4)
+    # x ** 2 through Python float pow, as Core/CoreTable compute it (np.square can differ by an ulp)
+    hole = np.array([pi * (v / 2) ** 2 for v in id_.tolist()], dtype=float)
+    window = np.where(id_ > 0, hole, 0.0)
+
+    # Core.__post_init__ for rows with explicit OD/ID/HT; log() through math for the
+    # same reason
+    explicit = (od != 0) & (id_ != 0) & (ht != 0)
+    le = 2 * pi * r_mean
+    pdf = explicit & (od > id_) & (id_ > 0)
+    ratio = (od[pdf] / id_[pdf]).tolist()
+    le[pdf] = pi * (od[pdf] - id_[pdf]) / np.array([log(v) for v in ratio], dtype=float)
+
+    names = np.char.add(np.char.add(part_no[row].astype(str), " HighFlux "), np.array(GRADES)[grade])
+    records = CoreRecords({
+        "name": names, "mu_r": mu_r, "area_m2": area, "r_mean_m": r_mean, "window_area_m2": window,
+        "b_sat_t": np.full(n, np.nan), "price_usd": np.zeros(n),
+        "od_m": od, "id_m": id_, "ht_m": ht,
+        **{
+            name: np.zeros(n) if col is None else np.asarray(col, dtype=float)[row]
+            for name, col in (("od_before_m", od_before_m), ("id_before_m", id_before_m), ("ht_before_m", ht_before_m))
+        },
+    })
+    columns = {
+        "mu_r": mu_r, "area_m2": area, "path_length_m": le, "al_h": np.zeros(n),
+        "od_m": np.where(explicit, od, 0.0), "id_m": np.where(explicit, id_, 0.0), "ht_m": np.where(explicit, ht, 0.0),
+        "has_dims": explicit.copy(),
+        "window_area_m2": np.where(id_ != 0, hole, window),
+        "b_sat_t": np.full(n, np.nan), "price_usd": np.zeros(n),
+    }
+    positive = le > 0
+    columns["al_h"][positive] = MU0 * mu_r[positive] * area[positive] / le[positive]
+
+    # Rows without full dimensions derive them from the other fields; rare, so resolve
+    # those through Core itself
+    for i in np.flatnonzero(~explicit).tolist():
+        core = records[i]
+        columns["path_length_m"][i], columns["al_h"][i] = core.path_length_m, core.al_h
+        columns["od_m"][i], columns["id_m"][i], columns["ht_m"][i] = core.winding_dims
+        columns["has_dims"][i] = core.has_dims
+    return CoreTable._from_columns(records, columns)
+
+
+def _table_from_values(chunk: list[tuple[Any, ...]]) -> CoreTable:
+    part_no, al26, al60, al125, *dims = zip(*chunk)
+    return core_table_from_columns(
+        np.array(part_no), np.array([al26, al60, al125], dtype=float).T, *(np.array(col, dtype=float) for col in dims),
+    )
+
+
+def iter_core_tables(
+    source: Union[str, Path, TextIO, bytes, bytearray],
+    chunk_rows: int = 8192,
+) -> Iterator[CoreTable]:
+    """Stream a vendor CSV as CoreTable chunks of up to chunk_rows parts (x grades).
+
+    Only one chunk of raw field tuples is alive at a time; no ParsedRow or Core objects
+    are created.
+    """
+    chunk: list[tuple[Any, ...]] = []
+    for values in _iter_catalog_values(source):
+        chunk.append(values)
+        if len(chunk) >= chunk_rows:
+            yield _table_from_values(chunk)
+            chunk = []
+    if chunk:
+        yield _table_from_values(chunk)
+
+
+def core_table_from_csv(source: Union[str, Path, TextIO, bytes, bytearray], chunk_rows: int = 8192) -> CoreTable:
+    tables = list(iter_core_tables(source, chunk_rows))
+    return CoreTable.concat(tables) if tables else CoreTable([])
+
+
+def core_table_from_files(paths: Iterable[Union[str, Path]], workers: int | None = None) -> CoreTable:
+    """Merged catalog of several vendor CSVs, in the given file order.
+
+    workers > 1 parses the files on a process pool; platforms where processes cannot be
+    started fall back to parsing them serially.
+    """
+    paths = [str(p) for p in paths]
+    tables = None
+    if workers is not None and workers > 1 and len(paths) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+                tables = list(pool.map(core_table_from_csv, paths))
+        except (OSError, NotImplementedError, PermissionError, BrokenProcessPool):
+            tables = None  # serial fallback
+    if tables is None:
+        tables = [core_table_from_csv(p) for p in paths]
+    return CoreTable.concat(tables) if tables else CoreTable([])
 
 
 def summarize_csv(source: Union[str, Path, TextIO, bytes, bytearray]) -> str:
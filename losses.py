@@ -0,0 +1,164 @@
+# losses.py
+# AC winding resistance (Dowell) and Steinmetz core loss over frequency x ripple grids
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import pi, sqrt
+
+import numpy as np
+
+from dc_bias import grade_index
+from models import MU0
+
+COPPER_RESISTIVITY_OHM_M = 1.724e-8  # annealed copper, 20 °C
+
+
+@dataclass(frozen=True)
+class Steinmetz:
+    """Vendor-style core-loss fit Pv = k f^alpha B^beta: Pv in mW/cm³, f in kHz, B (peak AC) in T."""
+    k: float
+    alpha: float
+    beta: float
+
+
+# Approximations of the published High Flux loss curves; replace with the vendor's
+# coefficients where available
+CORE_LOSS = {
+    26.0: Steinmetz(110.0, 1.40, 2.15),
+    60.0: Steinmetz(85.0, 1.42, 2.12),
+    125.0: Steinmetz(70.0, 1.44, 2.10),
+}
+
+
+@dataclass
+class LossInputs:
+    """Per-candidate columns the loss model needs, shape (n,) each (engine.loss_inputs builds them)."""
+    turns: np.ndarray
+    L_h: np.ndarray                   # at the working point, so DC-bias roll-off carries into B
+    mu_r: np.ndarray                  # picks the Steinmetz curve of the nearest grade
+    area_m2: np.ndarray
+    path_length_m: np.ndarray
+    bare_d_m: np.ndarray
+    pitch_m: np.ndarray
+    layers: np.ndarray
+    dc_resistance_ohm: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.turns.shape[0])
+
+
+@dataclass
+class LossSweep:
+    """Losses of every candidate at every (frequency, ripple) point, arrays of shape (n, F, R)."""
+    frequencies_hz: np.ndarray        # (F,)
+    ripples_a: np.ndarray             # (R,) peak-to-peak ripple current
+    dc_current_a: float
+    b_peak_t: np.ndarray              # (n, 1, R) AC flux amplitude
+    ac_factor: np.ndarray             # (n, F, 1) Rac / Rdc
+    core_w: np.ndarray
+    copper_w: np.ndarray
+
+    @property
+    def total_w(self) -> np.ndarray:
+        return self.core_w + self.copper_w
+
+
+def skin_depth_m(frequency_hz: np.ndarray, resistivity_ohm_m: float = COPPER_RESISTIVITY_OHM_M) -> np.ndarray:
+    # δ = sqrt(ρ / (π f µ0))
+    return np.sqrt(resistivity_ohm_m / (pi * np.asarray(frequency_hz, dtype=float) * MU0))
+
+
+def dowell_factor(
+    bare_d_m: np.ndarray,
+    pitch_m: np.ndarray,
+    layers: np.ndarray,
+    frequency_hz: np.ndarray,
+    resistivity_ohm_m: float = COPPER_RESISTIVITY_OHM_M,
+) -> np.ndarray:
+    """Rac / Rdc of an m-layer winding of round wire (Dowell), broadcast over all arguments.
+
+    The wire is the equivalent square conductor of side h = sqrt(π)/2 d, thinned by the
+    porosity η = d / pitch, so Δ = h sqrt(η) / δ and
+    Fr = Δ [(sinh 2Δ + sin 2Δ)/(cosh 2Δ - cos 2Δ) + 2(m² - 1)/3 (sinh Δ - sin Δ)/(cosh Δ + cos Δ)].
+    The ratios are evaluated with e^-Δ factored out so large Δ does not overflow, and the
+    2Δ terms come from the Δ ones, one exp/sin/cos per element.
+    """
+    d = np.asarray(bare_d_m, dtype=float)
+    m = np.maximum(np.asarray(layers, dtype=float), 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = sqrt(pi) / 2 * d * np.sqrt(d / pitch_m) / skin_depth_m(frequency_hz, resistivity_ohm_m)
+        e1, sin, cos = np.exp(-x), np.sin(x), np.cos(x)
+        e2 = e1 * e1
+        skin = (0.5 * (1 - e2 * e2) + 2 * sin * cos * e2) / (0.5 * (1 + e2 * e2) - (1 - 2 * sin * sin) * e2)
+        proximity = (0.5 * (1 - e2) - sin * e1) / (0.5 * (1 + e2) + cos * e1)
+        fr = x * (skin + 2 * (m * m - 1) / 3 * proximity)
+    return np.where(x > 0, np.maximum(fr, 1.0), 1.0)  # DC (and rounding at tiny Δ) is Rdc
+
+
+def core_loss_density_w_m3(
+    mu_r: np.ndarray,
+    frequencies_hz: np.ndarray,
+    b_peak_t: np.ndarray,
+    curves: dict[float, Steinmetz] = CORE_LOSS,
+) -> np.ndarray:
+    """Steinmetz loss per volume (W/m³), shape (n, F, R), for mu_r (n,), frequencies (F,) and B (n, R).
+
+    Each core uses the curve of its nearest grade. k f^alpha is built once per grade and
+    B^beta once per (core, ripple); the grid is their product.
+    """
+    idx = grade_index(mu_r, tuple(curves))
+    k, alpha, beta = (np.array([getattr(fit, name) for fit in curves.values()]) for name in ("k", "alpha", "beta"))
+    f_khz = np.asarray(frequencies_hz, dtype=float) / 1e3
+    k_f = 1e3 * k[:, None] * f_khz[None, :] ** alpha[:, None]  # 1 mW/cm³ = 1e3 W/m³
+    return k_f[idx][:, :, None] * (np.asarray(b_peak_t, dtype=float) ** beta[idx][:, None])[:, None, :]
+
+
+def sweep_losses(
+    p: LossInputs,
+    frequencies_hz: np.ndarray | float,
+    ripples_a: np.ndarray | float,
+    dc_current_a: float | None = None,
+    curves: dict[float, Steinmetz] = CORE_LOSS,
+) -> LossSweep:
+    """Core and copper loss of every candidate over the frequency x ripple grid in one broadcast.
+
+    The ripple is a triangular peak-to-peak current on top of dc_current_a. Its flux
+    amplitude is flux_density_t at ΔI/2 with the candidate's effective permeability,
+    i.e. B = L ΔI / (2 N Ae), and the core loss is Steinmetz at that B times Ae le. Copper
+    loss is Rdc Idc² + Fr(f) Rdc (ΔI / (2 sqrt 3))², with Dowell's Fr from the layer count
+    applied to the whole ripple RMS as if it sat at the switching frequency.
+    """
+    f = np.atleast_1d(np.asarray(frequencies_hz, dtype=float))
+    ripple = np.atleast_1d(np.asarray(ripples_a, dtype=float))
+    idc = 0.0 if dc_current_a is None else float(dc_current_a)
+
+    # Fr depends on the wire and layer count only: one Dowell row per distinct winding
+    key = np.zeros(len(p), dtype=np.int64)
+    for column in (p.bare_d_m, p.pitch_m, p.layers):
+        values, code = np.unique(column, return_inverse=True)
+        key = key * values.size + code.ravel()
+    _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    ac_factor = dowell_factor(
+        p.bare_d_m[first, None], p.pitch_m[first, None], p.layers[first, None], f[None, :],
+    )[inverse.ravel()][:, :, None]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        b_peak = (p.L_h / (p.turns * p.area_m2))[:, None] * (ripple / 2)[None, :]
+    volume = (p.area_m2 * p.path_length_m)[:, None, None]
+    core_w = core_loss_density_w_m3(p.mu_r, f, b_peak, curves)
+    core_w *= volume
+    r_dc = p.dc_resistance_ohm[:, None, None]
+    copper_w = r_dc * (idc * idc) + (ac_factor * r_dc) * (ripple * ripple / 12)[None, None, :]
+    return LossSweep(f, ripple, idc, b_peak[:, None, :], ac_factor, core_w, copper_w)
+
+
+def total_loss_w(
+    p: LossInputs,
+    frequency_hz: float,
+    ripple_a: float,
+    dc_current_a: float | None = None,
+    curves: dict[float, Steinmetz] = CORE_LOSS,
+) -> np.ndarray:
+    """Core plus copper loss of every candidate at one operating point, shape (n,)."""
+    return sweep_losses(p, frequency_hz, ripple_a, dc_current_a, curves).total_w[:, 0, 0]
@@ -1,8 +1,22 @@
 # models.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from math import pi, floor, sqrt, log
 
-@dataclass
+MU0 = 4e-7 * 3.141592653589793  # H/m
+
+@dataclass(frozen=True, slots=True)
+class CoreGeometry:
+	"""Resolved geometry of one core as a value (Core.geometry); Core itself keeps only le and derived dims."""
+	path_length_m: float             # le
+	area_m2: float                   # Ae
+	al_h: float                      # inductance factor µ0 µr Ae / le [H/N^2]
+	# Winding dimensions (explicit, else derived from fields); zeros when unavailable
+	od_m: float
+	id_m: float
+	ht_m: float
+	has_dims: bool
+
+@dataclass(frozen=True, slots=True)
 class Core:
 	name: str
 	mu_r: float                      # relative permeability
@@ -18,8 +32,48 @@ class Core:
 	id_m: float | None = None
 	ht_m: float | None = None
 
+	# Before-finish (uncoated) dimensions; the tolerance analysis samples the coated size
+	# between these and the after-finish OD/ID/HT above
+	od_before_m: float | None = None
+	id_before_m: float | None = None
+	ht_before_m: float | None = None
+
+	# Resolved once in __post_init__, in the core's own slots: le (the log() of the PDF
+	# formula) and, only for cores without explicit OD/ID/HT, the derived (OD, ID, HT).
+	# Everything else is read straight off the fields, so a core holds one extra float.
+	path_length_m: float = field(init=False, repr=False, compare=False)
+	_derived_dims: tuple[float, float, float] | None = field(init=False, repr=False, compare=False)
+
+	def __post_init__(self) -> None:
+		derived = None
+		if self.id_m is None or self.od_m is None or self.ht_m is None:
+			derived = self._derive_dimensions_from_fields()
+		object.__setattr__(self, "_derived_dims", derived)
+		object.__setattr__(self, "path_length_m", self._path_length(derived))
+
+	@property
+	def al_h(self) -> float:
+		# Inductance factor µ0 µr Ae / le [H/N^2]
+		le = self.path_length_m
+		return MU0 * self.mu_r * self.area_m2 / le if le > 0 else 0.0
+
+	@property
+	def has_dims(self) -> bool:
+		return (self.id_m is not None and self.od_m is not None and self.ht_m is not None) or self._derived_dims is not None
+
+	@property
+	def winding_dims(self) -> tuple[float, float, float]:
+		"""Winding (OD, ID, HT): explicit, else derived from fields; zeros when unavailable."""
+		if self.id_m is not None and self.od_m is not None and self.ht_m is not None:
+			return self.od_m, self.id_m, self.ht_m
+		return self._derived_dims or (0.0, 0.0, 0.0)
+
 	@property
-	def path_length_m(self) -> float:
+	def geometry(self) -> CoreGeometry:
+		od_m, id_m, ht_m = self.winding_dims
+		return CoreGeometry(self.path_length_m, self.area_m2, self.al_h, od_m, id_m, ht_m, self.has_dims)
+
+	def _path_length(self, derived: tuple[float, float, float] | None) -> float:
 		# Prefer PDF formula when OD/ID are available:
 		# le = π (OD - ID) / ln(OD/ID)
 		if self.od_m is not None and self.id_m is not None and self.od_m > self.id_m > 0:
@@ -29,7 +83,8 @@ class Core:
 				# Fallback to mean-radius approximation when log argument invalid
 				return 2 * pi * self.r_mean_m
 		# Else, attempt to derive OD/ID/HT from available fields
-		derived = self._derive_dimensions_from_fields()
+		if derived is None:
+			derived = self._derive_dimensions_from_fields()
 		if derived is not None:
 			od_m, id_m, _ht_m = derived
 			try:
@@ -60,7 +115,7 @@ class Core:
 		except Exception:
 			return None
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Coil:
 	name: str
 	awg: int
@@ -71,22 +126,23 @@ class Coil:
 	base_price_usd: float = 0.0      # optional fixed cost per coil
 	enamel_thickness_m: float = 0.0  # single-side enamel thickness [m]
 
+	@property
+	def pitch_m(self) -> float:
+		# overall wire (pitch): d_eff = bare + 2*enamel
+		return self.wire_diameter_m + 2 * max(0.0, self.enamel_thickness_m)
+
 	def max_turns_on(self, core: Core) -> int:
 		# IWM-style layered capacity:
 		# - overall wire (pitch): d_eff = bare + 2*enamel
 		# - turns per layer (along height): TPL = floor(HT / d_eff)
 		# - max radial layers: Lmax = floor(((OD - ID)/2) / d_eff)
 		# - capacity = Lmax * TPL
-		d_eff = self.wire_diameter_m + 2 * max(0.0, self.enamel_thickness_m)
-
-		# Get core dims (prefer explicit; else derive)
-		if core.id_m is not None and core.od_m is not None and core.ht_m is not None:
-			ID, OD, HT = core.id_m, core.od_m, core.ht_m
-		else:
-			derived = core._derive_dimensions_from_fields()
-			if derived is None:
-				return 0
-			OD, ID, HT = derived
+		d_eff = self.pitch_m
+
+		# Core dims are resolved once on the core (explicit, else derived)
+		if not core.has_dims:
+			return 0
+		OD, ID, HT = core.winding_dims
 
 		if d_eff <= 0 or ID <= 0 or OD <= ID or HT <= 0:
 			return 0
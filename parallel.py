@@ -0,0 +1,149 @@
+# parallel.py
+# Process-pool sharded search over large core catalogs
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable
+
+import numpy as np
+
+from models import Core, Coil
+from scorer import ScoreWeights
+from engine import (
+    Candidates, CoilTable, CoreTable,
+    as_coil_table, as_core_table, concat_candidates, evaluate, evaluate_top_k,
+)
+
+# Catalog held by each worker process; set once by _init_worker
+_WORKER_CORES: CoreTable | None = None
+_WORKER_COILS: CoilTable | None = None
+
+
+def _init_worker(cores: CoreTable, coils: CoilTable) -> None:
+    global _WORKER_CORES, _WORKER_COILS
+    _WORKER_CORES, _WORKER_COILS = cores, coils
+
+
+def _search_shard(
+    cores: CoreTable,
+    coils: CoilTable,
+    start: int,
+    stop: int,
+    query: dict,
+    rows: np.ndarray | None = None,
+) -> Candidates:
+    # Top-k of one contiguous core range (or of the given catalog rows inside it), with
+    # core_idx mapped back to the full catalog
+    if rows is None:
+        rows = np.arange(start, stop)
+    shard = cores.subset(rows)
+    k = query["k"]
+    if query["top_k"]:
+        best = evaluate_top_k(
+            query["L_target_h"], shard, coils, k, query["tolerance"], query["weights"],
+            query["working_current_a"], query["max_turns_per_core"], dc_bias=query["dc_bias"],
+        )
+    else:
+        cand = evaluate(
+            query["L_target_h"], shard, coils, query["tolerance"], query["weights"],
+            query["working_current_a"], query["max_turns_per_core"], dc_bias=query["dc_bias"],
+        )
+        best = cand.take(cand.top_rows(k))
+    best.core_idx = rows[best.core_idx]
+    return best
+
+
+def _worker_search(start: int, stop: int, query: dict, rows: np.ndarray | None = None) -> Candidates:
+    return _search_shard(_WORKER_CORES, _WORKER_COILS, start, stop, query, rows)
+
+
+class ShardedSearch:
+    """Catalog split into contiguous core shards and searched on a ProcessPoolExecutor.
+
+    The tables reach each worker once through the pool initializer; tasks carry only a
+    shard range (with its share of the query's rows, if any) and the query. Shard top-k lists are merged with the engine's total
+    ranking order (score, cost, rel_error, then catalog position), so the result does not
+    depend on the worker or shard count. workers <= 1, or a platform where processes
+    cannot be started, runs the same shards serially in-process.
+    """
+
+    def __init__(
+        self,
+        cores: Iterable[Core] | CoreTable,
+        coils: Iterable[Coil] | CoilTable,
+        workers: int | None = None,
+        shard_size: int | None = None,
+    ):
+        self.cores = as_core_table(cores)
+        self.coils = as_coil_table(coils)
+        self.workers = max(1, workers or 1)
+        n = len(self.cores)
+        size = shard_size or max(1, -(-n // (self.workers * 4)))
+        self.shards = [(s, min(n, s + size)) for s in range(0, n, size)]
+        self._pool: ProcessPoolExecutor | None = None
+        if self.workers > 1 and len(self.shards) > 1:
+            try:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker, initargs=(self.cores, self.coils),
+                )
+            except (OSError, NotImplementedError, PermissionError):
+                self._pool = None  # serial fallback
+
+    def search(
+        self,
+        L_target_h: float,
+        k: int,
+        tolerance: float = 0.1,
+        weights: ScoreWeights = ScoreWeights(),
+        working_current_a: float | None = None,
+        max_turns_per_core: int | None = None,
+        top_k: bool = True,
+        dc_bias: bool = False,
+        rows: np.ndarray | None = None,
+    ) -> Candidates:
+        """Global top-k candidates (ranked) with core_idx into self.cores.
+
+        rows (ascending catalog rows, e.g. a core_index.CoreIndex query) restricts the
+        search to those cores; each shard then gets the rows inside its range, so one
+        pool serves queries over different slices of the catalog.
+        """
+        query = dict(
+            L_target_h=L_target_h, k=k, tolerance=tolerance, weights=weights,
+            working_current_a=working_current_a, max_turns_per_core=max_turns_per_core, top_k=top_k,
+            dc_bias=dc_bias,
+        )
+        if rows is None:
+            tasks = [(s, e, None) for s, e in self.shards]
+        else:
+            cuts = np.searchsorted(rows, [s for s, _ in self.shards] + [len(self.cores)])
+            tasks = [(s, e, rows[a:b]) for (s, e), a, b in zip(self.shards, cuts[:-1], cuts[1:]) if b > a]
+        parts = None
+        if self._pool is not None:
+            try:
+                futures = [self._pool.submit(_worker_search, s, e, query, r) for s, e, r in tasks]
+                parts = [f.result() for f in futures]
+            except (OSError, BrokenProcessPool):
+                self.close()  # workers could not start here; continue serially
+        if parts is None:
+            parts = [_search_shard(self.cores, self.coils, s, e, query, r) for s, e, r in tasks]
+        if not parts:
+            empty = self.cores if rows is None else self.cores.subset(rows)
+            return evaluate(
+                L_target_h, empty, self.coils, tolerance, weights, working_current_a, max_turns_per_core,
+                dc_bias=dc_bias,
+            )
+        merged = concat_candidates(parts)
+        return merged.take(merged.top_rows(k))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> ShardedSearch:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
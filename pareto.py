@@ -0,0 +1,67 @@
+# pareto.py
+# Non-dominated (skyline) filtering of candidate sets over several objectives
+
+from __future__ import annotations
+
+import numpy as np
+
+from engine import Candidates
+from scorer import _fill_penalty_array
+
+
+def objectives(cand: Candidates, fill_min: float, fill_max: float) -> np.ndarray:
+    """(n, 4) matrix of the score_combo terms before weighting: rel_error, cost, resistance, fill deviation."""
+    return np.column_stack([
+        cand.rel_error, cand.cost_usd, cand.resistance_ohm,
+        _fill_penalty_array(cand.fill_ratio, fill_min, fill_max),
+    ])
+
+
+def _dominated(by: np.ndarray, pts: np.ndarray) -> np.ndarray:
+    # pts[j] is dominated if some row of `by` is <= in every column and < in one
+    if by.shape[0] == 0 or pts.shape[0] == 0:
+        return np.zeros(pts.shape[0], dtype=bool)
+    le = np.ones((by.shape[0], pts.shape[0]), dtype=bool)
+    eq = np.ones_like(le)
+    for k in range(pts.shape[1]):
+        a, b = by[:, k, None], pts[None, :, k]
+        le &= a <= b
+        eq &= a == b
+    return (le & ~eq).any(axis=0)
+
+
+def skyline(points: np.ndarray, block: int = 512) -> np.ndarray:
+    """Ascending row indices of the non-dominated rows of `points` (every column minimized).
+
+    Sort-filter-skyline: rows are visited in lexicographic order, so a row can only be
+    dominated by rows already seen (domination implies a smaller lexicographic key).
+    Each block is checked against the skyline found so far and then against itself,
+    which keeps the work near O(n * skyline size) instead of O(n^2).
+    Equal rows do not dominate each other and are all kept.
+    """
+    n = points.shape[0]
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    order = np.lexsort(points.T[::-1])
+    sorted_pts = points[order]
+    sky = np.empty((0, points.shape[1]))
+    keep_rows: list[np.ndarray] = []
+    for start in range(0, n, block):
+        pts = sorted_pts[start:start + block]
+        rows = np.arange(start, start + pts.shape[0])
+        live = ~_dominated(sky, pts)
+        pts, rows = pts[live], rows[live]
+        live = ~_dominated(pts, pts)
+        pts, rows = pts[live], rows[live]
+        sky = np.concatenate([sky, pts])
+        keep_rows.append(rows)
+    return np.sort(order[np.concatenate(keep_rows)])
+
+
+def pareto_rows(cand: Candidates, fill_min: float = 0.75, fill_max: float = 0.85) -> np.ndarray:
+    """Rows of `cand` on the (rel_error, cost_usd, resistance_ohm, fill deviation) frontier.
+
+    For any non-negative ScoreWeights with the same fill band, the best score_combo
+    candidate lies on this frontier, so re-weighting never needs a new search.
+    """
+    return skyline(objectives(cand, fill_min, fill_max))
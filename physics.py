@@ -1,8 +1,7 @@
 # physics.py
-from math import sqrt
-from models import Core
+from math import sqrt, ceil, floor
+from models import Core, MU0
 
-MU0 = 4e-7 * 3.141592653589793  # H/m
 
 def toroid_inductance_h(core: Core, turns: int) -> float:
     # L = mu0 * mu_r * N^2 * A / l
@@ -12,6 +11,33 @@ def turns_for_target(core: Core, L_target_h: float) -> float:
     # N = sqrt(L * l / (mu0 * mu_r * A))
     return sqrt(L_target_h * core.path_length_m / (MU0 * core.mu_r * core.area_m2))
 
+def turns_in_tolerance(core: Core, L_target_h: float, tolerance: float, max_turns: int | None = None) -> range:
+    # L = AL * N^2, so the turns with |L - L_target| <= tol * L_target form one closed interval:
+    # sqrt(L_target (1 - tol) / AL) <= N <= sqrt(L_target (1 + tol) / AL)
+    al = MU0 * core.mu_r * core.area_m2 / core.path_length_m
+    lo = max(1, ceil(sqrt(max(0.0, L_target_h * (1 - tolerance)) / al)))
+    hi = floor(sqrt(L_target_h * (1 + tolerance) / al))
+
+    def within(n: int) -> bool:
+        return abs(toroid_inductance_h(core, n) - L_target_h) / L_target_h <= tolerance
+
+    # Snap the float bounds onto the exact integer edges of the tolerance test
+    if lo > 1 and within(lo - 1):
+        lo -= 1
+    elif not within(lo):
+        lo += 1
+    if within(hi + 1):
+        hi += 1
+    elif hi >= lo and not within(hi):
+        hi -= 1
+
+    # Optional cap: keep the max_turns consecutive counts closest to N_req
+    if max_turns is not None and hi - lo + 1 > max_turns:
+        start = round(turns_for_target(core, L_target_h) - (max_turns - 1) / 2)
+        lo = min(max(start, lo), hi - max_turns + 1)
+        hi = lo + max_turns - 1
+    return range(lo, hi + 1)
+
 def mean_turn_length_m(core: Core) -> float:
     # Conductor length per turn around mean radius (circumference at r_mean)
     return core.path_length_m
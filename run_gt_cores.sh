@@ -10,6 +10,8 @@ Usage:
   $0 part <csv_path> <PART_NO>
   $0 combos <csv_path> <L_uH> [tolerance_percent=10] [I_amp]
 
+<csv_path> may also be the vendor .xlsx workbook.
+
 Examples:
   $0 summary "TalkFile_창성코어(High Flux GT Cores).xlsx - Hight Flux GT Cores.csv"
   $0 part    "TalkFile_창성코어(High Flux GT Cores).xlsx - Hight Flux GT Cores.csv" CH540GT
@@ -49,10 +51,10 @@ import sys
 from pathlib import Path
 repo = Path(__file__).resolve().parent
 sys.path.insert(0, str(repo))
-from import_csv import _parse_csv_rows
+from catalog_snapshot import load_rows
 
 csv_path, part_no = sys.argv[1], sys.argv[2]
-rows = _parse_csv_rows(csv_path)
+rows = load_rows(csv_path)
 for r in rows:
     if r.part_no == part_no:
         print(r)
@@ -75,7 +77,7 @@ import sys
 from pathlib import Path
 repo = Path(__file__).resolve().parent
 sys.path.insert(0, str(repo))
-from import_csv import cores_from_high_flux_csv
+from catalog_snapshot import load_cores
 from data import COILS
 from search import find_combinations
 
@@ -85,7 +87,7 @@ tol = float(sys.argv[3]) / 100.0
 I_amp = sys.argv[4]
 I = float(I_amp) if I_amp else None
 
-cores = cores_from_high_flux_csv(csv_path)
+cores = load_cores(csv_path)
 opts = find_combinations(L_target_h=L_uH*1e-6, cores=cores, coils=COILS, tolerance=tol, working_current_a=I)
 for i, d in enumerate(opts, 1):
     print(f"{i:2d}. Core={d.core.name} | Coil={d.coil.name} | N={d.turns}")
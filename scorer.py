@@ -1,6 +1,8 @@
 # scorer.py
 from dataclasses import dataclass
 
+import numpy as np
+
 @dataclass
 class ScoreWeights:
     w_error: float = 1.0
@@ -10,6 +12,11 @@ class ScoreWeights:
     w_fill: float = 0.5
     fill_min: float = 0.75
     fill_max: float = 0.85
+    # Weight of total loss (W, losses.total_loss_w) at the working current plus a
+    # triangular ripple of loss_ripple_a peak-to-peak at loss_frequency_hz; 0 leaves it out
+    w_loss: float = 0.0
+    loss_frequency_hz: float = 100e3
+    loss_ripple_a: float = 0.0
 
 def _fill_penalty(fill_ratio: float | None, fill_min: float, fill_max: float) -> float:
     if fill_ratio is None:
@@ -28,8 +35,32 @@ def score_combo(
     w: ScoreWeights,
     *,
     fill_ratio: float | None = None,
+    loss_w: float | None = None,
 ) -> float:
     # Lower is better
     base = w.w_error * rel_error + w.w_cost * total_cost_usd + w.w_resistance * resistance_ohm
     fill_pen = _fill_penalty(fill_ratio, w.fill_min, w.fill_max)
-    return base + w.w_fill * fill_pen
\ No newline at end of file
+    score = base + w.w_fill * fill_pen
+    return score if loss_w is None else score + w.w_loss * loss_w
+
+def _fill_penalty_array(fill_ratio: np.ndarray, fill_min: float, fill_max: float) -> np.ndarray:
+    # Elementwise twin of _fill_penalty (same clamping and branch order)
+    fr = np.maximum(0.0, np.minimum(1.0, fill_ratio))
+    return np.where(fr < fill_min, fill_min - fr, np.where(fr > fill_max, fr - fill_max, 0.0))
+
+def score_combo_array(
+    rel_error: np.ndarray,
+    total_cost_usd: np.ndarray,
+    resistance_ohm: np.ndarray,
+    w: ScoreWeights,
+    *,
+    fill_ratio: np.ndarray | None = None,
+    loss_w: np.ndarray | None = None,
+) -> np.ndarray:
+    # Vectorized score_combo; evaluates the terms in the same order so results match bit for bit
+    base = w.w_error * rel_error + w.w_cost * total_cost_usd + w.w_resistance * resistance_ohm
+    if fill_ratio is None:
+        score = base + w.w_fill * 0.0
+    else:
+        score = base + w.w_fill * _fill_penalty_array(fill_ratio, w.fill_min, w.fill_max)
+    return score if loss_w is None else score + w.w_loss * loss_w
@@ -1,10 +1,28 @@
 # search.py
-from dataclasses import dataclass
-from math import ceil, pi, floor
-from typing import Iterable
+import csv
+import heapq
+from dataclasses import dataclass, field, fields, replace
+from itertools import count
+from math import pi, floor
+from time import perf_counter
+from typing import Iterable, Iterator, TextIO
+import numpy as np
 from models import Core, Coil
-from physics import toroid_inductance_h, turns_for_target, mean_turn_length_m, flux_density_t
-from scorer import score_combo, ScoreWeights
+from physics import toroid_inductance_h, turns_in_tolerance, mean_turn_length_m, flux_density_t
+from scorer import score_combo, score_combo_array, ScoreWeights
+from pareto import pareto_rows
+from core_index import CoreIndex
+from parallel import ShardedSearch
+from engine import (
+    CoreTable, CoilTable, Candidates, SearchStats,
+    as_core_table, as_coil_table, capacity_grid, evaluate, evaluate_smallest_id, evaluate_thickest, evaluate_top_k,
+    iter_candidate_chunks, loss_inputs,
+)
+from losses import LossInputs, LossSweep, sweep_losses, total_loss_w
+from wire_catalog import WireCatalog
+
+# A CoreIndex slice keeping more than this share of the catalog is searched as the full table
+INDEX_FULL_SCAN_FRACTION = 0.9
 
 @dataclass
 class DesignOption:
@@ -22,7 +40,352 @@ class DesignOption:
     leftover_window_area_m2: float
     fill_ratio: float
 
+@dataclass
+class BomTarget:
+    """One inductor of a bill of materials for find_combinations_batch."""
+    L_target_h: float
+    tolerance: float = 0.1
+    working_current_a: float | None = None
+    name: str = ""
+
+@dataclass
+class CandidateSet:
+    """Every feasible candidate of one query as compact records (engine.Candidates) plus
+    the tables they index into. DesignOption objects are built only on request."""
+    candidates: Candidates
+    cores: CoreTable
+    coils: CoilTable
+    weights: ScoreWeights = field(default_factory=ScoreWeights)  # weights behind the score column
+    working_current_a: float | None = None                        # DC current of the loss term
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def options(self, rows: Iterable[int]) -> list[DesignOption]:
+        return materialize(self.candidates, rows, self.cores, self.coils)
+
+    def top(self, k: int) -> list[DesignOption]:
+        return self.options(self.candidates.top_rows(k))
+
+    def pareto(self, fill_min: float = 0.75, fill_max: float = 0.85) -> "CandidateSet":
+        # Non-dominated subset over (rel_error, cost_usd, resistance_ohm, fill deviation)
+        rows = pareto_rows(self.candidates, fill_min, fill_max)
+        return replace(self, candidates=self.candidates.take(rows))
+
+    def rescore(self, weights: ScoreWeights) -> "CandidateSet":
+        # Re-rank for new weights / fill band from the stored raw metrics: no enumeration,
+        # capacity or wire-length work. score_combo_array matches score_combo bit for bit,
+        # including the _fill_penalty clamping. A loss term is recomputed from the tables.
+        c = self.candidates
+        loss = None
+        if weights.w_loss != 0:
+            loss = total_loss_w(self._loss_inputs(), weights.loss_frequency_hz, weights.loss_ripple_a, self.working_current_a)
+        score = score_combo_array(c.rel_error, c.cost_usd, c.resistance_ohm, weights, fill_ratio=c.fill_ratio, loss_w=loss)
+        return replace(self, candidates=replace(c, score=score), weights=weights)
+
+    def best_for(self, weights: ScoreWeights, k: int) -> list[DesignOption]:
+        return self.rescore(weights).top(k)
+
+    def losses(self, frequencies_hz: np.ndarray | float, ripples_a: np.ndarray | float) -> LossSweep:
+        # Core/copper loss of every candidate over the frequency x ripple grid, at the query's working current
+        return sweep_losses(self._loss_inputs(), frequencies_hz, ripples_a, self.working_current_a)
+
+    def _loss_inputs(self) -> LossInputs:
+        c = self.candidates
+        return loss_inputs(self.cores, self.coils, c.core_idx, c.coil_idx, c.turns, c.L_h, c.resistance_ohm)
+
+def search_candidates(
+    L_target_h: float,
+    cores: Iterable[Core] | CoreTable,
+    coils: Iterable[Coil] | CoilTable,
+    tolerance: float = 0.1,
+    weights: ScoreWeights = ScoreWeights(),
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+    stats: SearchStats | None = None,
+    dc_bias: bool = False,
+) -> CandidateSet:
+    # Full candidate set without materializing it; find_combinations == search_candidates(...).top(k)
+    core_table = as_core_table(cores)
+    coil_table = as_coil_table(coils)
+    cand = evaluate(
+        L_target_h, core_table, coil_table, tolerance, weights, working_current_a, max_turns_per_core,
+        stats=stats, dc_bias=dc_bias,
+    )
+    return CandidateSet(cand, core_table, coil_table, weights, working_current_a)
+
+def find_pareto_front(
+    L_target_h: float,
+    cores: Iterable[Core] | CoreTable,
+    coils: Iterable[Coil] | CoilTable,
+    tolerance: float = 0.1,
+    fill_min: float = 0.75,
+    fill_max: float = 0.85,
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+) -> CandidateSet:
+    # Frontier of the raw score terms; any ScoreWeights with this fill band (and w_loss = 0)
+    # can then be applied with CandidateSet.best_for and lands on the same best option as find_combinations
+    weights = ScoreWeights(fill_min=fill_min, fill_max=fill_max)
+    return search_candidates(
+        L_target_h, cores, coils, tolerance, weights, working_current_a, max_turns_per_core,
+    ).pareto(fill_min, fill_max)
+
 def find_combinations(
+    L_target_h: float,
+    cores: Iterable[Core] | CoreTable | CoreIndex,
+    coils: Iterable[Coil] | CoilTable,
+    tolerance: float = 0.1,             # ±10%
+    max_results: int = 20,
+    weights: ScoreWeights = ScoreWeights(),
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+    top_k: bool = False,
+    stats: SearchStats | None = None,
+    workers: int | None = None,
+    dc_bias: bool = False,
+) -> list[DesignOption]:
+    # Vectorized engine; pass prebuilt CoreTable/CoilTable to skip table construction per query.
+    # top_k=True switches to branch-and-bound: same results, cores that cannot reach the
+    # max_results best are skipped.
+    # stats (engine.SearchStats) collects rejection counts and per-stage wall times; it is
+    # not filled by the process-pool path (workers > 1).
+    # A CoreIndex narrows the catalog to the AL/capacity slice that can reach the target.
+    # workers > 1 shards the cores over a process pool (see parallel.ShardedSearch).
+    # dc_bias=True solves N with the grade's permeability roll-off at working_current_a
+    # (dc_bias.ROLL_OFF), so L, rel_error and the saturation check hold under that current.
+    coil_table = as_coil_table(coils)
+    core_source = cores if isinstance(cores, CoreIndex) else as_core_table(cores)
+    return _search(
+        L_target_h, core_source, coil_table, None, tolerance, max_results, weights,
+        working_current_a, max_turns_per_core, top_k, stats, workers, dc_bias,
+    )
+
+def find_combinations_batch(
+    targets: Iterable[BomTarget],
+    cores: Iterable[Core] | CoreTable | CoreIndex,
+    coils: Iterable[Coil] | CoilTable,
+    max_results: int = 20,
+    weights: ScoreWeights = ScoreWeights(),
+    max_turns_per_core: int | None = None,
+    top_k: bool = False,
+    stats: SearchStats | None = None,
+    workers: int | None = None,
+    dc_bias: bool = False,
+) -> list[list[DesignOption]]:
+    # One result list per target, in target order. The core/coil tables and the
+    # (core, coil) capacity grid are built once and shared by every target.
+    coil_table = as_coil_table(coils)
+    core_source = cores if isinstance(cores, CoreIndex) else as_core_table(cores)
+    full_table = core_source.table if isinstance(core_source, CoreIndex) else core_source
+    if workers is not None and workers > 1:
+        # One pool for the whole BOM: the catalog reaches each worker once; with an
+        # index every target sends only its slice of rows
+        with ShardedSearch(full_table, coil_table, workers) as sharded:
+            return [
+                materialize(best, range(len(best)), full_table, coil_table)
+                for best in (
+                    sharded.search(
+                        t.L_target_h, max_results, t.tolerance, weights,
+                        t.working_current_a, max_turns_per_core, top_k, dc_bias,
+                        _index_rows(core_source, t.L_target_h, t.tolerance, coil_table, t.working_current_a, dc_bias),
+                    )
+                    for t in targets
+                )
+            ]
+    cap_grid = capacity_grid(full_table, coil_table)
+    return [
+        _search(
+            t.L_target_h, core_source, coil_table, cap_grid, t.tolerance, max_results, weights,
+            t.working_current_a, max_turns_per_core, top_k, stats, workers, dc_bias,
+        )
+        for t in targets
+    ]
+
+def _index_rows(
+    cores: CoreTable | CoreIndex,
+    L_target_h: float,
+    tolerance: float,
+    coil_table: CoilTable,
+    working_current_a: float | None,
+    dc_bias: bool,
+) -> np.ndarray | None:
+    # Catalog rows a CoreIndex narrows the search to; None means search the whole table.
+    # The index bounds are zero-bias bounds, so a biased search skips it.
+    if not isinstance(cores, CoreIndex) or (dc_bias and working_current_a is not None):
+        return None
+    pitch = float(coil_table.d_eff_m.min()) if len(coil_table) else 0.0
+    rows = cores.query(L_target_h, tolerance, pitch)
+    if len(rows) > INDEX_FULL_SCAN_FRACTION * len(cores.table):
+        # Copying a near-full slice costs more than the engine spends rejecting the rest
+        return None
+    return rows
+
+def _search(
+    L_target_h: float,
+    cores: CoreTable | CoreIndex,
+    coil_table: CoilTable,
+    cap_grid: np.ndarray | None,
+    tolerance: float,
+    max_results: int,
+    weights: ScoreWeights,
+    working_current_a: float | None,
+    max_turns_per_core: int | None,
+    top_k: bool,
+    stats: SearchStats | None,
+    workers: int | None = None,
+    dc_bias: bool = False,
+) -> list[DesignOption]:
+    rows = _index_rows(cores, L_target_h, tolerance, coil_table, working_current_a, dc_bias)
+    core_table = cores.table if isinstance(cores, CoreIndex) else cores
+    if rows is not None:
+        core_table = core_table.subset(rows)
+        cap_grid = None if cap_grid is None else cap_grid[rows]
+    if workers is not None and workers > 1:
+        with ShardedSearch(core_table, coil_table, workers) as sharded:
+            best = sharded.search(
+                L_target_h, max_results, tolerance, weights, working_current_a, max_turns_per_core, top_k, dc_bias,
+            )
+        return materialize(best, range(len(best)), core_table, coil_table)
+    if top_k:
+        best = evaluate_top_k(
+            L_target_h, core_table, coil_table, max_results, tolerance, weights,
+            working_current_a, max_turns_per_core, stats, cap_grid=cap_grid, dc_bias=dc_bias,
+        )
+        return materialize(best, range(len(best)), core_table, coil_table)
+    cand = evaluate(
+        L_target_h, core_table, coil_table, tolerance, weights, working_current_a, max_turns_per_core, cap_grid, stats,
+        dc_bias,
+    )
+    if stats is None:
+        return CandidateSet(cand, core_table, coil_table, weights).top(max_results)
+    t0 = perf_counter()
+    rows = cand.top_rows(max_results)
+    stats.lap("sort", t0)
+    return materialize(cand, rows, core_table, coil_table)
+
+def find_thickest_wires(
+    L_target_h: float,
+    cores: Iterable[Core] | CoreTable,
+    wires: WireCatalog,
+    tolerance: float = 0.1,
+    max_results: int = 20,
+    weights: ScoreWeights = ScoreWeights(),
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+    stats: SearchStats | None = None,
+    dc_bias: bool = False,
+) -> list[DesignOption]:
+    # Per core and turn count only the heaviest wire of the catalog that still fits is
+    # scored (a bisection over the pitch order, not a pass over every wire); use
+    # wires.select(builds=...) to compare enamel builds
+    core_table = as_core_table(cores)
+    cand = evaluate_thickest(
+        L_target_h, core_table, wires.table, tolerance, weights, working_current_a, max_turns_per_core, stats, dc_bias,
+    )
+    return CandidateSet(cand, core_table, wires.table, weights).top(max_results)
+
+def find_smallest_id(
+    L_target_h: float,
+    cores: Iterable[Core] | CoreTable,
+    coils: Iterable[Coil] | CoilTable,
+    tolerance: float = 0.1,
+    weights: ScoreWeights = ScoreWeights(),
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+    stats: SearchStats | None = None,
+    dc_bias: bool = False,
+) -> list[DesignOption]:
+    # ID-versus-wire frontier: for each grade (dc_bias.nearest_grade) and coil, the catalog core with the
+    # smallest inner diameter that reaches L_target_h and still holds the winding.
+    # Ordered by grade, then coil order; coils no core of a grade can carry are absent.
+    core_table = as_core_table(cores)
+    coil_table = as_coil_table(coils)
+    cand = evaluate_smallest_id(
+        L_target_h, core_table, coil_table, tolerance, weights, working_current_a, max_turns_per_core, stats, dc_bias,
+    )
+    return materialize(cand, range(len(cand)), core_table, coil_table)
+
+def iter_combinations(
+    L_target_h: float,
+    cores: Iterable[Core] | CoreTable,
+    coils: Iterable[Coil] | CoilTable,
+    tolerance: float = 0.1,
+    weights: ScoreWeights = ScoreWeights(),
+    working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
+    chunk_cores: int = 64,
+    dc_bias: bool = False,
+) -> Iterator[DesignOption]:
+    # Lazy counterpart of find_combinations: every feasible candidate, unranked, in catalog
+    # order. Only one chunk of cores is evaluated at a time, so memory stays flat.
+    core_table = as_core_table(cores)
+    coil_table = as_coil_table(coils)
+    for part in iter_candidate_chunks(
+        L_target_h, core_table, coil_table, tolerance, weights, working_current_a, max_turns_per_core, chunk_cores, dc_bias,
+    ):
+        yield from _iter_options(part, range(len(part)), core_table, coil_table)
+
+def top_k_options(options: Iterable[DesignOption], k: int) -> list[DesignOption]:
+    # Bounded consumer: keeps at most k options in a heap; same order as find_combinations
+    # for options produced in catalog order (ties keep arrival order)
+    heap: list[tuple] = []
+    seq = count()
+    for d in options:
+        item = (-d.score, -d.cost_usd, -d.rel_error, -next(seq), d)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return [item[-1] for item in sorted(heap, reverse=True)]
+
+OPTION_CSV_FIELDS = [f.name for f in fields(DesignOption)]
+
+def write_options_csv(options: Iterable[DesignOption], sink: TextIO) -> int:
+    # Stream options to a CSV sink row by row (core/coil written by name); returns rows written
+    writer = csv.writer(sink)
+    writer.writerow(OPTION_CSV_FIELDS)
+    n = 0
+    for d in options:
+        writer.writerow([getattr(d, name).name if name in ("core", "coil") else getattr(d, name) for name in OPTION_CSV_FIELDS])
+        n += 1
+    return n
+
+def option_losses(
+    options: Iterable[DesignOption],
+    frequencies_hz: np.ndarray | float,
+    ripples_a: np.ndarray | float,
+    dc_current_a: float | None = None,
+) -> LossSweep:
+    # Loss sweep of already materialized options (e.g. a find_combinations top-k), rows in their order
+    options = list(options)
+    rows = np.arange(len(options))
+    p = loss_inputs(
+        CoreTable([d.core for d in options]), CoilTable([d.coil for d in options]), rows, rows,
+        np.array([d.turns for d in options]), np.array([d.L_h for d in options], dtype=float),
+        np.array([d.resistance_ohm for d in options], dtype=float),
+    )
+    return sweep_losses(p, frequencies_hz, ripples_a, dc_current_a)
+
+def materialize(cand: Candidates, rows: Iterable[int], cores: CoreTable, coils: CoilTable) -> list[DesignOption]:
+    # Build DesignOption objects only for the requested candidate rows
+    return list(_iter_options(cand, rows, cores, coils))
+
+def _iter_options(cand: Candidates, rows: Iterable[int], cores: CoreTable, coils: CoilTable) -> Iterator[DesignOption]:
+    for i in rows:
+        ci = cand.core_idx[i]
+        window_area = float(cores.window_area_m2[ci])
+        fill_ratio = float(cand.fill_ratio[i])
+        yield DesignOption(
+            core=cores.cores[ci], coil=coils.coils[cand.coil_idx[i]], turns=int(cand.turns[i]),
+            L_h=float(cand.L_h[i]), rel_error=float(cand.rel_error[i]),
+            wire_length_m=float(cand.wire_length_m[i]), resistance_ohm=float(cand.resistance_ohm[i]),
+            cost_usd=float(cand.cost_usd[i]), score=float(cand.score[i]),
+            window_area_m2=window_area, leftover_window_area_m2=window_area * max(0.0, 1.0 - fill_ratio),
+            fill_ratio=fill_ratio,
+        )
+
+def find_combinations_reference(
     L_target_h: float,
     cores: Iterable[Core],
     coils: Iterable[Coil],
@@ -30,13 +393,14 @@ def find_combinations(
     max_results: int = 20,
     weights: ScoreWeights = ScoreWeights(),
     working_current_a: float | None = None,
+    max_turns_per_core: int | None = None,
 ) -> list[DesignOption]:
+    # Scalar loop kept as the reference implementation for parity checks against find_combinations
     results: list[DesignOption] = []
 
     for core in cores:
-        N_req = turns_for_target(core, L_target_h)
-        # Try integer turns around N_req for robustness
-        for N in {max(1, ceil(N_req - 2)), max(1, ceil(N_req - 1)), max(1, ceil(N_req)), max(1, ceil(N_req + 1)), max(1, ceil(N_req + 2))}:
+        # Every integer N whose inductance lands inside the tolerance band
+        for N in turns_in_tolerance(core, L_target_h, tolerance, max_turns_per_core):
             L_actual = toroid_inductance_h(core, N)
             rel_error = abs(L_actual - L_target_h) / L_target_h
             if rel_error > tolerance:
@@ -96,16 +460,12 @@ def layered_wire_length(core: Core, coil: Coil, N: int) -> tuple[float, int, flo
     IWM-style wire length and capacity at overall wire pitch.
     Returns: (wire_length_m, layers_used, finished_id_m, finished_od_m, capacity_turns)
     """
-    d_eff = coil.wire_diameter_m + 2 * max(0.0, getattr(coil, "enamel_thickness_m", 0.0))
+    d_eff = coil.pitch_m
 
-    # Resolve core dimensions
-    if core.id_m is not None and core.od_m is not None and core.ht_m is not None:
-        ID, OD, HT = core.id_m, core.od_m, core.ht_m
-    else:
-        derived = core._derive_dimensions_from_fields()
-        if derived is None:
-            return 0.0, 0, getattr(core, "id_m", 0.0) or 0.0, getattr(core, "od_m", 0.0) or 0.0, 0
-        OD, ID, HT = derived
+    # Core dimensions are resolved once on the core
+    if not core.has_dims:
+        return 0.0, 0, core.id_m or 0.0, core.od_m or 0.0, 0
+    OD, ID, HT = core.winding_dims
 
     if d_eff <= 0 or ID <= 0 or OD <= ID or HT <= 0:
         return 0.0, 0, ID, OD, 0
@@ -118,19 +478,11 @@ def layered_wire_length(core: Core, coil: Coil, N: int) -> tuple[float, int, flo
     capacity = tpl * layers_radial
     turns_needed = int(max(0, min(N, capacity)))
 
-    length = 0.0
-    remaining = turns_needed
-    layers_used = 0
-
-    # Distribute turns across layers; layer k (1-indexed) mid diameter Dk = ID + d_eff*(2k-1)
-    for k in range(1, layers_radial + 1):
-        if remaining <= 0:
-            break
-        turns_k = min(tpl, remaining)
-        Dk = ID + d_eff * (2 * k - 1)
-        length += turns_k * (pi * Dk)
-        remaining -= turns_k
-        layers_used += 1
+    # Layer k (1-indexed) has mid diameter Dk = ID + d_eff*(2k-1). Full layers sum to an
+    # arithmetic series: sum_{k=1..F} Dk = F*ID + d_eff*F^2; the partial layer sits at k = F+1.
+    full, rem = divmod(turns_needed, tpl)
+    length = pi * (tpl * (full * ID + d_eff * full * full) + rem * (ID + d_eff * (2 * full + 1)))
+    layers_used = full + (1 if rem else 0)
 
     finished_id = max(0.0, ID - 2.0 * d_eff * layers_used)
     finished_od = OD + 2.0 * d_eff * layers_used
@@ -0,0 +1,378 @@
+# service.py
+# Local HTTP/JSON design service: in-memory catalog, LRU cache, request coalescing, bounded worker pool
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, fields
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from math import isfinite
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+from catalog_snapshot import load_core_table
+from data import COILS
+from engine import CoilTable, CoreTable
+from scorer import ScoreWeights
+from search import DesignOption, find_combinations
+from wire_catalog import WireCatalog
+
+REPO = Path(__file__).resolve().parent
+REPO_XLSX = REPO / "TalkFile_창성코어(High Flux GT Cores).xlsx.xlsx"
+REPO_CSV = REPO / "TalkFile_창성코어(High Flux GT Cores).xlsx - Hight Flux GT Cores.csv"
+
+_WEIGHT_NAMES = tuple(f.name for f in fields(ScoreWeights))
+MAX_L_H = 1e3  # far above any toroid in the catalog; keeps the turn arithmetic finite
+
+
+class ServiceBusy(RuntimeError):
+    """The worker queue is full; the HTTP layer answers 503 with Retry-After."""
+
+
+class BodyTooLarge(ValueError):
+    """Request body over the handler's max_body_bytes; answered 413 without reading it."""
+
+
+@dataclass(frozen=True)
+class Query:
+    """One search; hashable, so identical queries share a cache entry and an in-flight future."""
+    L_target_h: float
+    tolerance: float = 0.1
+    max_results: int = 10
+    working_current_a: float | None = None
+    max_turns_per_core: int | None = None
+    weights: tuple[tuple[str, float], ...] = ()
+    dc_bias: bool = False
+
+    @classmethod
+    def from_json(cls, obj: Any) -> Query:
+        # Accepts {"L": H, "tol": fraction, "k": n, "imax": A, "bias": bool, "max_turns": n, "weights": {...}}
+        if not isinstance(obj, dict):
+            raise ValueError("query must be a JSON object")
+        if "L" not in obj:
+            raise ValueError("query needs a numeric 'L' (H)")
+        L = _number(obj["L"], "L")
+        tol = _number(obj.get("tol", 0.1), "tol")
+        k = _number(obj.get("k", 10), "k", int)
+        imax = obj.get("imax")
+        imax = None if imax is None else _number(imax, "imax")
+        max_turns = obj.get("max_turns")
+        max_turns = None if max_turns is None else _number(max_turns, "max_turns", int)
+        weights = obj.get("weights") or {}
+        bias = obj.get("bias", False)
+        if not 0 < L <= MAX_L_H:
+            raise ValueError(f"'L' must be in (0, {MAX_L_H:g}] H")
+        if not 0 < tol < 1:
+            raise ValueError("'tol' must be in (0, 1)")
+        if not 1 <= k <= 1000:
+            raise ValueError("'k' must be in 1..1000")
+        if imax is not None and imax < 0:
+            raise ValueError("'imax' must be >= 0")
+        if max_turns is not None and max_turns < 1:
+            raise ValueError("'max_turns' must be >= 1")
+        if not isinstance(weights, dict) or any(name not in _WEIGHT_NAMES for name in weights):
+            raise ValueError(f"'weights' keys must be among {', '.join(_WEIGHT_NAMES)}")
+        if not isinstance(bias, bool):
+            raise ValueError("'bias' must be true or false")
+        return cls(
+            L_target_h=L,
+            tolerance=tol,
+            max_results=k,
+            working_current_a=imax,
+            max_turns_per_core=max_turns,
+            weights=tuple(sorted((name, _number(v, f"weights.{name}")) for name, v in weights.items())),
+            dc_bias=bias,
+        )
+
+
+def _number(value: Any, name: str, kind: type = float) -> Any:
+    # JSON value as a finite float (or int); anything else is a 400, not a 500 from the search
+    try:
+        if isinstance(value, bool):  # JSON true/false would pass float() as 1/0
+            raise TypeError
+        x = float(value)
+        if not isfinite(x) or (kind is int and not x.is_integer()):
+            raise ValueError
+        return int(x) if kind is int else x
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"'{name}' must be a finite {'integer' if kind is int else 'number'}") from None
+
+
+def option_to_dict(d: DesignOption) -> dict:
+    out = {f.name: getattr(d, f.name) for f in fields(DesignOption)}
+    out["core"], out["coil"] = d.core.name, d.coil.name
+    return out
+
+
+def _percentiles(samples: Iterable[float]) -> dict:
+    arr = np.fromiter(samples, dtype=float)
+    if arr.size == 0:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {"count": int(arr.size), "p50_ms": p50 * 1e3, "p95_ms": p95 * 1e3, "p99_ms": p99 * 1e3, "max_ms": arr.max() * 1e3}
+
+
+class DesignService:
+    """find_combinations behind an LRU cache, in-flight coalescing and a bounded thread pool.
+
+    A query is answered from the cache, attached to an identical query already running,
+    or queued on the pool. At most max_pending distinct searches are queued or running;
+    beyond that submit() raises ServiceBusy instead of growing the queue. The catalog
+    tables are read-only, so workers share them without copies. Every search enumerates
+    at most max_turns_per_core turn counts per core (a query may ask for fewer), so one
+    request with a huge L or tolerance cannot take the process's memory.
+    """
+
+    def __init__(
+        self,
+        cores: CoreTable,
+        coils: CoilTable,
+        workers: int = 4,
+        max_pending: int = 64,
+        cache_size: int = 1024,
+        window_s: float = 60.0,
+        max_turns_per_core: int = 1000,
+    ):
+        self.cores, self.coils = cores, coils
+        self.max_turns_per_core = max_turns_per_core
+        self.workers, self.max_pending, self.cache_size, self.window_s = workers, max_pending, cache_size, window_s
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="design")
+        self._lock = threading.RLock()  # futures that finish during submit() call back under it
+        self._cache: OrderedDict[Query, list[dict]] = OrderedDict()
+        self._inflight: dict[Query, Future] = {}
+        self._started = time.monotonic()
+        self._search_s: deque[float] = deque(maxlen=4096)
+        self._request_s: deque[float] = deque(maxlen=4096)
+        self._finished_at: deque[float] = deque(maxlen=65536)
+        self.counters = dict.fromkeys(
+            ("queries", "cache_hits", "coalesced", "searches", "errors", "rejected", "requests"), 0,
+        )
+
+    def submit(self, queries: list[Query]) -> list[Future]:
+        """One future per query (JSON-ready option dicts); all-or-nothing admission for a batch.
+
+        A batch with more distinct new searches than max_pending could never be admitted,
+        so it raises ValueError (400, split the batch) instead of ServiceBusy (503, retry).
+        """
+        with self._lock:
+            new = {q for q in queries if q not in self._cache and q not in self._inflight}
+            if len(new) > self.max_pending:
+                raise ValueError(f"batch needs {len(new)} new searches; at most {self.max_pending} per request")
+            if len(self._inflight) + len(new) > self.max_pending:
+                self.counters["rejected"] += len(queries)
+                raise ServiceBusy(f"{len(self._inflight)} searches pending (limit {self.max_pending})")
+            self.counters["queries"] += len(queries)
+            futures = []
+            for q in queries:
+                if q in self._cache:
+                    self._cache.move_to_end(q)
+                    f: Future = Future()
+                    f.set_result(self._cache[q])
+                    self.counters["cache_hits"] += 1
+                elif q in self._inflight:
+                    f = self._inflight[q]
+                    self.counters["coalesced"] += 1
+                else:
+                    f = self._pool.submit(self._run, q)
+                    self._inflight[q] = f
+                    f.add_done_callback(partial(self._done, q))
+                futures.append(f)
+            return futures
+
+    def search(self, queries: list[Query], timeout: float | None = None) -> list[list[dict]]:
+        return [f.result(timeout) for f in self.submit(queries)]
+
+    def _run(self, q: Query) -> list[dict]:
+        t0 = time.perf_counter()
+        max_turns = self.max_turns_per_core
+        if q.max_turns_per_core is not None:
+            max_turns = min(max_turns, q.max_turns_per_core)
+        options = find_combinations(
+            q.L_target_h, self.cores, self.coils, q.tolerance, q.max_results,
+            ScoreWeights(**dict(q.weights)), q.working_current_a, max_turns, top_k=True, dc_bias=q.dc_bias,
+        )
+        result = [option_to_dict(d) for d in options]
+        with self._lock:
+            self._search_s.append(time.perf_counter() - t0)
+        return result
+
+    def _done(self, q: Query, f: Future) -> None:
+        with self._lock:
+            self._inflight.pop(q, None)
+            self._finished_at.append(time.monotonic())
+            if f.cancelled() or f.exception() is not None:
+                self.counters["errors"] += 1
+                return
+            self.counters["searches"] += 1
+            self._cache[q] = f.result()
+            self._cache.move_to_end(q)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def record_request(self, seconds: float) -> None:
+        with self._lock:
+            self.counters["requests"] += 1
+            self._request_s.append(seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            recent = sum(1 for t in self._finished_at if now - t <= self.window_s)
+            uptime = now - self._started
+            return {
+                "uptime_s": uptime,
+                "catalog": {"cores": len(self.cores), "coils": len(self.coils)},
+                "pool": {"workers": self.workers, "pending": len(self._inflight), "max_pending": self.max_pending},
+                "limits": {"max_turns_per_core": self.max_turns_per_core},
+                "cache": {"entries": len(self._cache), "capacity": self.cache_size},
+                "counters": dict(self.counters),
+                "throughput": {
+                    "searches_per_s": recent / min(self.window_s, max(uptime, 1e-9)),
+                    "window_s": self.window_s,
+                },
+                "latency": {"search": _percentiles(self._search_s), "request": _percentiles(self._request_s)},
+            }
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "toroid-design/1"
+    service: DesignService
+    timeout_s: float = 60.0
+    quiet: bool = True
+    max_body_bytes: int = 1 << 20
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(200, {"ok": True, "cores": len(self.service.cores), "coils": len(self.service.coils)})
+        elif self.path == "/stats":
+            self._send(200, self.service.stats())
+        else:
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            body = self._read_json()
+            if self.path == "/search":
+                queries = [Query.from_json(body)]
+            elif self.path == "/batch":
+                items = body.get("queries") if isinstance(body, dict) else None
+                if not isinstance(items, list) or not items:
+                    raise ValueError("'queries' must be a non-empty list")
+                queries = [Query.from_json(item) for item in items]
+            else:
+                self._send(404, {"error": f"unknown path {self.path}"})
+                return
+            results = self.service.search(queries, timeout=self.timeout_s)
+        except BodyTooLarge as e:
+            self.close_connection = True  # the body is left unread
+            self._send(413, {"error": str(e)})
+            return
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        except ServiceBusy as e:
+            self._send(503, {"error": str(e)}, {"Retry-After": "1"})
+            return
+        except FutureTimeout:
+            self._send(504, {"error": "search timed out"})
+            return
+        except Exception as e:  # search failure: report it, keep serving
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        if self.path == "/search":
+            self._send(200, {"options": results[0]})
+        else:
+            self._send(200, {"results": [{"options": r} for r in results]})
+        self.service.record_request(time.perf_counter() - t0)
+
+    def _read_json(self) -> Any:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ValueError("invalid Content-Length") from None
+        if length < 0:
+            raise ValueError("invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise BodyTooLarge(f"request body over {self.max_body_bytes} bytes")
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e}") from None
+
+    def _send(self, code: int, obj: Any, headers: dict[str, str] | None = None) -> None:
+        data = json.dumps(obj).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(
+    service: DesignService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    timeout_s: float = 60.0,
+    quiet: bool = True,
+    max_body_bytes: int = 1 << 20,
+) -> ThreadingHTTPServer:
+    """ThreadingHTTPServer bound to host:port (port 0 picks a free one) serving the service."""
+    handler = type("DesignHandler", (_Handler,), {
+        "service": service, "timeout_s": timeout_s, "quiet": quiet, "max_body_bytes": max_body_bytes,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Serve find_combinations over HTTP/JSON")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--csv", default=str(REPO_XLSX if REPO_XLSX.exists() else REPO_CSV), help="core catalog (.xlsx or CSV)")
+    p.add_argument("--wire-catalog", action="store_true", help="search the AWG x enamel-build catalog instead of data.COILS")
+    p.add_argument("--workers", type=int, default=4, help="search threads")
+    p.add_argument("--max-pending", type=int, default=64, help="queued + running searches before answering 503")
+    p.add_argument("--cache", type=int, default=1024, help="LRU entries")
+    p.add_argument("--timeout", type=float, default=60.0, help="seconds a request waits for its searches")
+    p.add_argument("--max-turns", type=int, default=1000, help="turn counts searched per core, at most")
+    p.add_argument("--max-body", type=int, default=1 << 20, help="largest request body in bytes (413 above)")
+    p.add_argument("--verbose", action="store_true", help="log every request")
+    args = p.parse_args()
+
+    cores = load_core_table(args.csv)
+    coils = WireCatalog.from_awg_table().table if args.wire_catalog else CoilTable(COILS)
+    if args.max_turns < 1:
+        p.error("--max-turns must be >= 1")
+    service = DesignService(cores, coils, args.workers, args.max_pending, args.cache, max_turns_per_core=args.max_turns)
+    server = make_server(service, args.host, args.port, args.timeout, quiet=not args.verbose, max_body_bytes=args.max_body)
+    print(f"serving {len(cores)} cores x {len(coils)} coils on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import catalog_snapshot
+from benchmarks.synthetic import REPO, synthetic_gt_csv
+from catalog_snapshot import content_hash, load_core_table, load_snapshot, snapshot_path
+from engine import CoreTable
+from import_csv import _iter_catalog_values, core_table_from_csv, cores_from_high_flux_csv
+
+GT_XLSX = REPO / "TalkFile_창성코어(High Flux GT Cores).xlsx.xlsx"
+GT_CSV = REPO / "TalkFile_창성코어(High Flux GT Cores).xlsx - Hight Flux GT Cores.csv"
+
+COLUMNS = (
+    "al_h", "mu_r", "area_m2", "path_length_m", "od_m", "id_m", "ht_m", "has_dims", "window_area_m2", "price_usd",
+)
+
+
+def assert_same_table(a: CoreTable, b: CoreTable) -> None:
+    assert [c.name for c in a.cores] == [c.name for c in b.cores]
+    for name in COLUMNS:
+        assert np.array_equal(getattr(a, name), getattr(b, name), equal_nan=True), name
+
+
+def test_workbook_and_csv_export_parse_the_same():
+    assert list(_iter_catalog_values(GT_XLSX)) == list(_iter_catalog_values(GT_CSV))
+    assert_same_table(core_table_from_csv(GT_XLSX), core_table_from_csv(GT_CSV))
+
+
+def test_streamed_table_matches_core_objects(tmp_path):
+    src = tmp_path / "gt.csv"
+    src.write_text(synthetic_gt_csv(400, 1), encoding="utf-8")
+    assert_same_table(core_table_from_csv(src, chunk_rows=64), CoreTable(cores_from_high_flux_csv(src)))
+
+
+@pytest.mark.parametrize("source", [GT_CSV, GT_XLSX])
+def test_snapshot_round_trip(tmp_path, source):
+    path = Path(shutil.copy(source, tmp_path / source.name))
+    first = load_core_table(path)
+    assert snapshot_path(path, content_hash(path)).exists()
+    assert_same_table(first, load_core_table(path))
+    assert_same_table(first, core_table_from_csv(source))
+
+
+def test_snapshot_is_rebuilt_when_the_source_changes(tmp_path, monkeypatch):
+    path = tmp_path / "gt.csv"
+    path.write_text(synthetic_gt_csv(30, 1), encoding="utf-8")
+    load_snapshot(path)
+    old = snapshot_path(path, content_hash(path))
+
+    path.write_text(synthetic_gt_csv(45, 2), encoding="utf-8")
+    table = load_core_table(path)
+    assert_same_table(table, core_table_from_csv(path))
+    assert snapshot_path(path, content_hash(path)).exists()
+    assert not old.exists()   # stale snapshot of the old contents is removed
+
+    # A hit never parses the source again
+    monkeypatch.setattr(catalog_snapshot, "_iter_catalog_values", None)
+    assert_same_table(load_core_table(path), table)
+
+
+def test_snapshot_version_is_part_of_the_key(tmp_path, monkeypatch):
+    path = Path(shutil.copy(GT_CSV, tmp_path / "gt.csv"))
+    digest = content_hash(path)
+    monkeypatch.setattr(catalog_snapshot, "SNAPSHOT_VERSION", catalog_snapshot.SNAPSHOT_VERSION + 1)
+    assert content_hash(path) != digest
+
+
+@pytest.mark.parametrize("damage", ["truncated", "header_only", "empty", "garbage", "wrong_dtype"])
+def test_corrupt_snapshot_is_rebuilt(tmp_path, damage):
+    path = tmp_path / "gt.csv"
+    path.write_text(synthetic_gt_csv(40, 3), encoding="utf-8")
+    expected = np.array(load_snapshot(path))
+    snap = snapshot_path(path, content_hash(path))
+    data = snap.read_bytes()
+    snap.write_bytes({
+        "truncated": data[:len(data) - 100],
+        "header_only": data[:128],
+        "empty": b"",
+        "garbage": b"\x93NUMPY not really" * 10,
+    }.get(damage, b""))
+    if damage == "wrong_dtype":
+        np.save(snap, np.zeros((3, 2)))
+
+    assert np.array_equal(load_snapshot(path), expected)
+    assert np.array_equal(np.load(snap), expected)   # the damaged file was replaced
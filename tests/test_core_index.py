@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_coils, synthetic_cores
+from core_index import CoreIndex
+from engine import CoilTable, CoreTable, evaluate
+from search import find_combinations
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return CoreTable(synthetic_cores(2000, 9)), CoilTable(synthetic_coils(20, 1))
+
+
+def _key(options):
+    return [(o.core.name, o.coil.name, o.turns, o.score) for o in options]
+
+
+def test_query_keeps_every_core_with_candidates(tables):
+    cores, coils = tables
+    index = CoreIndex(cores.subset(np.arange(1000)))
+    index.add(cores.subset(np.arange(1000, len(cores))))   # merged, not re-sorted
+    pitch = float(coils.d_eff_m.min())
+    rng = np.random.default_rng(3)
+    pruned = 0
+    for _ in range(40):
+        L, tol = 10 ** rng.uniform(-7, 0), rng.uniform(0.01, 0.9)
+        rows = index.query(L, tol, pitch)
+        assert (np.diff(rows) > 0).all()
+        reached = np.unique(evaluate(L, cores, coils, tol).core_idx)
+        assert np.isin(reached, rows).all()
+        pruned += len(cores) - len(rows)
+    assert pruned > 0
+
+
+@pytest.mark.parametrize("L", [1e-6, 1e-4, 1e-2, 0.5])
+@pytest.mark.parametrize("top_k", [False, True])
+def test_indexed_search_matches_table_scan(tables, L, top_k):
+    cores, coils = tables
+    index = CoreIndex(cores)
+    assert _key(find_combinations(L, index, coils, 0.1, 15, top_k=top_k)) == \
+        _key(find_combinations(L, cores, coils, 0.1, 15, top_k=top_k))
@@ -0,0 +1,56 @@
+import random
+from math import ceil, log, pi
+
+import pytest
+
+from custom_core import _shape, custom_core_inductance_h, solve_custom_core, validate_feasible
+from models import MU0
+
+
+def brute_force(L, mu_r, d, max_od, min_id, max_ht, tolerance=0.1, max_layers=16, max_turns=2000):
+    # Every (N, Ly) shaped by _shape; the smallest volume wins
+    best = None
+    for Ly in range(1, max_layers + 1):
+        ID = max(min_id + 2 * Ly * d, 2 * (Ly + 1) * d)
+        for N in range(Ly, max_turns):
+            ht_star = 2 * pi * L / (MU0 * mu_r * N * N) * 1e3 / log(1 + 2 * Ly * d / ID)
+            design = _shape(L, mu_r, N, Ly, d, ID, ht_star, d * ceil(N / Ly), max_od, max_ht, tolerance)
+            if design is not None and (best is None or design.volume_mm3 < best.volume_mm3):
+                best = design
+    return best
+
+
+def test_binding_max_ht_matches_brute_force():
+    args = (3.8685e-4, 60, 0.5, None, 3.0, 10.0)
+    design = solve_custom_core(*args)
+    reference = brute_force(*args)
+    assert design is not None and reference is not None
+    assert design.volume_mm3 == pytest.approx(reference.volume_mm3, rel=1e-12)
+    assert design.volume_mm3 < 700  # previously 742 mm³ at the wrong N
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_random_cases_match_brute_force(seed):
+    rng = random.Random(seed)
+    L = 10 ** rng.uniform(-5, -3)
+    mu_r = rng.choice([26, 60, 125])
+    d = rng.uniform(0.2, 1.0)
+    max_ht = rng.choice([None, rng.uniform(3, 20)])
+    max_od = rng.choice([None, rng.uniform(15, 60)])
+    min_id = rng.uniform(0, 8)
+    design = solve_custom_core(L, mu_r, d, max_od, min_id, max_ht)
+    reference = brute_force(L, mu_r, d, max_od, min_id, max_ht)
+    if reference is None:
+        assert design is None
+        return
+    assert design is not None
+    assert design.volume_mm3 <= reference.volume_mm3 * (1 + 1e-9)
+
+
+def test_solution_is_feasible_and_in_tolerance():
+    design = solve_custom_core(2e-4, 125, 0.4, max_od_mm=30, min_finished_id_mm=4, max_ht_mm=12)
+    assert design is not None
+    assert validate_feasible(design.turns, 0.4, design.od_mm, design.id_mm, design.ht_mm, design.layers)[0]
+    L = custom_core_inductance_h(125, design.turns, design.od_mm, design.id_mm, design.ht_mm)
+    assert abs(L - 2e-4) / 2e-4 <= 0.1
+    assert design.ht_mm <= 12 and design.od_mm <= 30
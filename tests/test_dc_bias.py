@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_coils, synthetic_cores
+from dc_bias import ROLL_OFF, RollOff, biased_turns, field_oe, nearest_grade, permeability_fraction
+from engine import CoilTable, CoreTable, candidate_turns, layered_capacity
+from models import MU0
+from search import find_combinations
+from tolerance import analyze_tolerances
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return CoreTable(synthetic_cores(600, 2)), CoilTable(synthetic_coils(20, 1))
+
+
+def test_nearest_grade():
+    assert nearest_grade(np.array([20.0, 35.0, 59.0, 90.0, 300.0])).tolist() == [26.0, 26.0, 60.0, 125.0, 125.0]
+
+
+def test_roll_off_is_one_at_zero_bias_and_half_at_h50():
+    mu = np.array([26.0, 60.0, 125.0])
+    assert np.allclose(permeability_fraction(mu, np.zeros(3)), 1.0)
+    assert np.allclose(permeability_fraction(mu, np.array([240.0, 110.0, 55.0])), 0.5)
+    with pytest.raises(ValueError):
+        RollOff(0.01, 1e-4, 2.0)
+
+
+@pytest.mark.parametrize("L, current", [(1e-5, 8.0), (2e-4, 0.5), (2e-4, 3.0), (2e-3, 8.0)])
+def test_biased_turns_solves_the_fixed_point(tables, L, current):
+    cores, _ = tables
+    N = biased_turns(L, cores.al_h, cores.mu_r, cores.path_length_m, current)
+    assert np.isfinite(N).all()
+    f = permeability_fraction(cores.mu_r, field_oe(N, current, cores.path_length_m))
+    assert np.allclose(cores.al_h * N * N * f, L, rtol=1e-9)
+    assert (N >= np.sqrt(L / cores.al_h) - 1e-9).all()
+
+
+def test_biased_turns_zero_current_is_unbiased(tables):
+    cores, _ = tables
+    N = biased_turns(2e-4, cores.al_h, cores.mu_r, cores.path_length_m, 0.0)
+    assert np.allclose(N, np.sqrt(2e-4 / cores.al_h))
+
+
+def test_biased_turns_n_max_drops_rows_beyond_it(tables):
+    cores, _ = tables
+    free = biased_turns(2e-4, cores.al_h, cores.mu_r, cores.path_length_m, 3.0)
+    capped = biased_turns(2e-4, cores.al_h, cores.mu_r, cores.path_length_m, 3.0, n_max=np.full(len(cores), 60.0))
+    assert np.array_equal(np.isfinite(capped), free <= 60.0)
+    assert np.allclose(capped[free <= 60.0], free[free <= 60.0])
+
+
+@pytest.mark.parametrize("L, current, tol", [(1e-4, 0.5, 0.05), (5e-4, 2.0, 0.1), (2e-3, 8.0, 0.05)])
+def test_biased_band_matches_brute_force(tables, L, current, tol):
+    cores, coils = tables
+    pitch = float(coils.d_eff_m.min())
+    ci, N = candidate_turns(cores, L, tol, None, current, True, pitch)
+    ceiling = layered_capacity(cores.od_m, cores.id_m, cores.ht_m, cores.has_dims, np.float64(pitch))
+    n = np.arange(1, int(min(ceiling.max(), 4000)) + 1)[None, :]
+    mu = cores.mu_r[:, None]
+    le = cores.path_length_m[:, None]
+    L_n = MU0 * mu * n ** 2 * cores.area_m2[:, None] / le * permeability_fraction(
+        np.broadcast_to(mu, (len(cores), n.shape[1])), field_oe(n, current, le),
+    )
+    rows, cols = np.nonzero((np.abs(L_n - L) / L <= tol) & (n <= ceiling[:, None]))
+    assert set(zip(ci.tolist(), N.tolist())) == set(zip(rows.tolist(), (cols + 1).tolist()))
+
+
+def test_biased_search_top_k_and_sharded_agree(tables):
+    cores, coils = tables
+
+    def key(options):
+        return [(d.core.name, d.coil.name, d.turns, d.score) for d in options]
+
+    full = find_combinations(2e-4, cores, coils, 0.1, 10, working_current_a=3.0, dc_bias=True)
+    assert full
+    assert key(full) == key(find_combinations(2e-4, cores, coils, 0.1, 10, working_current_a=3.0, dc_bias=True, top_k=True))
+    assert key(full) == key(find_combinations(2e-4, cores, coils, 0.1, 10, working_current_a=3.0, dc_bias=True, workers=2))
+    for d in full:
+        assert abs(d.L_h - 2e-4) / 2e-4 <= 0.1
+
+
+def test_tolerance_analysis_uses_the_biased_inductance(tables):
+    cores, coils = tables
+    options = find_combinations(1e-4, cores, coils, 0.1, 3, working_current_a=3.0, dc_bias=True)
+    biased = analyze_tolerances(options, 1e-4, 0.1, samples=2000, working_current_a=3.0, dc_bias=True)
+    unbiased = analyze_tolerances(options, 1e-4, 0.1, samples=2000)
+    for b, u, d in zip(biased, unbiased, options):
+        assert b.L_mean_h == pytest.approx(d.L_h, rel=0.01)
+        assert b.yield_fraction > 0.5
+        assert u.L_mean_h > b.L_mean_h
+
+
+def test_negative_current_is_rejected(tables):
+    cores, coils = tables
+    with pytest.raises(ValueError):
+        find_combinations(2e-4, cores, coils, 0.1, 10, working_current_a=-3.0, dc_bias=True)
+    with pytest.raises(ValueError):
+        analyze_tolerances([], 2e-4, working_current_a=-1.0)
+
+
+def test_roll_off_table_covers_the_high_flux_grades():
+    assert sorted(ROLL_OFF) == [26.0, 60.0, 125.0]
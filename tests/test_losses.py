@@ -0,0 +1,90 @@
+from math import cos, cosh, pi, sin, sinh, sqrt
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_coils, synthetic_cores
+from dc_bias import nearest_grade
+from engine import CoilTable, CoreTable
+from losses import CORE_LOSS, core_loss_density_w_m3, dowell_factor, skin_depth_m, sweep_losses
+from scorer import ScoreWeights, score_combo
+from search import find_combinations, option_losses, search_candidates
+
+
+@pytest.fixture(scope="module")
+def candidates():
+    cores, coils = CoreTable(synthetic_cores(300, 2)), CoilTable(synthetic_coils(20, 1))
+    return search_candidates(2e-4, cores, coils, 0.1, working_current_a=2.0)
+
+
+def dowell_direct(d, pitch, m, f):
+    # Textbook form, fine while sinh/cosh stay in range
+    x = sqrt(pi) / 2 * d * sqrt(d / pitch) / float(skin_depth_m(f))
+    skin = (sinh(2 * x) + sin(2 * x)) / (cosh(2 * x) - cos(2 * x))
+    proximity = (sinh(x) - sin(x)) / (cosh(x) + cos(x))
+    return x * (skin + 2 * (m * m - 1) / 3 * proximity)
+
+
+@pytest.mark.parametrize("d, pitch, m", [(0.2e-3, 0.22e-3, 1), (0.5e-3, 0.55e-3, 3), (1.0e-3, 1.1e-3, 6)])
+@pytest.mark.parametrize("f", [10e3, 100e3, 1e6])
+def test_dowell_matches_textbook_form(d, pitch, m, f):
+    assert float(dowell_factor(d, pitch, m, f)) == pytest.approx(dowell_direct(d, pitch, m, f), rel=1e-9)
+
+
+def test_dowell_limits():
+    assert float(dowell_factor(0.5e-3, 0.55e-3, 4, 0.0)) == 1.0
+    assert float(dowell_factor(0.5e-3, 0.55e-3, 4, 10.0)) == pytest.approx(1.0, abs=1e-6)
+    fr = dowell_factor(5e-3, 5.5e-3, np.arange(1, 20)[:, None], np.array([1e6, 1e8])[None, :])
+    assert np.isfinite(fr).all()
+    assert (np.diff(fr, axis=0) > 0).all()   # more layers, more proximity loss
+
+
+def test_core_loss_uses_nearest_grade_curve():
+    mu = np.array([24.0, 58.0, 130.0, 90.0])
+    f = np.array([50e3, 200e3])
+    b = np.array([[0.01, 0.05], [0.02, 0.1], [0.03, 0.2], [0.04, 0.3]])
+    pv = core_loss_density_w_m3(mu, f, b)
+    assert pv.shape == (4, 2, 2)
+    for i, grade in enumerate(nearest_grade(mu)):
+        fit = CORE_LOSS[float(grade)]
+        for j, fj in enumerate(f):
+            for r in range(2):
+                expected = 1e3 * fit.k * (fj / 1e3) ** fit.alpha * b[i, r] ** fit.beta
+                assert pv[i, j, r] == pytest.approx(expected, rel=1e-12)
+
+
+def test_sweep_matches_per_candidate_formulas(candidates):
+    p = candidates._loss_inputs()
+    freqs, ripples = np.array([50e3, 300e3]), np.array([0.2, 0.8])
+    sweep = candidates.losses(freqs, ripples)
+    assert sweep.total_w.shape == (len(p), 2, 2)
+    for i in range(0, len(p), max(1, len(p) // 25)):
+        for j, f in enumerate(freqs):
+            fr = dowell_direct(p.bare_d_m[i], p.pitch_m[i], max(1, p.layers[i]), f)
+            for r, ripple in enumerate(ripples):
+                b = p.L_h[i] * ripple / (2 * p.turns[i] * p.area_m2[i])
+                pv = core_loss_density_w_m3(p.mu_r[i:i + 1], np.array([f]), np.array([[b]]))[0, 0, 0]
+                core = pv * p.area_m2[i] * p.path_length_m[i]
+                copper = p.dc_resistance_ohm[i] * (4.0 + max(fr, 1.0) * ripple * ripple / 12)
+                assert sweep.core_w[i, j, r] == pytest.approx(core, rel=1e-12)
+                assert sweep.copper_w[i, j, r] == pytest.approx(copper, rel=1e-9)
+
+
+def test_loss_term_ranks_by_score_plus_loss(candidates):
+    w = ScoreWeights(w_loss=0.5, loss_frequency_hz=150e3, loss_ripple_a=0.6)
+    best = candidates.best_for(w, 10)
+    assert [o.score for o in best] == sorted(o.score for o in best)
+    loss = option_losses(best, w.loss_frequency_hz, w.loss_ripple_a, 2.0).total_w[:, 0, 0]
+    for o, lw in zip(best, loss):
+        assert o.score == pytest.approx(
+            score_combo(o.rel_error, o.cost_usd, o.resistance_ohm, w, fill_ratio=o.fill_ratio, loss_w=lw), rel=1e-12,
+        )
+    direct = find_combinations(2e-4, candidates.cores, candidates.coils, 0.1, 10, w, working_current_a=2.0)
+    assert [(o.core.name, o.coil.name, o.turns) for o in direct] == [(o.core.name, o.coil.name, o.turns) for o in best]
+
+
+def test_zero_ripple_is_dc_copper_only(candidates):
+    p = candidates._loss_inputs()
+    sweep = sweep_losses(p, 100e3, 0.0, 2.0)
+    assert np.array_equal(sweep.core_w[:, 0, 0], np.zeros(len(p)))
+    assert np.allclose(sweep.copper_w[:, 0, 0], p.dc_resistance_ohm * 4.0)
@@ -0,0 +1,46 @@
+import pickle
+from dataclasses import replace
+from math import log, pi
+
+import pytest
+
+from models import MU0, Coil, Core
+
+
+def make_core(**kw):
+    fields = dict(
+        name="C", mu_r=60.0, area_m2=6.5e-5, r_mean_m=0.0115, window_area_m2=1.5e-4,
+        od_m=0.0335, id_m=0.0135, ht_m=0.0112,
+    )
+    return Core(**{**fields, **kw})
+
+
+def test_resolved_geometry_lives_in_the_core_slots():
+    core = make_core()
+    assert not hasattr(core, "__dict__")
+    assert core.path_length_m == pi * (core.od_m - core.id_m) / log(core.od_m / core.id_m)
+    assert core.al_h == MU0 * core.mu_r * core.area_m2 / core.path_length_m
+    assert core.has_dims and core.winding_dims == (core.od_m, core.id_m, core.ht_m)
+    g = core.geometry
+    assert (g.path_length_m, g.al_h, g.od_m, g.id_m, g.ht_m, g.has_dims) == \
+        (core.path_length_m, core.al_h, core.od_m, core.id_m, core.ht_m, True)
+
+
+def test_derived_dims_and_replace_re_resolve():
+    core = make_core()
+    derived = replace(core, od_m=None, id_m=None, ht_m=None)
+    assert derived.has_dims
+    od, id_, ht = derived.winding_dims
+    assert id_ == pytest.approx(2 * (core.window_area_m2 / pi) ** 0.5)
+    assert derived.path_length_m == pytest.approx(pi * (od - id_) / log(od / id_))
+    bare = replace(derived, window_area_m2=0.0)
+    assert not bare.has_dims and bare.winding_dims == (0.0, 0.0, 0.0)
+    assert bare.path_length_m == 2 * pi * core.r_mean_m
+    assert Coil("w", 28, 0.3e-3, 0.2, 0.01).max_turns_on(bare) == 0
+
+
+def test_core_pickles_with_its_resolved_fields():
+    core = make_core(od_m=None)
+    back = pickle.loads(pickle.dumps(core))
+    assert back == core
+    assert (back.path_length_m, back.winding_dims) == (core.path_length_m, core.winding_dims)
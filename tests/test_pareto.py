@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_coils, synthetic_cores
+from engine import CoilTable, CoreTable
+from pareto import skyline
+from scorer import ScoreWeights
+from search import search_candidates
+
+
+def brute_force_skyline(points: np.ndarray) -> np.ndarray:
+    keep = []
+    for j, p in enumerate(points):
+        dominated = any((q <= p).all() and (q < p).any() for q in points)
+        if not dominated:
+            keep.append(j)
+    return np.array(keep, dtype=np.int64)
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("block", [1, 7, 64])
+def test_skyline_matches_brute_force(seed, block):
+    rng = np.random.default_rng(seed)
+    n, d = int(rng.integers(150, 400)), int(rng.integers(2, 5))
+    # Few distinct levels per column: plenty of ties and exact duplicates
+    points = rng.integers(0, 6, size=(n, d)).astype(float)
+    points[rng.integers(0, n, size=20)] = points[rng.integers(0, n, size=20)]
+    assert n > block
+    assert np.array_equal(skyline(points, block=block), brute_force_skyline(points))
+
+
+def test_skyline_continuous_and_edge_cases():
+    rng = np.random.default_rng(11)
+    points = rng.random((600, 3))
+    assert np.array_equal(skyline(points, block=50), brute_force_skyline(points))
+    assert skyline(np.empty((0, 3))).size == 0
+    same = np.ones((5, 2))
+    assert skyline(same, block=2).tolist() == [0, 1, 2, 3, 4]   # equal rows are all kept
+
+
+def test_pareto_front_holds_the_best_for_any_weights():
+    cs = search_candidates(2e-4, CoreTable(synthetic_cores(200, 1)), CoilTable(synthetic_coils(12, 1)), 0.1)
+    front = cs.pareto()
+    assert 0 < len(front) < len(cs)
+    rng = np.random.default_rng(2)
+    for _ in range(10):
+        w = ScoreWeights(*rng.uniform(0, 2, size=4))
+        assert front.best_for(w, 1)[0].score == cs.best_for(w, 1)[0].score
@@ -0,0 +1,153 @@
+import random
+import warnings
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_coils, synthetic_cores
+from core_index import CoreIndex
+from engine import CoilTable, CoreTable, candidate_turns, layered_capacity
+from scorer import ScoreWeights
+from search import (
+    BomTarget, find_combinations, find_combinations_batch, find_combinations_reference, search_candidates,
+)
+
+SEEDS = range(12)
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    # Every other core gets a saturation limit so the flux check runs on both branches
+    rng = random.Random(5)
+    cores = [
+        replace(c, b_sat_t=rng.uniform(0.2, 1.5)) if i % 2 else c
+        for i, c in enumerate(synthetic_cores(150, 3))
+    ]
+    return cores, synthetic_coils(12, 2)
+
+
+def random_query(seed: int) -> dict:
+    rng = random.Random(seed)
+    return dict(
+        L_target_h=10 ** rng.uniform(-6, -2),
+        tolerance=rng.choice([0.01, 0.05, 0.1, 0.3]),
+        max_results=rng.choice([1, 5, 20, 1000]),
+        weights=ScoreWeights(
+            w_error=rng.uniform(0.0, 2.0), w_cost=rng.uniform(-0.1, 1.0), w_resistance=rng.uniform(0.0, 0.1),
+            w_fill=rng.uniform(0.0, 3.0), fill_min=rng.uniform(0.5, 0.8), fill_max=rng.uniform(0.8, 0.95),
+        ),
+        working_current_a=rng.choice([None, 0.5, 3.0, 20.0]),
+        max_turns_per_core=rng.choice([None, 10, 200]),
+    )
+
+
+def key(options):
+    return [(o.core.name, o.coil.name, o.turns, o.L_h, o.score, o.cost_usd, o.fill_ratio) for o in options]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("top_k", [False, True])
+def test_engine_matches_reference(catalog, seed, top_k):
+    cores, coils = catalog
+    q = random_query(seed)
+    expected = key(find_combinations_reference(cores=cores, coils=coils, **q))
+    assert key(find_combinations(cores=cores, coils=coils, top_k=top_k, **q)) == expected
+    assert key(find_combinations(cores=CoreIndex(cores), coils=coils, top_k=top_k, **q)) == expected
+
+
+@pytest.mark.parametrize("top_k", [False, True])
+def test_sharded_matches_reference(catalog, top_k):
+    cores, coils = catalog
+    for seed in SEEDS[:3]:
+        q = random_query(seed)
+        expected = key(find_combinations_reference(cores=cores, coils=coils, **q))
+        assert key(find_combinations(cores=cores, coils=coils, top_k=top_k, workers=2, **q)) == expected
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_batch_matches_reference(catalog, workers):
+    cores, coils = catalog
+    queries = [random_query(seed) for seed in SEEDS]
+    weights, max_turns = queries[0]["weights"], queries[0]["max_turns_per_core"]
+    targets = [BomTarget(q["L_target_h"], q["tolerance"], q["working_current_a"]) for q in queries]
+    for source in (CoreTable(cores), CoreIndex(cores)):
+        results = find_combinations_batch(
+            targets, source, coils, 20, weights, max_turns, top_k=True, workers=workers,
+        )
+        for t, got in zip(targets, results):
+            expected = find_combinations_reference(
+                t.L_target_h, cores, coils, t.tolerance, 20, weights, t.working_current_a, max_turns,
+            )
+            assert key(got) == key(expected)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_rescore_matches_reference(catalog, seed):
+    cores, coils = catalog
+    q = random_query(seed)
+    new_weights = random_query(seed + 100)["weights"]
+    cs = search_candidates(
+        q["L_target_h"], CoreTable(cores), CoilTable(coils), q["tolerance"], q["weights"],
+        q["working_current_a"], q["max_turns_per_core"],
+    )
+    expected = find_combinations_reference(**{**q, "weights": new_weights}, cores=cores, coils=coils)
+    assert key(cs.best_for(new_weights, q["max_results"])) == key(expected)
+
+
+@pytest.mark.parametrize("max_turns", [None, 5, 40])
+def test_band_above_capacity_matches_reference(catalog, max_turns):
+    # Wide bands run far past the window; the capacity cap must not move the max_turns window
+    cores, coils = catalog
+    for L in (0.05, 0.5):
+        expected = find_combinations_reference(L, cores, coils, 0.6, 50, max_turns_per_core=max_turns)
+        for top_k in (False, True):
+            got = find_combinations(L, cores, coils, 0.6, 50, max_turns_per_core=max_turns, top_k=top_k)
+            assert key(got) == key(expected)
+
+
+def test_band_is_capped_at_the_thinnest_wire_capacity(catalog):
+    cores, coils = CoreTable(catalog[0]), CoilTable(catalog[1])
+    pitch = float(coils.d_eff_m.min())
+    core_idx, turns = candidate_turns(cores, 100.0, 0.5, min_pitch_m=pitch)
+    cap = layered_capacity(cores.od_m, cores.id_m, cores.ht_m, cores.has_dims, pitch)
+    assert (turns <= cap[core_idx]).all()
+    assert turns.size <= cap.sum()
+
+
+def test_indexed_batch_uses_one_pool(catalog, monkeypatch):
+    import search
+
+    cores, coils = catalog
+    pools = []
+
+    class CountingSearch(search.ShardedSearch):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(search, "ShardedSearch", CountingSearch)
+    targets = [BomTarget(L, 0.1) for L in (2e-5, 2e-4, 2e-2, 0.2, 2.0)]   # full table and sliced
+    results = find_combinations_batch(targets, CoreIndex(cores), coils, 10, top_k=True, workers=2)
+    assert len(pools) == 1
+    for t, got in zip(targets, results):
+        assert key(got) == key(find_combinations_reference(t.L_target_h, cores, coils, t.tolerance, 10))
+
+
+@pytest.mark.parametrize("dc_bias", [False, True])
+def test_cores_without_al_have_no_band(catalog, dc_bias):
+    # Zero and missing (NaN) area give AL 0 / NaN: no turns, and no divide or cast warnings
+    cores, coils = catalog
+    bad = {3: replace(cores[3], area_m2=0.0), 10: replace(cores[10], area_m2=float("nan"))}
+    degenerate = [bad.get(i, c) for i, c in enumerate(cores)]
+    good = [c for i, c in enumerate(cores) if i not in bad]
+    kw = dict(max_turns_per_core=20, working_current_a=2.0, dc_bias=dc_bias, min_pitch_m=3e-4)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        core_idx, turns = candidate_turns(CoreTable(degenerate), 2e-4, 0.3, **kw)
+        got = find_combinations(2e-4, degenerate, coils, 0.3, 50, working_current_a=2.0, dc_bias=dc_bias)
+    assert not np.isin(core_idx, list(bad)).any()
+    good_idx, good_turns = candidate_turns(CoreTable(good), 2e-4, 0.3, **kw)
+    keep = np.array([i for i in range(len(cores)) if i not in bad])
+    assert np.array_equal(core_idx, keep[good_idx]) and np.array_equal(turns, good_turns)
+    assert key(got) == key(find_combinations(2e-4, good, coils, 0.3, 50, working_current_a=2.0, dc_bias=dc_bias))
@@ -0,0 +1,100 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from benchmarks.synthetic import synthetic_coils, synthetic_cores
+from engine import CoilTable, CoreTable
+from search import find_combinations
+from service import DesignService, Query, make_server
+
+
+def test_from_json_parses_a_full_query():
+    q = Query.from_json({
+        "L": "2e-4", "tol": 0.05, "k": 3.0, "imax": 1, "bias": True, "max_turns": 50, "weights": {"w_cost": 0.2},
+    })
+    assert q == Query(2e-4, 0.05, 3, 1.0, 50, (("w_cost", 0.2),), True)
+
+
+@pytest.mark.parametrize("body", [
+    {"tol": 0.1},
+    {"L": None}, {"L": "inf"}, {"L": float("nan")}, {"L": 0}, {"L": 1e308},
+    {"L": 1e-4, "tol": [1]}, {"L": 1e-4, "tol": 1.5},
+    {"L": 1e-4, "k": None}, {"L": 1e-4, "k": 2.5}, {"L": 1e-4, "k": 1e400}, {"L": 1e-4, "k": 0},
+    {"L": 1e-4, "imax": "x"}, {"L": 1e-4, "imax": float("inf")}, {"L": 1e-4, "imax": -1},
+    {"L": 1e-4, "max_turns": {}}, {"L": 1e-4, "max_turns": 0},
+    {"L": 1e-4, "weights": {"w_cost": None}}, {"L": 1e-4, "weights": {"w_cost": "nan"}},
+    {"L": 1e-4, "weights": {"bogus": 1}}, {"L": 1e-4, "bias": 1},
+    [1e-4],
+])
+def test_from_json_rejects_bad_input_with_value_error(body):
+    with pytest.raises(ValueError):
+        Query.from_json(body)
+
+
+def test_service_caps_turns_per_core():
+    cores, coils = CoreTable(synthetic_cores(200, 2)), CoilTable(synthetic_coils(12, 1))
+    service = DesignService(cores, coils, workers=1, max_turns_per_core=20)
+    try:
+        for body, max_turns in (({"L": 5e-3, "tol": 0.5, "k": 30}, 20), ({"L": 5e-3, "tol": 0.5, "k": 30, "max_turns": 7}, 7)):
+            [got] = service.search([Query.from_json(body)])
+            expected = find_combinations(5e-3, cores, coils, 0.5, 30, max_turns_per_core=max_turns, top_k=True)
+            assert [(o["core"], o["coil"], o["turns"]) for o in got] == \
+                [(o.core.name, o.coil.name, o.turns) for o in expected]
+    finally:
+        service.close()
+
+
+@pytest.mark.parametrize("body", [
+    {"L": True}, {"L": 1e-4, "tol": False}, {"L": 1e-4, "k": True}, {"L": 1e-4, "imax": True},
+    {"L": 1e-4, "max_turns": True}, {"L": 1e-4, "weights": {"w_cost": True}},
+])
+def test_from_json_rejects_booleans_as_numbers(body):
+    with pytest.raises(ValueError):
+        Query.from_json(body)
+
+
+def test_batch_larger_than_max_pending_is_a_client_error():
+    service = DesignService(CoreTable(synthetic_cores(30, 2)), CoilTable(synthetic_coils(4, 1)), workers=1, max_pending=2)
+    try:
+        with pytest.raises(ValueError, match="at most 2"):
+            service.submit([Query(L * 1e-5) for L in range(1, 4)])
+        assert len(service.search([Query(L * 1e-5) for L in (1, 2, 1)])) == 3   # duplicates coalesce
+    finally:
+        service.close()
+
+
+@pytest.fixture
+def server():
+    service = DesignService(CoreTable(synthetic_cores(30, 2)), CoilTable(synthetic_coils(4, 1)), workers=1)
+    httpd = make_server(service, port=0, max_body_bytes=256)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+    service.close()
+
+
+def post(port, body: bytes, length: str):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.putrequest("POST", "/search")
+        conn.putheader("Content-Type", "application/json")
+        conn.putheader("Content-Length", length)
+        conn.endheaders(body)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def test_http_body_limits(server):
+    ok = json.dumps({"L": 1e-4, "k": 2}).encode()
+    assert post(server, ok, str(len(ok)))[0] == 200
+    assert post(server, ok, "-5")[0] == 400
+    assert post(server, ok, "abc")[0] == 400
+    big = json.dumps({"L": 1e-4, "pad": "x" * 400}).encode()
+    assert post(server, big, str(len(big)))[0] == 413
+    assert post(server, b'{"L": true}', "11")[0] == 400
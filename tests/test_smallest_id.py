@@ -0,0 +1,46 @@
+import random
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_coils, synthetic_cores
+from dc_bias import nearest_grade
+from search import find_combinations_reference, find_smallest_id
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    rng = random.Random(7)
+    cores = [
+        replace(c, b_sat_t=rng.uniform(0.2, 1.5)) if i % 3 == 0 else c
+        for i, c in enumerate(synthetic_cores(150, 6))
+    ]
+    return cores, synthetic_coils(10, 3)
+
+
+def brute_force_smallest_id(L, cores, coils, tolerance, working_current_a=None, max_turns=None):
+    # Every feasible (core, coil, N); per (grade, coil) the smallest-ID core (catalog order breaks
+    # ties), and within it the N closest to target (fewer turns break ties)
+    position = {id(c): i for i, c in enumerate(cores)}
+    grade = dict(zip(map(id, cores), nearest_grade(np.array([c.mu_r for c in cores])).tolist()))
+    best = {}
+    for o in find_combinations_reference(L, cores, coils, tolerance, 10**6, working_current_a=working_current_a,
+                                         max_turns_per_core=max_turns):
+        k = (grade[id(o.core)], coils.index(o.coil))
+        rank = (o.core.winding_dims[1], position[id(o.core)], o.rel_error, o.turns)
+        if k not in best or rank < best[k][0]:
+            best[k] = (rank, o)
+    return [(g, o.core.name, o.coil.name, o.turns) for (g, _), (_, o) in sorted(best.items())]
+
+
+@pytest.mark.parametrize("L, tolerance, working_current_a, max_turns", [
+    (2e-5, 0.1, None, None), (2e-4, 0.05, None, None), (2e-4, 0.3, 3.0, None),
+    (2e-3, 0.1, 0.5, 40), (5e-2, 0.5, None, 25),
+])
+def test_find_smallest_id_matches_brute_force(catalog, L, tolerance, working_current_a, max_turns):
+    cores, coils = catalog
+    expected = brute_force_smallest_id(L, cores, coils, tolerance, working_current_a, max_turns)
+    got = find_smallest_id(L, cores, coils, tolerance, working_current_a=working_current_a, max_turns_per_core=max_turns)
+    grades = nearest_grade(np.array([o.core.mu_r for o in got])).tolist()
+    assert [(g, o.core.name, o.coil.name, o.turns) for g, o in zip(grades, got)] == expected
@@ -0,0 +1,81 @@
+from dataclasses import replace
+
+import pytest
+
+from engine import STAGES, CoilTable, CoreTable, SearchStats
+from models import Coil, Core
+from physics import toroid_inductance_h
+from search import find_combinations
+
+TURNS = 30
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    # One core per outcome at 1 A: "fits" hits TURNS exactly, "off_band" has no integer N within
+    # 2 %, "saturates" is "fits" with a tiny b_sat, and "short" is too low for the thick wire
+    fits = Core(
+        name="fits", mu_r=60.0, area_m2=6.5e-5, r_mean_m=0.0115, window_area_m2=1.5e-4,
+        od_m=0.0335, id_m=0.0135, ht_m=0.0112,
+    )
+    cores = [
+        fits,
+        replace(fits, name="off_band", mu_r=60.0 * (TURNS / (TURNS + 0.5)) ** 2),
+        replace(fits, name="saturates", b_sat_t=1e-3),
+        replace(fits, name="short", ht_m=0.0045),
+    ]
+    coils = [
+        Coil("thin", 28, 0.3e-3, 0.2, 0.01),
+        Coil("thick", 15, 1.5e-3, 0.01, 0.1),
+    ]
+    return cores, coils, toroid_inductance_h(fits, TURNS)
+
+
+def test_hand_built_catalog_shape(catalog):
+    cores, (thin, thick), _ = catalog
+    assert thick.max_turns_on(cores[0]) >= TURNS > thick.max_turns_on(cores[3])
+    assert thin.max_turns_on(cores[3]) >= TURNS
+
+
+def test_rejections_are_counted_where_they_happen(catalog):
+    cores, coils, L = catalog
+    stats = SearchStats()
+    got = find_combinations(L, cores, coils, 0.02, 100, working_current_a=1.0, stats=stats)
+    assert sorted((o.core.name, o.coil.name, o.turns) for o in got) == \
+        [("fits", "thick", TURNS), ("fits", "thin", TURNS), ("short", "thin", TURNS)]
+    assert (stats.cores_total, stats.cores_evaluated, stats.cores_pruned, stats.coils_pruned) == (4, 4, 0, 0)
+    assert (stats.rejected_tolerance, stats.rejected_saturation, stats.rejected_capacity) == (1, 1, 1)
+    assert stats.survivors == 3
+    assert list(stats.seconds) == list(STAGES)
+    assert all(v > 0 for v in stats.seconds.values())
+
+    # Counters and timings accumulate over queries
+    before = dict(stats.seconds)
+    find_combinations(L, CoreTable(cores), CoilTable(coils), 0.02, 100, working_current_a=1.0, stats=stats)
+    assert (stats.cores_total, stats.rejected_tolerance, stats.rejected_saturation) == (8, 2, 2)
+    assert (stats.rejected_capacity, stats.survivors) == (2, 6)
+    assert all(stats.seconds[k] > before[k] for k in STAGES)
+    assert stats.summary().splitlines()[2] == "survivors: 6"
+
+
+def test_without_current_nothing_saturates(catalog):
+    cores, coils, L = catalog
+    stats = SearchStats()
+    got = find_combinations(L, cores, coils, 0.02, 100, stats=stats)
+    assert len(got) == stats.survivors == 5
+    assert (stats.rejected_tolerance, stats.rejected_saturation, stats.rejected_capacity) == (1, 0, 1)
+
+
+def test_top_k_counts_pruned_cores(catalog):
+    cores, coils, L = catalog
+    stats = SearchStats()
+    got = find_combinations(L, cores, coils, 0.02, 100, working_current_a=1.0, top_k=True, stats=stats)
+    assert len(got) == stats.survivors == 3
+    # Only cores with a turn count left after tolerance and saturation enter the bound search
+    assert (stats.cores_total, stats.cores_evaluated, stats.cores_pruned) == (4, 2, 0)
+    assert (stats.rejected_tolerance, stats.rejected_saturation, stats.rejected_capacity) == (1, 1, 1)
+
+    stats = SearchStats()
+    [best] = find_combinations(L, cores, coils, 0.02, 1, working_current_a=1.0, top_k=True, stats=stats)
+    assert stats.cores_evaluated + stats.cores_pruned == 2
+    assert stats.survivors + stats.rejected_capacity + stats.coils_pruned <= 4
@@ -0,0 +1,61 @@
+import csv
+import io
+
+import pytest
+
+from benchmarks.synthetic import synthetic_coils, synthetic_cores
+from scorer import ScoreWeights
+from search import OPTION_CSV_FIELDS, find_combinations, iter_combinations, top_k_options, write_options_csv
+
+QUERIES = [
+    dict(L_target_h=2e-4, tolerance=0.1),
+    dict(L_target_h=2e-3, tolerance=0.3, working_current_a=3.0, max_turns_per_core=40),
+    dict(L_target_h=5e-5, tolerance=0.05, weights=ScoreWeights(w_cost=0.0, w_fill=2.0)),
+]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return synthetic_cores(150, 8), synthetic_coils(10, 4)
+
+
+def key(options):
+    return [(o.core.name, o.coil.name, o.turns, o.L_h, o.score, o.cost_usd, o.fill_ratio) for o in options]
+
+
+@pytest.mark.parametrize("q", QUERIES)
+@pytest.mark.parametrize("chunk_cores", [1, 7, 64, 1000])
+def test_iter_combinations_yields_every_candidate(catalog, q, chunk_cores):
+    cores, coils = catalog
+    every = find_combinations(cores=cores, coils=coils, max_results=10**6, **q)
+    assert len(every) > 20
+    streamed = list(iter_combinations(cores=cores, coils=coils, chunk_cores=chunk_cores, **q))
+    assert sorted(key(streamed)) == sorted(key(every))
+    position = {c.name: i for i, c in enumerate(cores)}
+    assert [position[o.core.name] for o in streamed] == sorted(position[o.core.name] for o in streamed)
+
+
+@pytest.mark.parametrize("q", QUERIES)
+@pytest.mark.parametrize("k", [1, 5, 20, 10**6])
+def test_top_k_options_matches_find_combinations(catalog, q, k):
+    cores, coils = catalog
+    got = top_k_options(iter_combinations(cores=cores, coils=coils, chunk_cores=16, **q), k)
+    assert key(got) == key(find_combinations(cores=cores, coils=coils, max_results=k, **q))
+
+
+def test_write_options_csv_rows_and_header(catalog):
+    cores, coils = catalog
+    options = find_combinations(2e-4, cores, coils, 0.1, 50)
+    sink = io.StringIO()
+    assert write_options_csv(iter(options), sink) == len(options) == 50
+    rows = list(csv.reader(io.StringIO(sink.getvalue())))
+    assert rows[0] == OPTION_CSV_FIELDS
+    assert len(rows) == len(options) + 1
+    col = {name: i for i, name in enumerate(OPTION_CSV_FIELDS)}
+    for row, o in zip(rows[1:], options):
+        assert (row[col["core"]], row[col["coil"]], int(row[col["turns"]])) == (o.core.name, o.coil.name, o.turns)
+        assert float(row[col["score"]]) == o.score
+
+    empty = io.StringIO()
+    assert write_options_csv([], empty) == 0
+    assert list(csv.reader(io.StringIO(empty.getvalue()))) == [OPTION_CSV_FIELDS]
@@ -0,0 +1,53 @@
+from functools import reduce
+
+import numpy as np
+import pytest
+
+from tolerance import RunningStats
+
+
+def merged(chunks, masks=None):
+    masks = masks or [None] * len(chunks)
+    return reduce(RunningStats.merge, (RunningStats.of(x, m) for x, m in zip(chunks, masks)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_merged_chunks_match_numpy_on_the_concatenation(seed):
+    rng = np.random.default_rng(seed)
+    designs = 7
+    sizes = rng.integers(1, 300, size=int(rng.integers(2, 9)))
+    # Offset, badly scaled samples: the naive sum-of-squares variance would lose digits here
+    chunks = [1e-4 + 1e-7 * rng.standard_normal((designs, int(s))) for s in sizes]
+    stats = merged(chunks)
+    full = np.concatenate(chunks, axis=1)
+    assert (stats.n == full.shape[1]).all()
+    np.testing.assert_allclose(stats.mean, full.mean(axis=1), rtol=1e-12)
+    np.testing.assert_allclose(stats.std, full.std(axis=1, ddof=1), rtol=1e-9)
+    assert (stats.min == full.min(axis=1)).all() and (stats.max == full.max(axis=1)).all()
+
+
+def test_masked_chunks_match_numpy_per_design():
+    rng = np.random.default_rng(9)
+    chunks = [rng.uniform(0.5, 2.0, (4, s)) for s in (50, 1, 120, 33)]
+    masks = [rng.random(x.shape) < 0.7 for x in chunks]
+    masks[1][:] = False                       # a chunk where nothing counts
+    for m in masks:
+        m[3] = False                          # a design that never has a sample
+    stats = merged(chunks, masks)
+    x, m = np.concatenate(chunks, axis=1), np.concatenate(masks, axis=1)
+    for d in range(3):
+        kept = x[d][m[d]]
+        assert stats.n[d] == kept.size
+        assert stats.mean[d] == pytest.approx(kept.mean(), rel=1e-12)
+        assert stats.std[d] == pytest.approx(kept.std(ddof=1), rel=1e-9)
+        assert (stats.min[d], stats.max[d]) == (kept.min(), kept.max())
+    assert (stats.n[3], stats.mean[3], stats.m2[3]) == (0, 0.0, 0.0)
+    assert (stats.min[3], stats.max[3]) == (np.inf, -np.inf)
+
+
+def test_merge_order_does_not_matter():
+    rng = np.random.default_rng(3)
+    chunks = [rng.standard_normal((3, s)) for s in (10, 200, 5)]
+    a, b = merged(chunks), merged(chunks[::-1])
+    np.testing.assert_allclose(a.mean, b.mean, rtol=1e-12)
+    np.testing.assert_allclose(a.std, b.std, rtol=1e-12)
@@ -0,0 +1,86 @@
+import math
+import shutil
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import AWG_CSV, synthetic_cores
+from engine import CoreTable, candidate_turns, thickest_fitting
+from search import find_combinations_reference, find_thickest_wires
+from wire_catalog import BUILDS, WireCatalog, awg_number, enamel_thickness_m, parse_current_range
+
+
+@pytest.fixture(scope="module")
+def catalog(tmp_path_factory):
+    # A copy, so the snapshot cache is written next to it rather than into the repo
+    path = tmp_path_factory.mktemp("awg") / "awg.csv"
+    shutil.copy(AWG_CSV, path)
+    return WireCatalog.from_awg_table(path)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("280~298", (280.0, 298.0)), ("298~280", (280.0, 298.0)), ("223", (223.0, 223.0)),
+    (" 1.5 ~ 2 ", (1.5, 2.0)), ("175～190", (175.0, 190.0)), (95, (95.0, 95.0)), ("10~", (10.0, 10.0)),
+])
+def test_parse_current_range(text, expected):
+    assert parse_current_range(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "~", "n/a", "1~x", None])
+def test_parse_current_range_malformed_is_nan(text):
+    assert all(math.isnan(v) for v in parse_current_range(text))
+
+
+@pytest.mark.parametrize("label, expected", [("4/0", -3), ("1/0", 0), ("1", 1), (" 28 ", 28), ("40", 40)])
+def test_awg_number(label, expected):
+    assert awg_number(label) == expected
+
+
+@pytest.mark.parametrize("label", ["", "AWG", "x/0", "1.5", "/0"])
+def test_awg_number_malformed_raises(label):
+    with pytest.raises(ValueError):
+        awg_number(label)
+
+
+def test_catalog_rows(catalog):
+    gauges = len(open(AWG_CSV, encoding="utf-8").read().strip().splitlines()) - 1
+    assert len(catalog) == gauges * len(BUILDS)
+    pitch = catalog.table.d_eff_m
+    assert (np.diff(pitch) >= 0).all()
+    for coil, build in zip(catalog.coils, catalog.builds):
+        assert coil.enamel_thickness_m == enamel_thickness_m(coil.wire_diameter_m, build)
+    assert (catalog.current_min_a <= catalog.current_max_a).all()
+
+    heavy = catalog.select(builds=["heavy"], min_current_a=50, max_pitch_m=5e-3)
+    assert len(heavy) > 0
+    assert set(heavy.builds) == {"heavy"}
+    assert (heavy.current_max_a >= 50).all() and (heavy.table.d_eff_m <= 5e-3).all()
+
+
+def test_thickest_fitting_matches_brute_force(catalog):
+    cores = CoreTable(synthetic_cores(120, 4))
+    wires = catalog.select(max_pitch_m=2e-3)
+    d = wires.table.d_eff_m
+    core_idx, turns = candidate_turns(cores, 2e-4, 0.5)
+    assert core_idx.size > 0
+    got = thickest_fitting(cores, core_idx, turns, d)
+    coils = wires.coils
+    for i, N, g in zip(core_idx.tolist(), turns.tolist(), got.tolist()):
+        fitting = [j for j, w in enumerate(coils) if w.max_turns_on(cores.cores[i]) >= N]
+        assert g == (fitting[-1] if fitting else -1)
+    assert (got == -1).any() and (got >= 0).any()
+    assert (thickest_fitting(cores, core_idx, turns, d[:0]) == -1).all()
+
+
+def test_find_thickest_wires_picks_the_heaviest_fitting_wire(catalog):
+    cores = synthetic_cores(60, 5)
+    wires = catalog.select(max_pitch_m=1.5e-3)
+    best = find_thickest_wires(1e-4, cores, wires, 0.1, max_results=1000)
+    assert 0 < len(best) < 1000
+    every = find_combinations_reference(1e-4, cores, wires.coils, 0.1, max_results=10**6)
+    heaviest = {}
+    for o in every:
+        k = (o.core.name, o.turns)
+        if k not in heaviest or wires.coils.index(o.coil) > wires.coils.index(heaviest[k]):
+            heaviest[k] = o.coil
+    assert {(o.core.name, o.turns): o.coil for o in best} == heaviest
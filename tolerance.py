@@ -0,0 +1,224 @@
+# tolerance.py
+# Monte Carlo tolerance analysis of finished designs: AL spread, coated core size, wire diameter
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from dc_bias import field_oe, permeability_fraction
+from engine import layered_winding
+from search import DesignOption
+
+
+@dataclass
+class ToleranceSpec:
+    al_tolerance: float = 0.08        # catalog AL is ±8%; sampled uniformly in the band
+    wire_tolerance: float = 0.01      # bare copper diameter, relative, uniform
+    # The coated OD/ID/HT fall uniformly between the before-finish and after-finish
+    # dimensions; cores without before-finish values keep their after-finish size
+
+
+@dataclass
+class RunningStats:
+    """Count, mean, M2 and range per design, merged batch by batch (Chan et al.).
+
+    Arrays of shape (designs,), so the whole top-k is updated with one call per batch
+    and partial results from worker processes combine with merge().
+    """
+    n: np.ndarray
+    mean: np.ndarray
+    m2: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+
+    @classmethod
+    def of(cls, x: np.ndarray, mask: np.ndarray | None = None) -> RunningStats:
+        # Moments of each row of x (designs, samples), over the samples where mask holds
+        if mask is None:
+            mask = np.ones(x.shape, dtype=bool)
+        n = mask.sum(axis=1)
+        safe = np.maximum(n, 1)
+        mean = np.where(mask, x, 0.0).sum(axis=1) / safe
+        m2 = np.where(mask, (x - mean[:, None]) ** 2, 0.0).sum(axis=1)
+        return cls(
+            n, mean, m2,
+            np.where(mask, x, np.inf).min(axis=1), np.where(mask, x, -np.inf).max(axis=1),
+        )
+
+    def merge(self, other: RunningStats) -> RunningStats:
+        n = self.n + other.n
+        safe = np.maximum(n, 1)
+        delta = other.mean - self.mean
+        return RunningStats(
+            n,
+            self.mean + delta * other.n / safe,
+            self.m2 + other.m2 + delta * delta * self.n * other.n / safe,
+            np.minimum(self.min, other.min),
+            np.maximum(self.max, other.max),
+        )
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.m2 / np.maximum(self.n - 1, 1))
+
+
+@dataclass
+class ToleranceReport:
+    option: DesignOption
+    samples: int
+    L_mean_h: float
+    L_std_h: float
+    L_min_h: float
+    L_max_h: float
+    yield_fraction: float             # share of samples with L inside the target tolerance
+    overflow_probability: float       # share of samples whose winding exceeds the capacity
+    resistance_mean_ohm: float        # over the samples that fit
+    resistance_std_ohm: float
+    resistance_min_ohm: float
+    resistance_max_ohm: float
+
+
+@dataclass
+class _Batch:
+    L: RunningStats
+    R: RunningStats
+    in_tol: np.ndarray                # samples inside the L tolerance, per design
+    overflow: np.ndarray              # samples whose N exceeds the capacity, per design
+
+    def merge(self, other: _Batch) -> _Batch:
+        return _Batch(self.L.merge(other.L), self.R.merge(other.R), self.in_tol + other.in_tol, self.overflow + other.overflow)
+
+
+def design_arrays(options: Sequence[DesignOption]) -> dict[str, np.ndarray]:
+    """Nominal parameters of each design as (designs,) arrays, the input of every batch."""
+    def col(get) -> np.ndarray:
+        return np.array([get(d) for d in options], dtype=float)
+
+    out = {
+        "turns": col(lambda d: d.turns),
+        "al_h": col(lambda d: d.core.al_h),
+        "mu_r": col(lambda d: d.core.mu_r),
+        "path_length_m": col(lambda d: d.core.path_length_m),
+        "has_dims": np.array([d.core.has_dims for d in options], dtype=bool),
+        "bare_d_m": col(lambda d: d.coil.wire_diameter_m),
+        "enamel_m": col(lambda d: max(0.0, d.coil.enamel_thickness_m)),
+        "ohm_per_m": col(lambda d: d.coil.resistance_per_m_ohm),
+    }
+    for i, key in enumerate(("od", "id", "ht")):
+        after = col(lambda d: d.core.winding_dims[i])
+        before = col(lambda d: getattr(d.core, f"{key}_before_m") or 0.0)
+        before = np.where(before > 0, before, after)
+        out[f"{key}_lo"], out[f"{key}_hi"] = np.minimum(before, after), np.maximum(before, after)
+    return out
+
+
+def _sample_batch(
+    p: dict[str, np.ndarray],
+    L_target_h: float,
+    tolerance: float,
+    spec: ToleranceSpec,
+    n: int,
+    seed: np.random.SeedSequence,
+    working_current_a: float | None = None,
+    dc_bias: bool = False,
+) -> _Batch:
+    # n samples of every design at once: arrays of shape (designs, n)
+    rng = np.random.default_rng(seed)
+    k = p["turns"].shape[0]
+
+    def spread(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        return lo[:, None] + (hi - lo)[:, None] * rng.random((k, n))
+
+    N = p["turns"][:, None]
+    al = p["al_h"][:, None] * (1 + spec.al_tolerance * rng.uniform(-1.0, 1.0, (k, n)))
+    L = al * N * N
+    if dc_bias and working_current_a is not None:
+        # Same roll-off the search applied: µ(H)/µ(0) at H = N I / le
+        L = L * permeability_fraction(p["mu_r"], field_oe(p["turns"], working_current_a, p["path_length_m"]))[:, None]
+    bare = p["bare_d_m"][:, None] * (1 + spec.wire_tolerance * rng.uniform(-1.0, 1.0, (k, n)))
+    d = bare + 2 * p["enamel_m"][:, None]
+    OD, ID, HT = spread(p["od_lo"], p["od_hi"]), spread(p["id_lo"], p["id_hi"]), spread(p["ht_lo"], p["ht_hi"])
+
+    length, _, _, _, cap = layered_winding(OD, ID, HT, p["has_dims"][:, None], d, N)
+    fits = N <= cap
+    with np.errstate(divide="ignore", invalid="ignore"):
+        R = p["ohm_per_m"][:, None] * (p["bare_d_m"][:, None] / bare) ** 2 * length
+    return _Batch(
+        RunningStats.of(L), RunningStats.of(R, fits),
+        (np.abs(L - L_target_h) / L_target_h <= tolerance).sum(axis=1), (~fits).sum(axis=1),
+    )
+
+
+def _batch_sizes(samples: int, batch: int) -> list[int]:
+    return [min(batch, samples - s) for s in range(0, samples, batch)]
+
+
+def analyze_tolerances(
+    options: Sequence[DesignOption],
+    L_target_h: float,
+    tolerance: float = 0.1,
+    samples: int = 20000,
+    spec: ToleranceSpec = ToleranceSpec(),
+    seed: int = 0,
+    batch: int = 8192,
+    workers: int | None = None,
+    working_current_a: float | None = None,
+    dc_bias: bool = False,
+) -> list[ToleranceReport]:
+    """Monte Carlo yield of each design (typically the top-k of a search).
+
+    Every batch draws all designs together; only the merged moments are kept, so memory
+    is O(designs x batch) however many samples are asked for. Batches get seeds spawned
+    from one SeedSequence, so the result depends on seed and batch, not on the worker
+    count. workers > 1 spreads the batches over a process pool, falling back to serial
+    where processes cannot start. Pass the search's working_current_a and dc_bias so the
+    sampled L carries the same permeability roll-off the designs were chosen with.
+    """
+    if working_current_a is not None and not working_current_a >= 0:
+        raise ValueError("working_current_a must be >= 0 (A)")
+    options = list(options)
+    if not options or samples <= 0:
+        return []
+    p = design_arrays(options)
+    sizes = _batch_sizes(samples, batch)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    parts = None
+    if workers is not None and workers > 1 and len(sizes) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+                futures = [
+                    pool.submit(_sample_batch, p, L_target_h, tolerance, spec, n, s, working_current_a, dc_bias)
+                    for n, s in zip(sizes, seeds)
+                ]
+                parts = [f.result() for f in futures]
+        except (OSError, NotImplementedError, PermissionError, BrokenProcessPool):
+            parts = None  # serial fallback
+    if parts is None:
+        parts = [
+            _sample_batch(p, L_target_h, tolerance, spec, n, s, working_current_a, dc_bias) for n, s in zip(sizes, seeds)
+        ]
+
+    total = parts[0]
+    for part in parts[1:]:
+        total = total.merge(part)
+    L, R = total.L, total.R
+    fits = R.n > 0
+    L_std, R_std = L.std, R.std
+    return [
+        ToleranceReport(
+            option=d, samples=samples,
+            L_mean_h=float(L.mean[i]), L_std_h=float(L_std[i]), L_min_h=float(L.min[i]), L_max_h=float(L.max[i]),
+            yield_fraction=float(total.in_tol[i]) / samples,
+            overflow_probability=float(total.overflow[i]) / samples,
+            resistance_mean_ohm=float(R.mean[i]) if fits[i] else float("nan"),
+            resistance_std_ohm=float(R_std[i]) if fits[i] else float("nan"),
+            resistance_min_ohm=float(R.min[i]) if fits[i] else float("nan"),
+            resistance_max_ohm=float(R.max[i]) if fits[i] else float("nan"),
+        )
+        for i, d in enumerate(options)
+    ]
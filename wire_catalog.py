@@ -0,0 +1,124 @@
+# wire_catalog.py
+# Magnet-wire catalog: AWG gauges x enamel builds, sorted by overall pitch
+
+from __future__ import annotations
+
+from math import sqrt
+from pathlib import Path
+from typing import Iterable, Union
+
+import numpy as np
+
+from models import Coil
+from engine import CoilTable
+from catalog_snapshot import load_awg_table
+
+AWG_CSV_PATH = Path(__file__).resolve().parent / "awg.csv"
+
+# Enamel builds by coat count (IEC 60317 grade 1/2/3, NEMA single/heavy/triple)
+BUILDS = {"single": 1, "heavy": 2, "triple": 3}
+
+# Single-side enamel per coat ~ 12.5 µm * sqrt(d / 1 mm): close to the MW 1000 minimum
+# increases over the 0.25..12 mm range of awg.csv
+ENAMEL_PER_COAT_M = 12.5e-6
+
+
+def enamel_thickness_m(bare_d_m: float, build: str) -> float:
+    return BUILDS[build] * ENAMEL_PER_COAT_M * sqrt(bare_d_m / 1e-3)
+
+
+def parse_current_range(text: str) -> tuple[float, float]:
+    """Allowable current cell to (min, max) A: "280~298" -> (280, 298), "223" -> (223, 223)."""
+    parts = [p.strip() for p in str(text).replace("～", "~").split("~")]
+    try:
+        values = [float(p) for p in parts if p]
+    except ValueError:
+        return float("nan"), float("nan")
+    if not values:
+        return float("nan"), float("nan")
+    return min(values), max(values)
+
+
+def awg_number(label: str) -> int:
+    # "4/0" -> -3, "1/0" -> 0, "28" -> 28 (the usual 0000 = -3 convention)
+    label = label.strip()
+    if label.endswith("/0"):
+        return 1 - int(label[:-2])
+    return int(label)
+
+
+def wire_price_per_m_usd(area_mm2: float, build: str) -> float:
+    # Placeholder pricing fitted to data.COILS (copper area plus a premium per extra coat);
+    # replace with vendor prices when available
+    return (0.031 + 0.18 * area_mm2) * (1.0 + 0.1 * (BUILDS[build] - 1))
+
+
+class WireCatalog:
+    """Every gauge x enamel build as Coil rows, sorted by pitch (bare + 2 * enamel).
+
+    Capacity floor(HT / d) * floor(((OD - ID) / 2) / d) never grows with d, so for any
+    core and N the wires that fit form a prefix of this order; engine.thickest_fitting
+    finds its end by bisection. Equal pitches are ordered by bare diameter, so the last
+    fitting row carries the most copper.
+    """
+
+    def __init__(self, coils: Iterable[Coil], builds: Iterable[str] = (), current_a: Iterable[tuple[float, float]] = ()):
+        coils, builds, current_a = list(coils), list(builds), list(current_a)
+        builds = builds or [""] * len(coils)
+        current_a = current_a or [(float("nan"), float("nan"))] * len(coils)
+        order = sorted(range(len(coils)), key=lambda i: (coils[i].pitch_m, coils[i].wire_diameter_m))
+        self.coils = [coils[i] for i in order]
+        self.builds = np.array([builds[i] for i in order], dtype=object)
+        self.current_min_a = np.array([current_a[i][0] for i in order], dtype=float)
+        self.current_max_a = np.array([current_a[i][1] for i in order], dtype=float)
+        self.table = CoilTable(self.coils)
+
+    def __len__(self) -> int:
+        return len(self.coils)
+
+    @classmethod
+    def from_awg_table(
+        cls,
+        source: Union[str, Path] = AWG_CSV_PATH,
+        builds: Iterable[str] = tuple(BUILDS),
+        packing_factor: float = 0.7,
+    ) -> WireCatalog:
+        """Catalog from awg.csv or the AWG workbook (through the snapshot cache)."""
+        arr = load_awg_table(source)
+        coils, build_of, current = [], [], []
+        for row in arr.tolist():
+            label, d_mm, area_mm2, ohm_per_m, current_text = row
+            for build in builds:
+                t = enamel_thickness_m(d_mm * 1e-3, build)
+                coils.append(Coil(
+                    name=f"AWG {label} {build}",
+                    awg=awg_number(label),
+                    wire_diameter_m=d_mm * 1e-3,
+                    resistance_per_m_ohm=ohm_per_m,
+                    price_per_m_usd=wire_price_per_m_usd(area_mm2, build),
+                    packing_factor=packing_factor,
+                    enamel_thickness_m=t,
+                ))
+                build_of.append(build)
+                current.append(parse_current_range(current_text))
+        return cls(coils, build_of, current)
+
+    def select(
+        self,
+        builds: Iterable[str] | None = None,
+        min_current_a: float | None = None,
+        max_pitch_m: float | None = None,
+    ) -> WireCatalog:
+        """Rows matching every given filter; min_current_a compares against the upper end of the range."""
+        keep = np.ones(len(self), dtype=bool)
+        if builds is not None:
+            keep &= np.isin(self.builds, list(builds))
+        if min_current_a is not None:
+            keep &= self.current_max_a >= min_current_a
+        if max_pitch_m is not None:
+            keep &= self.table.d_eff_m <= max_pitch_m
+        rows = np.flatnonzero(keep)
+        return WireCatalog(
+            [self.coils[i] for i in rows], self.builds[rows].tolist(),
+            list(zip(self.current_min_a[rows].tolist(), self.current_max_a[rows].tolist())),
+        )
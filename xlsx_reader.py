@@ -0,0 +1,97 @@
+# xlsx_reader.py
+# Minimal .xlsx sheet reader on zipfile + xml.etree (values only, no formatting)
+
+from __future__ import annotations
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path, PurePosixPath
+from typing import Iterator, Union
+
+_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+def _column_index(ref: str) -> int:
+    # "A1" -> 0, "M35" -> 12, "AA3" -> 26
+    letters = _CELL_REF.match(ref).group(1)
+    idx = 0
+    for ch in letters:
+        idx = idx * 26 + (ord(ch) - 64)
+    return idx - 1
+
+
+def _shared_strings(z: zipfile.ZipFile) -> list[str]:
+    try:
+        data = z.read("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    # Rich-text entries split one string over several <t> runs
+    return ["".join(t.text or "" for t in si.iter(f"{_MAIN}t")) for si in ET.fromstring(data).iter(f"{_MAIN}si")]
+
+
+def sheet_paths(z: zipfile.ZipFile) -> dict[str, str]:
+    """Sheet name -> part path inside the archive, in workbook order."""
+    rels = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+    targets = {r.get("Id"): r.get("Target") for r in rels.iter(f"{_PKG_REL}Relationship")}
+    out = {}
+    for sheet in ET.fromstring(z.read("xl/workbook.xml")).iter(f"{_MAIN}sheet"):
+        target = targets[sheet.get(f"{_REL}id")]
+        path = target.lstrip("/") if target.startswith("/") else str(PurePosixPath("xl") / target)
+        out[sheet.get("name")] = path
+    return out
+
+
+def iter_sheet_rows(source: Union[str, Path], sheet: str | None = None) -> Iterator[list[str | None]]:
+    """Cell values of one worksheet as lists of strings (None for empty cells), row by row.
+
+    sheet=None reads the first sheet that has any cells. Rows are positional like a CSV
+    export: column A is index 0, gaps inside a row are filled with None, and skipped
+    (empty) rows are yielded as []. Values are the stored text (shared strings resolved,
+    numbers as written by the producer); formulas yield their cached result.
+    """
+    with zipfile.ZipFile(source) as z:
+        paths = sheet_paths(z)
+        if sheet is not None:
+            candidates = [paths[sheet]]
+        else:
+            candidates = list(paths.values())
+        strings = _shared_strings(z)
+        for part in candidates:
+            found = False
+            with z.open(part) as f:
+                next_row = 1
+                for _event, el in ET.iterparse(f, events=("end",)):
+                    if el.tag != f"{_MAIN}row":
+                        continue
+                    found = True
+                    r = int(el.get("r") or next_row)
+                    for _ in range(next_row, r):
+                        yield []
+                    next_row = r + 1
+                    yield _row_values(el, strings)
+                    el.clear()
+            if found or sheet is not None:
+                return
+
+
+def _row_values(row: ET.Element, strings: list[str]) -> list[str | None]:
+    values: list[str | None] = []
+    for c in row.iter(f"{_MAIN}c"):
+        ref = c.get("r")
+        col = _column_index(ref) if ref else len(values)
+        if col > len(values):
+            values.extend([None] * (col - len(values)))
+        kind = c.get("t")
+        if kind == "inlineStr":
+            value = "".join(t.text or "" for t in c.iter(f"{_MAIN}t"))
+        else:
+            v = c.find(f"{_MAIN}v")
+            value = v.text if v is not None else None
+            if value is not None and kind == "s":
+                value = strings[int(value)]
+        values.append(value)
+    return values